@@ -0,0 +1,236 @@
+"""
+-- pointNoodler benchmarks --
+Headless timing of the noodle pipeline on synthetic edge selections (runs against the stand-in maya package in standin/).
+
+Scenarios (sizes are edge counts):
+-loop       : one long closed loop
+-chains     : grid of many short (4-edge) open chains
+-tjunctions : comb-shaped network, every spine point is a T-junction
+-shuffled   : long loop with edges in random order and random direction
+
+Stages:
+-chain      : core.buildEdgeChains()
+-reference  : core.segregatePointIndices() (original quadratic path, only up to --reference-limit edges)
+-frames     : core.getChainFrames() for all chains in one pass ("average" frames)
+-framesRmf  : same with rotation-minimizing frames
+-tubes      : core.buildNoodleBatch()
+-resample   : resample.resampleChains() (spline refinement + simplification of every chain)
+-maya       : getNoodleSetFromEdges() (chain cache off) + pointNoodlerSet() through the stand-in scene (only up to --maya-limit edges)
+-noodleSet  : getNoodleSetFromEdges() alone, chain cache off (same limit)
+-cacheHit   : same with a warm chain cache (compare against noodleSet: a hit trades edge fetching and chaining for hashing the mesh)
+
+Usage:
+    python benchmarks/benchNoodler.py                       # run, compare against benchmarks/baseline.json if it exists
+    python benchmarks/benchNoodler.py --save-baseline       # run and store the results as the new baseline
+    python benchmarks/benchNoodler.py --baseline ci.json --require-baseline     # CI: a missing baseline is an error (exit 2)
+Exits with 1 if any stage is slower than baseline * --tolerance (baselines are machine specific, save one per machine).
+Peak memory is measured with tracemalloc (Python 3) in a separate run, so it does not slow down the timed runs.
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "standin"))
+sys.path.insert(0, ROOT)
+
+import numpy as np
+
+import maya.cmds as cmds
+from maya import _scene
+import pointNoodler
+from pointNoodler import chainCache
+from pointNoodler import core
+from pointNoodler import resample
+from pointNoodler.noodleSet import NoodleSet
+
+try:
+    import tracemalloc
+except ImportError:         # Python 2: peak memory is not reported
+    tracemalloc = None
+
+SCENARIOS = ("loop", "chains", "tjunctions", "shuffled")
+SIZES = (10, 100, 1000, 10000, 100000)
+SIDES = 8
+RADIUS = 0.1
+DEFAULT_BASELINE = os.path.join(ROOT, "benchmarks", "baseline.json")
+
+
+# synthetic selections: (points (V, 3), edgeVertices (E, 2)), edge IDs are the row numbers
+def makeLoop(numEdges, rng):
+    t = np.arange(numEdges) * (2.0 * np.pi / numEdges)
+    points = np.stack([np.cos(t) * numEdges * 0.1, np.sin(3.0 * t), np.sin(t) * numEdges * 0.1], axis=-1)
+    index = np.arange(numEdges)
+    return points, np.stack([index, (index + 1) % numEdges], axis=-1)
+
+def makeChains(numEdges, rng):
+    numChains = max(numEdges // 4, 1)
+    side = int(np.ceil(np.sqrt(numChains)))
+    chain = np.arange(numChains)
+    step = np.arange(5)
+    points = np.zeros((numChains, 5, 3))
+    points[:, :, 0] = (chain % side)[:, None] * 2.0 + step[None, :] * 0.4
+    points[:, :, 1] = rng.rand(numChains, 5) * 0.1
+    points[:, :, 2] = (chain // side)[:, None] * 2.0
+    first = (chain * 5)[:, None] + np.arange(4)[None, :]
+    return points.reshape(-1, 3), np.stack([first.ravel(), first.ravel() + 1], axis=-1)
+
+def makeTJunctions(numEdges, rng):
+    spine = max(numEdges // 4, 2)
+    spinePoints = np.stack([np.arange(spine, dtype=np.float64), np.zeros(spine), np.zeros(spine)], axis=-1)
+    teeth = spinePoints[:, None, :] + np.array([[0.0, 0.0, 1.0], [0.0, 0.0, 2.0], [0.0, 0.5, 3.0]])[None, :, :]
+    points = np.concatenate([spinePoints, teeth.reshape(-1, 3)])
+
+    spineEdges = np.stack([np.arange(spine - 1), np.arange(1, spine)], axis=-1)
+    toothStart = spine + np.arange(spine) * 3
+    toothEdges = np.concatenate([np.stack([np.arange(spine), toothStart], axis=-1),
+                                 np.stack([toothStart, toothStart + 1], axis=-1),
+                                 np.stack([toothStart + 1, toothStart + 2], axis=-1)])
+    return points, np.concatenate([spineEdges, toothEdges])
+
+def makeShuffled(numEdges, rng):
+    points, edgeVertices = makeLoop(numEdges, rng)
+    edgeVertices = edgeVertices[rng.permutation(len(edgeVertices))]
+    flip = rng.rand(len(edgeVertices)) < 0.5
+    edgeVertices[flip] = edgeVertices[flip][:, ::-1]
+    return points, edgeVertices
+
+GENERATORS = {"loop": makeLoop, "chains": makeChains, "tjunctions": makeTJunctions, "shuffled": makeShuffled}
+
+
+# stand-in mesh whose edge e is edgeVertices[e] (one 2-sided face per edge), with all edges selected
+def makeStandinSelection(points, edgeVertices):
+    _scene.reset()
+    _scene.createMesh(points.tolist(), [2] * len(edgeVertices), edgeVertices.ravel().tolist(), "benchMesh#")
+    cmds.select("benchMesh1.e[0:%d]" % (len(edgeVertices) - 1))
+
+
+# best wall time of `repeat` runs (after setup()), plus peak traced memory of one extra run
+# (memory is traced in a run of its own, so the timed runs carry no tracing overhead)
+def timeStage(run, setup=None, repeat=1):
+    best = None
+    for attempt in range(repeat):
+        if setup is not None:
+            setup()
+        gc.collect()
+        start = time.time()
+        run()
+        elapsed = time.time() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, measurePeak(run, setup)
+
+# peak traced memory of one run (None without tracemalloc)
+def measurePeak(run, setup=None):
+    if tracemalloc is None:
+        return None
+    if setup is not None:
+        setup()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        run()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def runScenario(name, numEdges, args):
+    rng = np.random.RandomState(numEdges)
+    points, edgeVertices = GENERATORS[name](numEdges, rng)
+    edgeIDs = np.arange(len(edgeVertices))
+    repeat = args.repeat if len(edgeIDs) <= 10000 else 1
+    results = {}
+
+    chains = core.buildEdgeChains(edgeIDs, edgeVertices)
+    chainPointsList = core.getChainPoints(points, chains)
+
+    stages = [("chain", lambda: core.buildEdgeChains(edgeIDs, edgeVertices), None)]
+    if len(edgeIDs) <= args.reference_limit:
+        stages.append(("reference", lambda: core.segregatePointIndices(edgeIDs, edgeVertices), None))
+    allPoints = np.concatenate(chainPointsList)
+    chainOffsets = np.concatenate([[0], np.cumsum([len(chainPoints) for chainPoints in chainPointsList])])
+    closed = [core.isClosedChain(chainPoints) for chainPoints in chainPointsList]
+    stages.append(("frames", lambda: core.getChainFrames(allPoints, chainOffsets, "average", None, closed), None))
+    stages.append(("framesRmf", lambda: core.getChainFrames(allPoints, chainOffsets, "rmf", None, closed), None))
+    stages.append(("tubes", lambda: core.buildNoodleBatch(chainPointsList, RADIUS, SIDES), None))
+    noodleSet = NoodleSet.fromSegregatedList("bench", chains, points[[pointIndex for chain in chains for pointIndex in chain[1]]])
+    stages.append(("resample", lambda: resample.resampleChains(noodleSet, tolerance=0.01, segmentLength=0.2), None))
+    if len(edgeIDs) <= args.maya_limit:
+        select = lambda: makeStandinSelection(points, edgeVertices)
+        stages.append(("maya", lambda: pointNoodler.pointNoodlerSet(pointNoodler.getNoodleSetFromEdges(cache=None), RADIUS, SIDES), select))
+        stages.append(("noodleSet", lambda: pointNoodler.getNoodleSetFromEdges(cache=None), select))
+        cache = chainCache.ChainCache()
+        stages.append(("cacheHit", lambda: pointNoodler.getNoodleSetFromEdges(cache=cache), lambda: (select(), pointNoodler.getNoodleSetFromEdges(cache=cache))))
+
+    for stage, run, setup in stages:
+        elapsed, peak = timeStage(run, setup, repeat)
+        results[stage] = {"seconds": elapsed, "edgesPerSecond": len(edgeIDs) / elapsed if elapsed > 0 else None, "peakBytes": peak}
+    return len(edgeIDs), len(chains), results
+
+def formatBytes(numBytes):
+    if numBytes is None:
+        return "-"
+    return "%.1f MB" % (numBytes / 1048576.0)
+
+# stage keys slower than baseline * tolerance (ignoring anything under minSeconds, which is timer noise)
+def findRegressions(results, baseline, tolerance, minSeconds):
+    regressions = []
+    for key, stats in sorted(results.items()):
+        if key not in baseline:
+            continue
+        old = baseline[key]["seconds"]
+        new = stats["seconds"]
+        if new > minSeconds and new > old * tolerance:
+            regressions.append((key, old, new))
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="pointNoodler benchmarks")
+    parser.add_argument("--scenarios", nargs="+", default=list(SCENARIOS), choices=SCENARIOS)
+    parser.add_argument("--sizes", nargs="+", type=int, default=list(SIZES))
+    parser.add_argument("--repeat", type=int, default=3, help="runs per stage (best time is kept) for sizes up to 10k edges")
+    parser.add_argument("--reference-limit", type=int, default=1000, help="largest selection timed with the reference chaining")
+    parser.add_argument("--maya-limit", type=int, default=10000, help="largest selection timed through the stand-in maya path")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--require-baseline", action="store_true", help="fail (exit 2) instead of skipping the comparison when there is no baseline")
+    parser.add_argument("--tolerance", type=float, default=1.5, help="allowed slowdown factor against the baseline")
+    parser.add_argument("--min-seconds", type=float, default=0.005, help="stages faster than this never count as regressions")
+    parser.add_argument("--output", help="also write the results as JSON to this file")
+    args = parser.parse_args(argv)
+
+    results = {}
+    print("%-11s %8s %7s  %-10s %10s %14s %10s" % ("scenario", "edges", "chains", "stage", "seconds", "edges/s", "peak"))
+    for name in args.scenarios:
+        for size in args.sizes:
+            numEdges, numChains, stageResults = runScenario(name, size, args)
+            for stage, stats in sorted(stageResults.items()):
+                results["%s/%d/%s" % (name, size, stage)] = stats
+                print("%-11s %8d %7d  %-10s %10.4f %14.0f %10s" % (name, numEdges, numChains, stage, stats["seconds"], stats["edgesPerSecond"] or 0, formatBytes(stats["peakBytes"])))
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=1, sort_keys=True)
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=1, sort_keys=True)
+        print("baseline saved: " + args.baseline)
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print("no baseline at %s (run with --save-baseline first)" % args.baseline)
+        return 2 if args.require_baseline else 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    regressions = findRegressions(results, baseline, args.tolerance, args.min_seconds)
+    for key, old, new in regressions:
+        print("REGRESSION %s: %.4fs -> %.4fs (x%.2f)" % (key, old, new, new / old))
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
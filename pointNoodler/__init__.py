@@ -6,7 +6,7 @@ Last xOffsetified   : 2020.11.23
 End goal is to make a plugin that generates a 'noodle' (cylinder) that traverses any number of given points across any number of meshes.
    (noodles sounds more fun than polyCylinder, right?) 
 
-Benchmarks:
+Benchmarks:   (feature milestones - for speed, see benchmarks/benchNoodler.py)
 -Derive numSections of noodle given the pointList.          (complete as of 2020.10.13)
 -Generate a noodle with the appropriate # of sections.      (complete as of 2020.10.13)
 -Align the noodle with the given pointList.                 (complete as of 2020.10.14)
@@ -22,36 +22,57 @@ Benchmarks:
     * combining connected edge lists that were not connected during generation (complete as of 2020.10.28)
     * work across multiple meshes (in progress)
 -Get the upVecList                                          (in progress as of 2020.10.28 - functionality currently included in segregatePointIndices())
-
-*******Current Task:   (in progress as of 2020.11.23)
+-Linear-time edge chaining (core.buildEdgeChains)           (complete as of 2026.10.18)
+-Maya-independent core (core.py), stand-in maya (standin/)  (complete as of 2026.10.18)
+-Batch mode: one combined mesh per source mesh              (complete as of 2026.10.18)
+-Live mode: pointNoodlerNode with incremental re-evaluation (complete as of 2026.10.18)
+-Parallel processing of multiple meshes (pipeline.py)       (complete as of 2026.10.18)
+-Array-backed NoodleSet replaces nested point lists          (complete as of 2026.10.18)
+-Stage timers / counters / debug switch (profiling.py)      (complete as of 2026.10.18)
+-Chain cache keyed by mesh topology + selection (chainCache) (complete as of 2026.10.18)
+-Generated tube meshes with UVs, no polyCylinder templates  (complete as of 2026.10.18)
+-Optional chain resampling / simplification (resample.py)  (complete as of 2026.10.18)
+-Batched rotation-minimizing / normal-guided frames (core)  (complete as of 2026.10.18)
+-Noodle registry: per-mesh lookup / delete / regenerate     (complete as of 2026.10.18)
+-Headless batch CLI for exported meshes (cli.py)            (complete as of 2026.10.18)
+
+*******Current Task:   (complete as of 2026.10.18 - see noodleSet.py)
 -Implement parameters as class to eliminate unnecessary list nesting 
 and handle data management better  
 
 """
-import maya.cmds as cmds
-import maya.OpenMaya as om
+try:
+    import maya.cmds as cmds
+    import maya.OpenMaya as om
+except ImportError:     # headless (no Maya and no stand-in on sys.path): only pointNoodler.core is usable
+    cmds = None
+    om = None
+import ctypes
+import os
 import pprint
+import numpy as np
+from pointNoodler import chainCache
+from pointNoodler import core
+from pointNoodler import pipeline
+from pointNoodler import profiling
+from pointNoodler import registry
+from pointNoodler.noodleSet import NoodleSet
 
-# 2020.11.23: instanced per generated cylinder, not sure yet how to proceed
-class Noodle:                                       
-    def __init__(self, pointList, radius, parent):
-        
-        self.m_ID = 0
-
-        self.m_PointList = pointList
-        self.m_Radius = radius
-        self.m_Parent = parent
+# chaining results reused across getNoodleSetFromEdges(cache=defaultChainCache) calls (in memory; pass a directory to ChainCache()
+# to also keep them on disk).  Opt-in: the cache key hashes the whole mesh topology, see getNoodleSetFromEdges()
+defaultChainCache = chainCache.ChainCache()
 
-        self.m_Object   # ? not sure what to do here yet
-        self.m_DagPath
-        self.m_Component
-
-        self.mEdgeIDs = []
-        self.mPointList = []
+# every noodle created through createNoodleMesh() / createLiveNoodle(), by source mesh (see registry.py)
+defaultRegistry = registry.NoodleRegistry()
 
 # removing all other arguments until I can get it right and then understand the meaning & implementation of the original arguments (upVecList, parent)
 # def pointNoodler(index, pointList, radius, parent, upVectorList=None):
-def pointNoodler(pointList, radius, parent, upVectorList=None):
+# pointList / upVectorList: lists of MPoints / MVectors or (n, 3) arrays such as NoodleSet.chainPoints(chain)
+# the tube is generated directly (core.buildTube()) and created with a single MFnMesh.create; closed loops become seamless tubes without caps
+# caps: True / False for both ends, or a (start, end) pair; frameMode: "average", "rmf" or "normal" (see core.getChainFrames(),
+# "normal" follows upVectorList). edgeIDs: source edges of the chain (e.g. NoodleSet.chainEdgeIDs(chain)), stored with the noodle so that
+# regenerateNoodles() can build it again; noodles without them are left alone there. Returns the noodle transform.
+def pointNoodler(pointList, radius, parent, upVectorList=None, sides=20, caps=True, frameMode="average", edgeIDs=None):
 
     # error handling 1: check if there are enough points to make at least 1 section
     if len(pointList)  < 2:
@@ -61,86 +82,238 @@ def pointNoodler(pointList, radius, parent, upVectorList=None):
     if (type(radius) is not float) and (type(radius) is not int):
         raise Exception ("Specified radius is invalid!  Please enter a float or int value.")
 
-    numSections = len(pointList) - 1        # -1 : minus the cap
-    xOffset = float(numSections / 2.0)
-
-    # creating noodle with appropriate number of sections
-    noodleTransform = createNoodle(numSections, radius)
-    cmds.parent(noodleTransform, parent, relative=True)
-    noodle = cmds.listRelatives(noodleTransform, shapes = 1)[0] # returns the shape under noodle (pNoodle#Shape)
-
-    objNoodle = om.MObject()
-    getMObject(noodle, objNoodle)
-    meshNoodle = om.MFnMesh(objNoodle)
-
-    # store all vertices and group by corresponding X value (consider making into a function)
-    sectionIndices = {}
-
-    noodleVertexIterator = om.MItMeshVertex(objNoodle)       # iterator of all vertices in mesh
-    while not noodleVertexIterator.isDone():
-        p = noodleVertexIterator.position()                  # position of vertex
-        xKey = p.x + xOffset                                 # rounds p to the nearest decimal digit and converts to int format
-        lst = sectionIndices.get(xKey, [])                   # add list to key(all points that share the same x-axis)
-        lst.append(noodleVertexIterator.index())             # appends index of noodleVertexIterator to the list
-        sectionIndices[xKey] = lst                           # sets this list as the value of sectionIndices[with index xKey]
-        noodleVertexIterator.next()                          # moves to the next element in the list
-
-    noodlePoints = om.MPointArray()
-    meshNoodle.getPoints(noodlePoints)      # gets all the points in the noodle -mesh- (not node or object) and assigns to noodlePoints(type MPointArray)
-    
-    matrix = om.MMatrix()
-    oldI = om.MVector()
-    oldJ = om.MVector()
-    oldK = om.MVector()
-
-    for section in xrange(numSections): 
-        o = pointList[section]              # maya.OpenMaya.MPoint
-        i = pointList[section+1] - o        # maya.OpenMaya.MVector
-        i.normalize()                   
-        u = (upVectorList[section] if upVectorList is not None else om.MVector(0, 1, 0))      # default to world upVector if no upVector is provided
-        k = i ^ u   # forward ^ up
-        j = k ^ i   # 
-
-        if section > 0:
-            avgI = (i + oldI).normal()
-            avgJ = (j + oldJ).normal()
-            avgK = (k + oldK).normal()
-
-        else:
-            avgI = i
-            avgJ = j
-            avgK = k
-
-        # plugs in all the values from vectors/points and generates a 4x4 matrix
-        om.MScriptUtil.createMatrixFromList((avgI.x, avgI.y, avgI.z, 0, avgJ.x, avgJ.y, avgJ.z, 0, avgK.x, avgK.y, avgK.z, 0, o.x, o.y, o.z, 0), matrix)
+    # vertex positions, faces and UVs of the whole noodle, placed on the section frames (rows: i, j, k, o) of every chain point
+    with profiling.stage("tubes"):
+        upArray = pointsToArray(upVectorList) if upVectorList is not None else None
+        points, polyCounts, polyConnects, uvs, uvIds = core.buildTube(pointsToArray(pointList), radius, sides, upArray, caps, None, frameMode)
+    profiling.count("noodles")
+    params = getNoodleParams(radius, sides, upVectorList is not None, caps, frameMode)
+    return createNoodleMesh(points, polyCounts, polyConnects, np.array([0, len(polyCounts)]), parent, uvs, uvIds, edgeIDs, params)
+
+# batch mode: every chain of one mesh as a single combined noodle mesh (one MFnMesh.create, one parent call)
+# chainPointLists: list of MPoint lists or (n, 3) arrays, e.g. getPointDictFromEdges(splitChains=True)[parentName]
+# the faces of noodle n are faceOffsets[n]:faceOffsets[n + 1], also stored on the noodle transform as .noodleFaceOffsets
+# edgeIDs: source edge IDs of the chains (chain after chain), registered with the noodle so it can be regenerated
+# no chains: nothing is created, returns (None, [0])
+def pointNoodlerBatch(chainPointLists, radius, parent, sides=20, upVectorLists=None, caps=True, frameMode="average", edgeIDs=None):
+
+    # error handling 1: check if there are enough points in every chain to make at least 1 section
+    for pointList in chainPointLists:
+        if len(pointList) < 2:
+            raise Exception ("Need at least 2 points to perform pointNoodler!")
 
-        # translate points HERE
-        for index in sectionIndices[section]: 
-            p = noodlePoints[index]                
-            p.x = 0
-            noodlePoints.set(p * matrix, index)
+    # error handling 2: check if radius is valid (float or int)
+    if (type(radius) is not float) and (type(radius) is not int):
+        raise Exception ("Specified radius is invalid!  Please enter a float or int value.")
 
-        # save old matrix data for multiplying next step
-        oldI = i
-        oldJ = j
-        oldK = k
+    chainPointsList = [pointsToArray(pointList) for pointList in chainPointLists]
+    upVectorsList = [pointsToArray(upList) for upList in upVectorLists] if upVectorLists is not None else None
+    with profiling.stage("tubes"):
+        points, polyCounts, polyConnects, faceOffsets, uvs, uvIds = core.buildNoodleBatch(chainPointsList, radius, sides, upVectorsList, caps, frameMode)
+    if not chainPointsList:
+        return None, faceOffsets
+    profiling.count("noodles", len(chainPointsList))
+    params = getNoodleParams(radius, sides, upVectorLists is not None, caps, frameMode)
+    return createNoodleMesh(points, polyCounts, polyConnects, faceOffsets, parent, uvs, uvIds, edgeIDs, params), faceOffsets
+
+# batch mode for a whole NoodleSet: one combined noodle mesh per parent mesh, returns {parentName: noodleTransform}
+# (frameMode "normal" always uses the set's upVectors); all meshes are created in one undo chunk
+def pointNoodlerSet(noodleSet, radius, sides=20, useUpVectors=False, caps=True, frameMode="average"):
+    noodles = {}
+    with registry.undoChunk("pointNoodlerSet"):
+        for parentName in noodleSet.parentNames:
+            chains = noodleSet.chainsOf(parentName)
+            chainPointLists = [noodleSet.chainPoints(chain) for chain in chains]
+            upVectorLists = [noodleSet.chainUpVectors(chain) for chain in chains] if useUpVectors or frameMode == "normal" else None
+            noodles[parentName] = pointNoodlerBatch(chainPointLists, radius, parentName, sides, upVectorLists, caps, frameMode, noodleSet.edgeIDsOf(parentName))[0]
+    return noodles
+
+# pointNoodlerSet() for the current edge selection, replacing the registered noodles of the selected meshes in one undo chunk
+# meshes whose edge selection and parameters did not change keep their noodles (nothing is read from them), unselected meshes are left alone
+# cache: see getNoodleSetFromEdges(); returns {parentName: noodleTransform} of the meshes that were rebuilt
+def updateNoodles(radius, sides=20, useUpVectors=False, caps=True, frameMode="average", cache=None):
+    params = registry.getParams(getNoodleParams(radius, sides, useUpVectors or frameMode == "normal", caps, frameMode))
+    meshEdges = list(getSelectedMeshEdges())
+    selectedEdgeIDs = {}
+    for parentName, edgeMesh, edgeIndices, edgeCount in meshEdges:
+        selectedEdgeIDs.setdefault(parentName, []).append(intArrayToArray(edgeIndices, edgeCount))
+
+    changed = set()
+    for parentName, edgeIDList in selectedEdgeIDs.items():
+        records = [record for record in defaultRegistry.recordsOf(parentName) if not record.isLive()]
+        edgeIDs = np.unique(np.concatenate(edgeIDList))
+        if len(records) != 1 or records[0].params != params or not np.array_equal(np.unique(records[0].edgeIDs), edgeIDs):
+            changed.add(parentName)
+    if not changed:
+        return {}
+
+    with registry.undoChunk("updateNoodles"):
+        defaultRegistry.delete([record for parentName in changed for record in defaultRegistry.recordsOf(parentName) if not record.isLive()])
+        noodleSet = getNoodleSetFromMeshEdges([meshEdge for meshEdge in meshEdges if meshEdge[0] in changed], cache=cache)
+        return pointNoodlerSet(noodleSet, radius, sides, useUpVectors, caps, frameMode)
+
+# rebuild the registered noodles of the given source meshes (all by default) from their stored edge IDs, in one undo chunk
+# keyword arguments (radius, sides, useUpVectors, caps, frameMode) override the stored parameters; live noodles follow their mesh on their own
+# and are left alone, as are noodles generated from points only (pointNoodler() / pointNoodlerBatch() without edgeIDs), which are
+# reported and kept as they are.  cache: see getNoodleSetFromEdges().  Returns the new noodle transforms.
+def regenerateNoodles(sources=None, cache=None, **overrides):
+    records = []
+    for record in defaultRegistry.getRecords(sources):
+        if record.isLive():
+            continue
+        if record.source is None or len(record.edgeIDs) == 0:
+            print ("Noodle " + record.noodle + " has no source edges to regenerate from, skipping it.")
+            continue
+        records.append(record)
+
+    noodles = []
+    with registry.undoChunk("regenerateNoodles"):
+        defaultRegistry.delete(records)
+        for record in records:
+            params = dict(record.params)
+            params.update(overrides)
+            # stored edge IDs are in chain order, and chaining depends on edge order: chain them in ascending order (as Maya returns a
+            # component selection) so that regenerating gives the noodle the same chains every time
+            noodleSet = getNoodleSetFromMeshEdges(getStoredMeshEdges(record.source, np.sort(record.edgeIDs)), cache=cache)
+            noodles.extend(pointNoodlerSet(noodleSet, params["radius"], params["sides"], params["useUpVectors"], params["caps"], params["frameMode"]).values())
+    return noodles
+
+# parallel batch mode: pointNoodlerBatch() for every selected mesh, with chaining and tube generation spread over `workers` processes
+# (see pipeline.py; workers=1 runs in-process, None uses one per CPU). Maya is only read and written here on the main thread.
+# cache: see getNoodleSetFromEdges(); meshes with a hit skip edge fetching and chaining, the chains of the others are stored once the workers are done
+# returns {parentName: (noodleTransform, segregatedList)}; the output does not depend on the number of workers
+def pointNoodlerParallel(radius, sides=20, workers=1, useUpVectors=False, caps=True, frameMode="average", cache=None):
+
+    # error handling: check if radius is valid (float or int)
+    if (type(radius) is not float) and (type(radius) is not int):
+        raise Exception ("Specified radius is invalid!  Please enter a float or int value.")
 
-    # translate final points (cap) HERE   
-    o = pointList[numSections]              
-    i = oldI
-    u = om.MVector(0, 1, 0)                  
-    k = i ^ u
-    j = k ^ i     
-    om.MScriptUtil.createMatrixFromList((i.x, i.y, i.z, 0, j.x, j.y, j.z, 0, k.x, k.y, k.z, 0, o.x, o.y, o.z, 0), matrix) 
+    # 1. pull the raw arrays of every mesh (serial, Maya)
+    meshEdges = {}                      # parentName -> (MeshArrays, [edgeIDs])
+    meshOrder = []
+    for parentName, edgeMesh, edgeIndices, edgeCount in getSelectedMeshEdges():
+        if parentName not in meshEdges:
+            meshEdges[parentName] = (MeshArrays(edgeMesh), [])
+            meshOrder.append(parentName)
+        meshEdges[parentName][1].extend(edgeIndices[index] for index in range(edgeCount))
+
+    jobs = []
+    cacheKeys = {}                      # parentName -> (topologyKey, selectionKey) of the cache misses
+    for parentName in meshOrder:
+        meshArrays, edgeList = meshEdges[parentName]
+        getUpVectors = meshArrays.getUpVectorArray if useUpVectors or frameMode == "normal" else None
+        entry = None
+        if cache is not None:
+            with profiling.stage("chainCache"):
+                topologyKey = meshArrays.getTopologyKey()
+                selectionKey = chainCache.getSelectionKey(edgeList)
+                entry = cache.get(parentName, topologyKey, selectionKey)
+        if entry is not None:
+            with profiling.stage("pointFetch"):
+                jobs.append(pipeline.MeshJob.fromChainEntry(parentName, entry, meshArrays.getPointArray, getUpVectors))
+            continue
+        if cache is not None:
+            cacheKeys[parentName] = (topologyKey, selectionKey)
+        with profiling.stage("edgeFetch"):
+            edgeIDs, edgeVertices = meshArrays.getEdgeVertexArrays(edgeList, len(edgeList))
+        with profiling.stage("pointFetch"):
+            jobs.append(pipeline.MeshJob.fromMeshArrays(parentName, edgeIDs, edgeVertices, meshArrays.getPointArray, getUpVectors))
+
+    # 2. chaining and tube generation (parallel, no Maya; timed as a whole, worker processes are not instrumented)
+    with profiling.stage("pipeline"):
+        results = pipeline.runMeshJobs(jobs, radius, sides, workers, caps, frameMode)
+
+    # 3. apply the results (serial, Maya, one undo chunk)
+    noodles = {}
+    params = getNoodleParams(radius, sides, useUpVectors or frameMode == "normal", caps, frameMode)
+    with registry.undoChunk("pointNoodlerParallel"):
+        for result in results:
+            profiling.count("chains", len(result.segregatedList))
+            profiling.count("noodles", len(result.segregatedList))
+            edgeIDs = [edgeID for chain in result.segregatedList for edgeID in chain[0]]
+            noodleTransform = createNoodleMesh(result.points, result.polyCounts, result.polyConnects, result.faceOffsets, result.name, result.uvs, result.uvIds,
+                                               edgeIDs, params)
+            noodles[result.name] = (noodleTransform, result.segregatedList)
+            if result.name in cacheKeys:
+                cache.put(result.name, cacheKeys[result.name][0], cacheKeys[result.name][1], chainCache.ChainEntry.fromSegregatedList(result.segregatedList))
+    return noodles
+
+# one mesh node for the given tube arrays (and face-vertex UVs, if given), named pNoodle# and parented (relative) under parent (None: world)
+# the per-noodle face index table is stored on the transform as .noodleFaceOffsets; the noodle is registered in defaultRegistry
+# under parent with its source edgeIDs and generation params (see getNoodleParams())
+def createNoodleMesh(points, polyCounts, polyConnects, faceOffsets, parent, uvs=None, uvIds=None, edgeIDs=None, params=None):
+    with profiling.stage("meshCreate"):
+        meshNoodle = om.MFnMesh()
+        if uvs is None:
+            objNoodle = meshNoodle.create(len(points), len(polyCounts), toFloatPointArray(points), toIntArray(polyCounts), toIntArray(polyConnects))
+        else:
+            objNoodle = meshNoodle.create(len(points), len(polyCounts), toFloatPointArray(points), toIntArray(polyCounts), toIntArray(polyConnects),
+                                          toFloatArray(uvs[:, 0]), toFloatArray(uvs[:, 1]))
+            meshNoodle.assignUVs(toIntArray(polyCounts), toIntArray(uvIds))
+        noodleTransform = cmds.rename(om.MFnDagNode(objNoodle).fullPathName(), "pNoodle#")
+        cmds.sets(cmds.listRelatives(noodleTransform, shapes = 1)[0], edit=True, forceElement="initialShadingGroup")    # created meshes have no shading group yet
+    if parent is not None:
+        with profiling.stage("parent"):
+            noodleTransform = cmds.parent(noodleTransform, parent, relative=True)[0]
+    profiling.count("verticesWritten", len(points))
+
+    # per-noodle face index table
+    cmds.addAttr(noodleTransform, longName="noodleFaceOffsets", dataType="Int32Array")
+    cmds.setAttr(noodleTransform + ".noodleFaceOffsets", faceOffsets.tolist(), type="Int32Array")
+    defaultRegistry.register(noodleTransform, parent, edgeIDs, params)
+    return noodleTransform
+
+# generation parameters stored with every registered noodle (what regenerateNoodles() needs to build it again)
+def getNoodleParams(radius, sides, useUpVectors, caps, frameMode):
+    return {"radius": radius, "sides": sides, "useUpVectors": useUpVectors, "caps": caps, "frameMode": frameMode}
+
+# live mode: one pointNoodlerNode (noodleNode.py) per selected mesh, driven by the mesh's current shape and the selected edge IDs
+# returns [(noodleNode, noodleTransform)]; the noodles follow edits / animation of the source mesh until the nodes are deleted
+def createLiveNoodle(radius=0.1, sides=20, frameMode="average"):
+    from pointNoodler import live, noodleNode       # imported here: the plugin module needs maya.OpenMayaMPx and imports this package
+
+    # error handling: frame modes the node can't keep up to date section by section
+    if frameMode not in live.FRAME_MODES:
+        raise Exception ("Live noodles support the 'average' and 'rmf' frame modes only!")
+
+    if not cmds.pluginInfo("noodleNode", query=True, loaded=True):
+        cmds.loadPlugin(os.path.splitext(noodleNode.__file__)[0] + ".py")
 
-    for index in sectionIndices[numSections]:     
-        p = noodlePoints[index]
-        p.x = 0 
-        noodlePoints.set(p * matrix, index)   
+    edgeSelection = om.MSelectionList()
+    om.MGlobal.getActiveSelectionList(edgeSelection)
 
-    # finally, set the points of the generated noodle to align to the matrix
-    meshNoodle.setPoints(noodlePoints) 
+    # error handling: no selection
+    if edgeSelection.isEmpty():
+        raise Exception ("Nothing is selected!")
 
+    result = []
+    with registry.undoChunk("createLiveNoodle"):
+        for index in range(edgeSelection.length()):
+            edgeDagPath, edgeComponent = getMDagPath(index, edgeSelection)
+            if edgeComponent.apiTypeStr() != "kMeshEdgeComponent":
+                raise Exception ("Selected component/s are not of type kMeshEdgeComponent. Are you in edge selection mode and have selected at least 1 edge?")
+
+            edgeIndices = om.MIntArray()
+            om.MFnSingleIndexedComponent(edgeComponent).getElements(edgeIndices)
+            edgeIDs = [edgeIndices[i] for i in range(edgeIndices.length())]
+            edgeDagPath.extendToShape()
+            shapeName = edgeDagPath.fullPathName()
+            parentName = cmds.listRelatives(shapeName, parent=True, fullPath=True)[0]
+
+            node = cmds.createNode(noodleNode.kPluginNodeName)
+            cmds.setAttr(node + ".edgeIds", edgeIDs, type="Int32Array")
+            cmds.setAttr(node + ".radius", radius)
+            cmds.setAttr(node + ".sides", sides)
+            cmds.setAttr(node + ".frameMode", live.FRAME_MODES.index(frameMode))
+
+            noodleTransform = cmds.createNode("transform", name="pNoodle#", parent=parentName)
+            noodleShape = cmds.createNode("mesh", name=noodleTransform.split("|")[-1] + "Shape", parent=noodleTransform)
+            cmds.sets(noodleShape, edit=True, forceElement="initialShadingGroup")
+            cmds.connectAttr(shapeName + ".outMesh", node + ".inMesh")      # object space: the noodle is parented under the source transform
+            cmds.connectAttr(node + ".outMesh", noodleShape + ".inMesh")
+            defaultRegistry.register(noodleTransform, parentName, edgeIDs, {"radius": radius, "sides": sides, "frameMode": frameMode, "node": node})
+            result.append((node, noodleTransform))
+    return result
 
 """
 helper functions
@@ -175,10 +348,79 @@ def getParentNameFromSelection(index, sel):
         print ("Unable to get parent name from selection. Have you selected an appropriate node?")
         raise
 
-# function for getting point indices from selected edges, segregated into their corresponding segments if edges are not connected
-# and combined per mesh (paired by parent name)
-def getPointDictFromEdges():
+# function for getting chains from selected edges, segregated into their corresponding segments if edges are not connected,
+# stored in one NoodleSet across all selected meshes (chain points, upVectors from the vertex normals, edge IDs, parent mesh)
+# useReference: chain with the original getSegregatedPointIndices() instead of the linear-time builder (for comparing results)
+# cache: chainCache.ChainCache whose chains are reused while the mesh topology and edge selection stay the same (None, the default:
+# always chain).  Every lookup reads and hashes the mesh's whole face-vertex list, so a hit costs time in proportion to the mesh,
+# while chaining costs time in proportion to the selection: only worth it for selections that are large next to their mesh
+def getNoodleSetFromEdges(useReference=False, cache=None):
+    return getNoodleSetFromMeshEdges(getSelectedMeshEdges(), useReference, cache)
+
+# getNoodleSetFromEdges() for given (parentName, MFnMesh, edge indices, edge count) entries instead of the active selection
+# (see getSelectedMeshEdges() / getStoredMeshEdges())
+def getNoodleSetFromMeshEdges(meshEdges, useReference=False, cache=None):
+    meshArrayCache = {}                 # parentName -> MeshArrays, each mesh is read once per call
+    noodleSets = []
+
+    for parentName, edgeMesh, edgeIndices, edgeCount in meshEdges:
+        meshArrays = meshArrayCache.get(parentName)
+        if meshArrays is None:
+            with profiling.stage("pointFetch"):
+                meshArrays = MeshArrays(edgeMesh)
+            meshArrayCache[parentName] = meshArrays
+
+        if useReference:
+            entry = chainCache.ChainEntry.fromSegregatedList(getSegregatedPointIndices(edgeMesh, edgeIndices, edgeCount))    # edgeIndices grouped by connected edges
+        else:
+            entry = None
+            if cache is not None:
+                with profiling.stage("chainCache"):
+                    topologyKey = meshArrays.getTopologyKey()
+                    selectionKey = chainCache.getSelectionKey(intArrayToArray(edgeIndices, edgeCount))
+                    entry = cache.get(parentName, topologyKey, selectionKey)
+            if entry is None:
+                with profiling.stage("edgeFetch"):
+                    edgeIDs, edgeVertices = meshArrays.getEdgeVertexArrays(edgeIndices, edgeCount)
+                with profiling.stage("chaining"):
+                    entry = chainCache.ChainEntry.fromSegregatedList(core.buildEdgeChains(edgeIDs, edgeVertices))     # linear-time chaining
+                if cache is not None:
+                    cache.put(parentName, topologyKey, selectionKey, entry)
+        profiling.count("chains", entry.numChains())
+
+        with profiling.stage("pointFetch"):
+            points = meshArrays.getPointArray(entry.pointIndices.tolist())
+            upVectors = meshArrays.getUpVectorArray(entry.pointIndices.tolist())
+            noodleSets.append(NoodleSet.fromChainArrays(parentName, entry.pointIndices, entry.chainOffsets, entry.edgeIDs, entry.edgeOffsets, points, upVectors))
+
+    return NoodleSet.concatenate(noodleSets)
+
+# legacy dict view of getNoodleSetFromEdges(): {parentName: [[MPoint, ...]]} with all chains of a mesh in one flattened list
+# splitChains: keep one MPoint list per chain ({parentName: [[MPoint, ...], [MPoint, ...]]}) instead
+# withUpVectors: also return the vertex normals of every point as upVectors, nested the same way: (masterPointDict, masterUpVectorDict)
+def getPointDictFromEdges(useReference=False, splitChains=False, withUpVectors=False):
+    noodleSet = getNoodleSetFromEdges(useReference)
     masterPointDict = {}
+    masterUpVectorDict = {}
+
+    for parentName in noodleSet.parentNames:
+        chains = noodleSet.chainsOf(parentName)
+        chainPointLists = [arrayToPoints(noodleSet.chainPoints(chain), om.MPoint) for chain in chains]
+        chainUpVectorLists = [arrayToPoints(noodleSet.chainUpVectors(chain), om.MVector) for chain in chains]
+        if splitChains:
+            masterPointDict[parentName] = chainPointLists                                                   # one list of MPoints per chain
+            masterUpVectorDict[parentName] = chainUpVectorLists
+        else:
+            masterPointDict[parentName] = [[point for pointList in chainPointLists for point in pointList]]     # list of lists of MPoints grouped by segregatedList
+            masterUpVectorDict[parentName] = [[upVector for upList in chainUpVectorLists for upVector in upList]]
+
+    profiling.debug(lambda: pprint.pformat(masterPointDict))
+    if withUpVectors:
+        return masterPointDict, masterUpVectorDict
+    return masterPointDict
+
+# (parentName, MFnMesh, selected edge indices, edge count) for every entry of the active selection, with error handling for invalid selections
+def getSelectedMeshEdges():
     edgeSelection = om.MSelectionList()
     om.MGlobal.getActiveSelectionList(edgeSelection)
     selLength = edgeSelection.length()
@@ -187,208 +429,189 @@ def getPointDictFromEdges():
     if edgeSelection.isEmpty():
         raise Exception ("Nothing is selected!")
 
-    for index in xrange(selLength):
-        edgeDagPath, edgeComponent = getMDagPath(index, edgeSelection)
-        edgeObject = om.MObject()
-        edgeSelection.getDependNode(index, edgeObject)   
-
-        # error handling: invalid selections
-        if not edgeDagPath.isValid():
-            raise Exception ("Invalid DAG Path. Have you selected an appropriate node?")   # expound on this later
-        if edgeComponent.apiTypeStr() != "kMeshEdgeComponent":
-            raise Exception ("Selected component/s are not of type kMeshEdgeComponent. Are you in edge selection xOffsete and have selected at least 1 edge?") 
-        if edgeObject.isNull():
-            raise Exception ("Resulting MObject returned a null value.  Have you selected an appropriate node?")
-
-        parentName = edgeDagPath.fullPathName()        
-        edgeMesh = om.MFnMesh(edgeDagPath)  
-        edgeSIComponent = om.MFnSingleIndexedComponent(edgeComponent)
-        edgeCount = edgeSIComponent.elementCount() 
-        edgeIndices = om.MIntArray() 
-        edgeSIComponent.getElements(edgeIndices)        # returns all indices of selected edges
-
-        segregatedList = getSegregatedPointIndices(edgeMesh, edgeIndices, edgeCount)    # get a list of lists with edgeIndices grouped by connected edges
-        lst = masterPointDict.get(parentName, [])                       
-        nodePointList = getPointMasterList(edgeMesh, segregatedList)
-        lst.append(nodePointList)                                                # list of lists of MPoints grouped by segregatedList
-
-        masterPointDict[parentName] = lst
-
-    pprint.pprint(masterPointDict)    
-    return masterPointDict
-
-# segregate point indices into respective lists based on edge connection
-def getSegregatedPointIndices(edgeMesh, edgeIndices, edgeCount):    
-    edgeUtil = om.MScriptUtil()
-    edgeVertices = edgeUtil.asInt2Ptr()
-    segregatedList = []                     # entry format: [[connected Edge/s], [connected Points]]
-    listCount = 0                           # final number of point lists
-    pointNrms = {}                          # dictionary of upVectors (normals)
-
-    # consolidated into one for loop (split as you go). 
-    # Take into account every possible case i.e. point lists connected to each other, multiple meshes    
-    for index in xrange(edgeCount):
-        edgeID = edgeIndices[index]
-        edgeMesh.getEdgeVertices(edgeID, edgeVertices)
-        inP0 = edgeUtil.getInt2ArrayItem(edgeVertices, 0, 0)    # p0 index
-        inP1 = edgeUtil.getInt2ArrayItem(edgeVertices, 0, 1)    # p1 index
-
-        # creating dictionary of normals
-        if not inP0 in pointNrms:
-            N = om.MVector()
-            edgeMesh.getVertexNormal(inP0, True, N)
-            pointNrms[inP0] = N
-        if not inP1 in pointNrms:
-            N = om.MVector()
-            edgeMesh.getVertexNormal(inP1, True, N)
-            pointNrms[inP1] = N
-
-        # if edge exists anywhere inside any of the lists so far, skip to next edge
-        for cidx in xrange(len(segregatedList)):
-            if edgeID in segregatedList[cidx][0]:
-                break
-        else:
-            for current in xrange(len(segregatedList)):
-                # helper local variables
-                pointTailIndex = len(segregatedList[current][1]) - 1        # index of the tail (last value) of the current point list to be compared to
-                headPoint = segregatedList[current][1][0]                   # current head point (type: int)
-                tailPoint = segregatedList[current][1][pointTailIndex]      # current tail point (type: int)
-                currentPoints = segregatedList[current][1]                  # list of all point indices in current list to be compared  (type: list of ints)
-                currentEdgeIndices = segregatedList[current][0]             # list of current edge indices in list to be compared to  (type: list of ints)
- 
-                if inP0 == headPoint:                               # case 1: incoming p0 matches head of existing list
-                    currentEdgeIndices.insert(0, edgeID)            # add edgeID to list of connected edges
-                    currentPoints.insert(0, inP1)                   # insert partner to head (inP1, head, ...) - p1 is now head of list
-                    break
-                elif inP1 == headPoint:                             # case 2: incoming p1 matches head of existing list
-                    currentEdgeIndices.insert(0, edgeID)            # add edgeID to list of connected edges
-                    currentPoints.insert(0, inP0)                   # insert partner to head (inP0, head, ...) - p0 is now head of list
-                    break
-                elif inP0 == tailPoint:                             # case 3: incoming p0 matches tail of existing list
-                    currentEdgeIndices.append(edgeID)               # add edgeID to list of connected edges
-                    currentPoints.append(inP1)                      # insert partner to tail (..., tail, p1) - p1 is now tail of list
-                    break                               
-                elif inP1 == tailPoint:                             # case 4: incoming p1 matches tail of existing list
-                    currentEdgeIndices.append(edgeID)               # add edgeID to list of connected edges
-                    currentPoints.append(inP0)                      # insert partner to tail (..., tail, p0) - p0 is now tail of list 
-                    break   
-                else:
-                    if inP0 in currentPoints or inP1 in currentPoints:      # case 5: either p1 or p0 is somewhere in the middle of existing list
-                        segregatedList.append([[edgeID], [inP0, inP1]])     # create a new point list entry (as a T-section of the shared point)
-                        listCount += 1
-                        break
-            else:
-                segregatedList.append([[edgeID], [inP0, inP1]])     # case 6: edge's points are not connected anywhere
-                listCount += 1                                   # create a new independent point list entry 
-
-    # connecting point lists with shared endpoints
-    # Note: duplicate edges have already been removed in previous step so no need to check for them again below
-    outList = segregatedList[:]      
-    outIndex = 0                         
-    compIndex = 0                        
-    listLength = len(outList)
-
-    while outIndex + 1 < listLength:            # skip first entry (no need to compare with itself)
-        # helper variables
-        isMerged = False
-        compIndex = outIndex + 1                # compare current entry to next
-
-        outPoints = outList[outIndex][1]
-        outEdgeIndices = outList[outIndex][0]    
-        compPoints = outList[compIndex][1]
-        compEdgeIndices = outList[compIndex][0]
-   
-        outHead = outList[outIndex][1][0]
-        outTail = outList[outIndex][1][-1]
-        compHead = outList[compIndex][1][0]
-        compTail = outList[compIndex][1][-1]
-
-        while compIndex < listLength:
-            if outHead == compHead and outTail == compTail:                     # test for duplicate/looping points
-                l0 = set(outPoints)                                                     
-                l1 = set(compPoints)
-                if l0 == l1:
-                    # case 0: duplicate set of points, skip entry 
-                    break
-                else:                                                
-                                                                                # case 1: (edge case) points connected in a loop (essentially closing the loop)                                                                                
-                    compPoints.reverse()                                        # reverse the order of the points to be added 
-                    compEdgeIndices.reverse()                                   # reverse the order of the edge indices to be added               
-                    outPoints[:0] = compPoints[:-1]                             # insert the contents of the incoming points in reverse order in front (must add at least either head or tail to close the loop)                                
-                    outEdgeIndices[:0] = compEdgeIndices                        # insert the associated edge indices in front in reverse order
-                    isMerged = True
-                break 
-
-            if outHead == compHead:                         # case 2: current head connected to opposing head                                 
-                compPoints.reverse()                        # reverse the order of the points to be added 
-                compEdgeIndices.reverse()                   # reverse the order of the edge indices to be added    
-                outPoints[:0] = compPoints[:-1]             # insert the contents of the incoming points in reverse order in front, excluding the connected point at the last index
-                outEdgeIndices[:0] = compEdgeIndices[:]     # insert the associated edge indices in front in reverse order     
-                isMerged = True
-                break
-
-            # working
-            elif outHead == compTail:                       # case 3: current head connected to opposing tail         
-                outPoints[:0] = compPoints[:-1]             # insert the contents of the incoming points in reverse order in front, excluding the connected point at the last index
-                outEdgeIndices[:0] = compEdgeIndices[:]     # insert the associated edge indices in front  
-                isMerged = True
-                break
-
-            # working
-            elif outTail == compHead:                       # case 4: current tail connected to opposing head
-                print compPoints[1:] 
-                outPoints.extend(compPoints[1:])            # extend the output list by the incoming list, excluding the connected point at the first index
-                outEdgeIndices.extend(compEdgeIndices[:] )  # extend the output edge indices by the associated incoming edge indices
-                isMerged = True
-                break
-
-            # working    
-            elif outTail == compTail:                       # case 5: current tail connected to opposing tail                
-                compPoints.reverse()                        # reverse the order of the points to be added 
-                compEdgeIndices.reverse()                   # reverse the order of the edge indices to be added  
-                outPoints.extend(compPoints[1:])            # extend the output list by the reversed incoming list, excluding the connected point at the first index
-                outEdgeIndices.extend(compEdgeIndices[:] )  # extend the output edge indices by the associated incoming edge indices   
-                isMerged = True
-                break
-            else:
-                compIndex += 1              # if no matching cases are found, proceed with next iteration
-
-        if isMerged == True:                        
-            outList.pop(compIndex)          # remove old list entry that has already been merged (both edge indices and points list)
-            listLength = len(outList)       # update the list length
-            outIndex = 0                    # start again from the beginning
-        else:
-            outIndex += 1                   # proceed to next entry
-
-    print "final output list: " + str(outList)
-
-    # return outList, pointNrms
+    for index in range(selLength):
+        with profiling.stage("selection"):
+            edgeDagPath, edgeComponent = getMDagPath(index, edgeSelection)
+            edgeObject = om.MObject()
+            edgeSelection.getDependNode(index, edgeObject)   
+
+            # error handling: invalid selections
+            if not edgeDagPath.isValid():
+                raise Exception ("Invalid DAG Path. Have you selected an appropriate node?")   # expound on this later
+            if edgeComponent.apiTypeStr() != "kMeshEdgeComponent":
+                raise Exception ("Selected component/s are not of type kMeshEdgeComponent. Are you in edge selection xOffsete and have selected at least 1 edge?") 
+            if edgeObject.isNull():
+                raise Exception ("Resulting MObject returned a null value.  Have you selected an appropriate node?")
+
+            parentName = edgeDagPath.fullPathName()        
+            edgeMesh = om.MFnMesh(edgeDagPath)  
+            edgeSIComponent = om.MFnSingleIndexedComponent(edgeComponent)
+            edgeCount = edgeSIComponent.elementCount() 
+            edgeIndices = om.MIntArray() 
+            edgeSIComponent.getElements(edgeIndices)        # returns all indices of selected edges
+        profiling.count("edges", edgeCount)
+        yield parentName, edgeMesh, edgeIndices, edgeCount
+
+# getSelectedMeshEdges() entry for edge IDs stored with a registered noodle (see registry.py), as a list
+def getStoredMeshEdges(parentName, edgeIDs):
+    meshSelection = om.MSelectionList()
+    meshSelection.add(parentName)
+    meshDagPath, meshComponent = getMDagPath(0, meshSelection)
+
+    # error handling: source mesh deleted / renamed since the noodle was made
+    if not meshDagPath.isValid():
+        raise Exception ("Source mesh " + parentName + " of the noodle is no longer valid!")
+    return [(parentName, om.MFnMesh(meshDagPath), toIntArray(edgeIDs), len(edgeIDs))]
+
+# mesh data read in bulk once per getNoodleSetFromEdges() call: all points and vertex normals in one call each, copied into
+# numpy arrays in one more call each (see copyArray()), and the vertices of every edge asked for (the API has no bulk
+# edge-vertex query, so edges are fetched once and kept)
+class MeshArrays(object):
+    def __init__(self, edgeMesh):
+        self.edgeMesh = edgeMesh
+        pointArray = om.MPointArray()
+        edgeMesh.getPoints(pointArray)
+        self.points = pointArrayToArray(pointArray)         # (V, 3) float64
+        normalArray = om.MFloatVectorArray()
+        edgeMesh.getVertexNormals(True, normalArray)
+        self.normals = floatVectorArrayToArray(normalArray) # (V, 3) float64
+        self.edgeTable = {}             # edgeID -> (p0 index, p1 index)
+        self.topologyKey = None
+
+    # chainCache.getTopologyKey() of the mesh's face counts / face vertex lists (read once)
+    def getTopologyKey(self):
+        if self.topologyKey is None:
+            self.topologyKey = chainCache.getTopologyKey(*getMeshTopology(self.edgeMesh))
+        return self.topologyKey
+
+    # same as getEdgeVertexArrays(), without fetching any edge twice
+    def getEdgeVertexArrays(self, edgeIndices, edgeCount):
+        edgeIDs = intArrayToArray(edgeIndices, edgeCount)
+        missing = [edgeID for edgeID in edgeIDs.tolist() if edgeID not in self.edgeTable]
+        if missing:
+            missingIDs, missingVertices = getEdgeVertexArrays(self.edgeMesh, missing, len(missing))
+            self.edgeTable.update(zip(missingIDs.tolist(), missingVertices.tolist()))
+        edgeVertices = np.array([self.edgeTable[edgeID] for edgeID in edgeIDs.tolist()], dtype=np.int64).reshape(-1, 2)
+        return edgeIDs, edgeVertices
+
+    # (n, 3) float64 arrays of the given points / normals
+    def getPointArray(self, pointIndices):
+        return self.points[np.asarray(pointIndices, dtype=np.int64)]
+
+    def getUpVectorArray(self, pointIndices):
+        return self.normals[np.asarray(pointIndices, dtype=np.int64)]
+
+# (polyCounts, polyConnects) int64 arrays of a mesh's faces: one getVertices() call and one bulk copy per array
+def getMeshTopology(edgeMesh):
+    polyCounts = om.MIntArray()
+    polyConnects = om.MIntArray()
+    edgeMesh.getVertices(polyCounts, polyConnects)
+    return intArrayToArray(polyCounts, polyCounts.length()), intArrayToArray(polyConnects, polyConnects.length())
+
+# segregate point indices into respective lists based on edge connection (reference mode, see core.segregatePointIndices())
+def getSegregatedPointIndices(edgeMesh, edgeIndices, edgeCount):
+    with profiling.stage("edgeFetch"):
+        edgeIDs, edgeVertices = getEdgeVertexArrays(edgeMesh, edgeIndices, edgeCount)
+    with profiling.stage("chaining"):
+        outList = core.segregatePointIndices(edgeIDs, edgeVertices)
+    profiling.debug(lambda: "final output list: " + str(outList))
     return outList  # list of lists of each noodle's point indices
 
-# create master list of all points grouped by passed segregatedList
-def getPointMasterList(edgeMesh, segregatedList):
-    masterList = []
-    for index in xrange(len(segregatedList)):        
-        for i in xrange(len(segregatedList[index][1])):
-            point = om.MPoint()
-            edgeMesh.getPoint(segregatedList[index][1][i], point)                     
-            masterList.append(point)
-    return masterList   # list of lists of MPoints segregated into their own divisions
+# selected edge IDs as an (E,) int array and their point indices as an (E, 2) int array
+def getEdgeVertexArrays(edgeMesh, edgeIndices, edgeCount):
+    edgeUtil = om.MScriptUtil()
+    edgePtr = edgeUtil.asInt2Ptr()
+    edgeIDs = np.empty(edgeCount, dtype=np.int64)
+    edgeVertices = np.empty((edgeCount, 2), dtype=np.int64)
+
+    for index in range(edgeCount):
+        edgeIDs[index] = edgeIndices[index]
+        edgeMesh.getEdgeVertices(edgeIndices[index], edgePtr)
+        edgeVertices[index, 0] = edgeUtil.getInt2ArrayItem(edgePtr, 0, 0)    # p0 index
+        edgeVertices[index, 1] = edgeUtil.getInt2ArrayItem(edgePtr, 0, 1)    # p1 index
+    return edgeIDs, edgeVertices
+
+# (n, 3) float64 array from a list of MPoints / MVectors (arrays, e.g. NoodleSet.chainPoints() views, are passed through)
+def pointsToArray(pointList):
+    if isinstance(pointList, np.ndarray):
+        return pointList
+    return np.array([(p.x, p.y, p.z) for p in pointList], dtype=np.float64)
+
+# (count,) int64 array from the first count items of an MIntArray (or any indexable)
+def intArrayToArray(intArray, count):
+    if isinstance(intArray, om.MIntArray):
+        return copyArray(intArray, 1, "asIntPtr", ctypes.c_int)[:count, 0].astype(np.int64)
+    return np.array([intArray[index] for index in range(count)], dtype=np.int64)
+
+# (n, 3) float64 array from an MPointArray
+def pointArrayToArray(pointArray):
+    return copyArray(pointArray, 4, "asDouble4Ptr", ctypes.c_double)[:, :3].copy()
+
+# (n, 3) float64 array from an MFloatVectorArray
+def floatVectorArrayToArray(vectorArray):
+    return copyArray(vectorArray, 3, "asFloat3Ptr", ctypes.c_float).astype(np.float64)
+
+# (length, width) array of a Maya array's items, copied out with a single mayaArray.get() call into an MScriptUtil buffer
+# (ptrType: the MScriptUtil pointer getter matching get()'s argument, ctype: its element type) and read from the buffer's address,
+# so nothing is converted item by item in Python
+def copyArray(mayaArray, width, ptrType, ctype):
+    length = mayaArray.length()
+    size = length * width
+    if size == 0:
+        return np.zeros((0, width), dtype=np.dtype(ctype))
+    util = om.MScriptUtil()
+    util.createFromList([0] * size, size)
+    ptr = getattr(util, ptrType)()
+    mayaArray.get(ptr)
+    return np.ctypeslib.as_array((ctype * size).from_address(int(ptr))).reshape(length, width).copy()
+
+# MFloatPointArray from the rows of an (n, 3) array
+def toFloatPointArray(points):
+    points = np.asarray(points).reshape(-1, 3)
+    return toMayaArray(om.MFloatPointArray, np.concatenate([points, np.ones((len(points), 1))], axis=1), 4, "asFloat4Ptr", ctypes.c_float)
+
+# MFloatArray from a float array
+def toFloatArray(values):
+    return toMayaArray(om.MFloatArray, values, 1, "asFloatPtr", ctypes.c_float)
+
+# MIntArray from an int array
+def toIntArray(values):
+    return toMayaArray(om.MIntArray, values, 1, "asIntPtr", ctypes.c_int)
+
+# Maya array (arrayType) of the rows of an (n, width) array, built with a single arrayType(src[], count) constructor call: the
+# reverse of copyArray(), the values are moved into an MScriptUtil buffer (ptrType / ctype as there) in one memmove
+def toMayaArray(arrayType, values, width, ptrType, ctype):
+    values = np.ascontiguousarray(values, dtype=np.dtype(ctype)).reshape(-1, width)
+    if len(values) == 0:
+        return arrayType()
+    util = om.MScriptUtil()
+    util.createFromList([0] * values.size, values.size)
+    ptr = getattr(util, ptrType)()
+    ctypes.memmove(int(ptr), values.ctypes.data, values.nbytes)
+    return arrayType(ptr, len(values))
+
+# list of MPoints / MVectors (pointType) from the rows of an (n, 3) array
+def arrayToPoints(points, pointType):
+    return [pointType(x, y, z) for x, y, z in points.tolist()]
 
 # print matrix contents for debugging
 def printMatrix(matrix):
     result = '% .06f, % .06f, % .06f, % .06f,\n% .06f, % .06f, % .06f, % .06f,\n% .06f, % .06f, % .06f, % .06f,\n% .06f, % .06f, % .06f, % .06f,\n'
-    print result % (matrix(0, 0), matrix(0, 1), matrix(0, 2), matrix(0, 3), matrix(1, 0), matrix(1, 1), matrix(1, 2), matrix(1, 3), matrix(2, 0), matrix(2, 1), matrix(2, 2), matrix(2, 3), matrix(3, 0), matrix(3, 1), matrix(3, 2), matrix(3, 3))
+    print (result % (matrix(0, 0), matrix(0, 1), matrix(0, 2), matrix(0, 3), matrix(1, 0), matrix(1, 1), matrix(1, 2), matrix(1, 3), matrix(2, 0), matrix(2, 1), matrix(2, 2), matrix(2, 3), matrix(3, 0), matrix(3, 1), matrix(3, 2), matrix(3, 3)))
 
-# delete existing noodles(cylinders)
-def deleteNoodles():
+# delete existing noodles(cylinders): the registered noodles of the given source meshes (all by default), in one undo chunk
+# (registry lookup instead of a pNoodle* name scan, so nodes that only look like noodles are left alone); returns the deleted noodles
+def deleteNoodles(sources=None):
     """Deletes existing "cylinder"/s (if any)"""
-    noodleList = cmds.ls("pNoodle*")     
-    if len(noodleList) > 0:               
-        cmds.delete (noodleList)      
-
-# create base noodle (cylinder) with arguments numSections (each section with a unit length of 1), rad (cylinder radius)
-def createNoodle(numSections, rad):    
-    result = cmds.polyCylinder(radius = rad, axis = [1, 0, 0], height = numSections , sy = numSections, name = "pNoodle#")
-    print "result: " + str(result)
+    with registry.undoChunk("deleteNoodles"):
+        return defaultRegistry.delete(defaultRegistry.getRecords(sources))
+
+# create base noodle (straight tube along x, centered on the origin) with arguments numSections (each section with a unit length of 1), rad (tube radius)
+# generated directly instead of through polyCylinder; returns [noodleTransform]
+def createNoodle(numSections, rad, sides=20):
+    chainPoints = np.zeros((numSections + 1, 3))
+    chainPoints[:, 0] = np.arange(numSections + 1) - numSections / 2.0
+    points, polyCounts, polyConnects, uvs, uvIds = core.buildTube(chainPoints, rad, sides)
+    result = [createNoodleMesh(points, polyCounts, polyConnects, np.array([0, len(polyCounts)]), None, uvs, uvIds)]
+    profiling.debug(lambda: "result: " + str(result))
     return result
\ No newline at end of file
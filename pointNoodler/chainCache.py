@@ -0,0 +1,163 @@
+"""
+-- pointNoodler chain cache --
+Chaining results kept between runs, so reruns on the same mesh and edge selection (e.g. only changing radius or sides)
+skip edge fetching and chaining entirely.  Opt-in (getNoodleSetFromEdges(cache=pointNoodler.defaultChainCache)): computing
+the topology key reads the whole mesh, so a hit only beats chaining for selections that are large next to their mesh
+(135k-face mesh, 201 selected edges: a hit takes longer than fetching and chaining the edges again).
+
+Entries are keyed by two hashes: getTopologyKey() of the mesh's polygon topology (face counts + face vertex lists, which
+also fix Maya's edge numbering) and getSelectionKey() of the selected edge IDs in selection order.  Any topology edit changes
+the topology key, and all entries of a mesh are dropped as soon as it is looked up with a new one.
+
+    cache = ChainCache(maxEntries=64, directory=None)           # directory: optional on-disk store (one .npz per entry, also capped at maxEntries)
+    entry = cache.get(meshName, topologyKey, selectionKey)      # ChainEntry or None
+    cache.put(meshName, topologyKey, selectionKey, ChainEntry.fromSegregatedList(segregatedList))
+"""
+import hashlib
+import os
+from collections import OrderedDict
+
+import numpy as np
+
+from pointNoodler import core
+from pointNoodler import fileUtils
+from pointNoodler import profiling
+from pointNoodler.noodleSet import getChainArrays
+
+ENTRY_FIELDS = ("pointIndices", "chainOffsets", "edgeIDs", "edgeOffsets", "closed")
+
+
+# hash of a mesh's polygon topology
+def getTopologyKey(polyCounts, polyConnects):
+    return hashArrays(polyCounts, polyConnects)
+
+# hash of an edge selection (order matters: chains come out in order of their first selected edge)
+def getSelectionKey(edgeIDs):
+    return hashArrays(edgeIDs)
+
+def hashArrays(*arrays):
+    digest = hashlib.sha1()
+    for values in arrays:
+        values = np.ascontiguousarray(values, dtype=np.int64)
+        digest.update(np.int64(len(values)).tobytes())
+        digest.update(values.tobytes())
+    return digest.hexdigest()
+
+
+class ChainEntry(object):
+    __slots__ = ENTRY_FIELDS
+
+    def __init__(self, pointIndices, chainOffsets, edgeIDs, edgeOffsets, closed):
+        self.pointIndices = pointIndices    # (P,) int32 source mesh point indices, chain after chain
+        self.chainOffsets = chainOffsets    # (C + 1,) int64 first point of each chain
+        self.edgeIDs = edgeIDs              # (E,) int32 source mesh edge IDs, chain after chain
+        self.edgeOffsets = edgeOffsets      # (C + 1,) int64 first edge of each chain
+        self.closed = closed                # (C,) bool, True for closed loops
+
+    # entry arrays are made read-only: NoodleSets built from an entry share them
+    @classmethod
+    def fromSegregatedList(cls, segregatedList):
+        closed = np.array([core.isClosedChain(chain[1]) for chain in segregatedList], dtype=bool)
+        entry = cls(*(getChainArrays(segregatedList) + (closed,)))
+        for field in ENTRY_FIELDS:
+            getattr(entry, field).setflags(write=False)
+        return entry
+
+    def numChains(self):
+        return len(self.chainOffsets) - 1
+
+    # [[connected Edge/s], [connected Points]] entries, same format as core.buildEdgeChains()
+    def toSegregatedList(self):
+        return [[self.edgeIDs[self.edgeOffsets[chain]:self.edgeOffsets[chain + 1]].tolist(),
+                 self.pointIndices[self.chainOffsets[chain]:self.chainOffsets[chain + 1]].tolist()] for chain in range(self.numChains())]
+
+
+class ChainCache(object):
+    def __init__(self, maxEntries=64, directory=None):
+        self.maxEntries = maxEntries
+        self.directory = directory
+        self.entries = OrderedDict()        # (topologyKey, selectionKey) -> ChainEntry, least recently used first
+        self.meshTopology = {}              # mesh name -> topologyKey it was last seen with
+
+    # cached entry for meshName's selection, or None
+    def get(self, meshName, topologyKey, selectionKey):
+        self.checkTopology(meshName, topologyKey)
+        key = (topologyKey, selectionKey)
+        entry = self.entries.pop(key, None)
+        if entry is None and self.directory is not None:
+            entry = self.load(key)
+        if entry is None:
+            profiling.count("chainCacheMisses")
+            return None
+        self.entries[key] = entry
+        profiling.count("chainCacheHits")
+        return entry
+
+    def put(self, meshName, topologyKey, selectionKey, entry):
+        self.checkTopology(meshName, topologyKey)
+        key = (topologyKey, selectionKey)
+        self.entries.pop(key, None)
+        self.entries[key] = entry
+        while len(self.entries) > self.maxEntries:
+            self.entries.popitem(last=False)
+        if self.directory is not None:
+            self.save(key, entry)
+
+    # topology of meshName was edited: forget every entry of its old topology
+    def checkTopology(self, meshName, topologyKey):
+        oldKey = self.meshTopology.get(meshName)
+        if oldKey is not None and oldKey != topologyKey:
+            self.invalidate(meshName)
+        self.meshTopology[meshName] = topologyKey
+
+    # drop the entries of meshName's current topology (of every mesh if meshName is None), in memory and on disk
+    def invalidate(self, meshName=None):
+        if meshName is None:
+            topologyKeys = None
+            self.meshTopology = {}
+        else:
+            topologyKeys = set([self.meshTopology.pop(meshName, None)])
+        for key in list(self.entries):
+            if topologyKeys is None or key[0] in topologyKeys:
+                del self.entries[key]
+        if self.directory is not None and os.path.isdir(self.directory):
+            for fileName in os.listdir(self.directory):
+                if fileName.endswith(".npz") and (topologyKeys is None or fileName.split("_")[0] in topologyKeys):
+                    os.remove(os.path.join(self.directory, fileName))
+
+    def clear(self):
+        self.invalidate()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def getPath(self, key):
+        return os.path.join(self.directory, "%s_%s.npz" % key)
+
+    def load(self, key):
+        path = self.getPath(key)
+        if not os.path.exists(path):
+            return None
+        with np.load(path) as data:
+            entry = ChainEntry(*[data[field] for field in ENTRY_FIELDS])
+        for field in ENTRY_FIELDS:
+            getattr(entry, field).setflags(write=False)
+        os.utime(path, None)                # most recently used, see trimDirectory()
+        return entry
+
+    # see fileUtils.writeAtomic()
+    def save(self, key, entry):
+        if not os.path.isdir(self.directory):
+            os.makedirs(self.directory)
+        arrays = dict((field, getattr(entry, field)) for field in ENTRY_FIELDS)
+        fileUtils.writeAtomic(self.getPath(key), lambda f: np.savez(f, **arrays), binary=True)
+        self.trimDirectory()
+
+    # the on-disk store keeps at most maxEntries files too, dropping the least recently saved / loaded ones first
+    def trimDirectory(self):
+        paths = [os.path.join(self.directory, fileName) for fileName in os.listdir(self.directory) if fileName.endswith(".npz")]
+        if len(paths) <= self.maxEntries:
+            return
+        paths.sort(key=os.path.getmtime)
+        for path in paths[:len(paths) - self.maxEntries]:
+            os.remove(path)
@@ -0,0 +1,325 @@
+"""
+-- pointNoodler batch CLI --
+Headless noodling of exported meshes (no Maya, no stand-in): chaining and tube generation straight from files, for farm jobs.
+
+Inputs (any number, or @listFile with one argument per line):
+-mesh.obj   : OBJ points / faces, plus the selected edges in mesh.edges next to it (or --edges for a single input):
+              the Maya edge ID and its two vertex indices (0-based, OBJ order) per line, or just the two vertex indices
+              (the edge IDs written out are then the line numbers of the edge file)
+-mesh.npz   : NumPy arrays points (V, 3) and edgeVertices (E, 2) (mesh point indices of every selected edge),
+              optional edgeIDs (E,), upVectors (V, 3) and polyCounts / polyConnects (for vertex normals)
+
+Edges are always given by their vertices: Maya numbers edges by its own internal order, which can't be rebuilt from the
+faces of an exported mesh, so edge IDs on their own would silently select the wrong edges.
+
+Meshes are processed one at a time per worker (--workers) and their chains are built and written in batches of about
+--batch-points chain points, so memory stays bounded by the batch size (or the longest single chain), not by the mesh or
+the number of inputs.
+
+Outputs per mesh in --output (flat binary buffers, appended batch by batch, to be opened with np.memmap / loadNoodleBuffers()):
+-<name>.points.bin (V, 3) float32, .polyCounts.bin (F,) int32, .polyConnects.bin (N,) int32, .uvs.bin (U, 2) float32,
+ .uvIds.bin (N,) int32, .faceOffsets.bin (C + 1,) int64 (noodle c owns faces faceOffsets[c]:faceOffsets[c + 1]),
+ .edgeIDs.bin (E,) int32 / .edgeOffsets.bin (C + 1,) int64 (source edges of every noodle)
+-<name>.json : dtype / shape of every buffer plus the generation parameters (written last, and only if every batch succeeded:
+               a mesh is complete once it exists; the buffers of a failed mesh are deleted)
+-<name>.obj  : with --obj, the noodles as one OBJ object with UVs
+
+    python -m pointNoodler.cli assets/*.obj -o noodles --radius 0.1 --sides 8 --workers 8
+    python -m pointNoodler.cli @assetList.txt -o noodles --obj
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+
+import numpy as np
+
+from pointNoodler import core
+from pointNoodler import fileUtils
+from pointNoodler import pipeline
+from pointNoodler import profiling
+
+BUFFERS = (("points", "<f4", 3), ("polyCounts", "<i4", 0), ("polyConnects", "<i4", 0), ("uvs", "<f4", 2), ("uvIds", "<i4", 0),
+           ("faceOffsets", "<i8", 0), ("edgeIDs", "<i4", 0), ("edgeOffsets", "<i8", 0))
+BUFFER_TYPES = dict((buffer, dtype) for buffer, dtype, width in BUFFERS)
+
+
+# (points (V, 3), polyCounts, polyConnects) of an OBJ file (v / f lines only; faces may use v/vt/vn and negative indices)
+def readObj(path):
+    points = []
+    polyCounts = []
+    polyConnects = []
+    with open(path) as f:
+        for line in f:
+            values = line.split()
+            if not values:
+                continue
+            if values[0] == "v":
+                points.append([float(value) for value in values[1:4]])
+            elif values[0] == "f":
+                face = [int(value.split("/")[0]) for value in values[1:]]
+                polyCounts.append(len(face))
+                polyConnects.extend(index - 1 if index > 0 else len(points) + index for index in face)
+    return np.array(points, dtype=np.float64).reshape(-1, 3), np.array(polyCounts, dtype=np.int64), np.array(polyConnects, dtype=np.int64)
+
+# area-weighted (Newell) vertex normals, same as the stand-in scene's
+def getVertexNormals(points, polyCounts, polyConnects):
+    faceStarts = np.repeat(np.cumsum(polyCounts) - polyCounts, polyCounts)
+    nextCorners = faceStarts + (np.arange(len(polyConnects)) - faceStarts + 1) % np.repeat(polyCounts, polyCounts)
+    a = points[polyConnects]
+    b = points[polyConnects[nextCorners]]
+    cornerNormals = np.stack([(a[:, 1] - b[:, 1]) * (a[:, 2] + b[:, 2]),
+                              (a[:, 2] - b[:, 2]) * (a[:, 0] + b[:, 0]),
+                              (a[:, 0] - b[:, 0]) * (a[:, 1] + b[:, 1])], axis=-1)
+    faceIds = np.repeat(np.arange(len(polyCounts)), polyCounts)
+    faceNormals = np.zeros((len(polyCounts), 3))
+    np.add.at(faceNormals, faceIds, cornerNormals)
+    normals = np.zeros_like(points)
+    np.add.at(normals, polyConnects, faceNormals[faceIds])
+    lengths = np.sqrt(np.einsum("ij,ij->i", normals, normals))
+    return normals / np.where(lengths > 0.0, lengths, 1.0)[:, None]
+
+# (edgeIDs, edgeVertices) from an edge file: an edge ID and two vertex indices per line, or two vertex indices per line
+# (edge IDs on their own are rejected, see the module notes)
+def readEdgeFile(path, numPoints):
+    values = np.loadtxt(path, dtype=np.int64, ndmin=2, comments="#")
+    if values.size == 0:
+        return np.zeros(0, dtype=np.int64), np.zeros((0, 2), dtype=np.int64)
+    if values.shape[1] == 1:
+        raise Exception ("Edge file " + path + " only has edge IDs! Maya's edge numbering can't be rebuilt from an OBJ, "
+                         "export the vertices of every edge with it (edge ID, p0, p1 per line).")
+    if values.shape[1] == 2:
+        edgeIDs, edgeVertices = np.arange(len(values)), values
+    elif values.shape[1] == 3:
+        edgeIDs, edgeVertices = values[:, 0], values[:, 1:]
+    else:
+        raise Exception ("Edge file " + path + " needs an edge ID and two vertex indices, or two vertex indices per line!")
+    if edgeVertices.min() < 0 or edgeVertices.max() >= numPoints:
+        raise Exception ("Edge file " + path + " has vertex indices outside of the mesh's " + str(numPoints) + " points!")
+    return edgeIDs, edgeVertices
+
+# pipeline.MeshJob of one input file (only the points used by the selected edges are kept)
+def readMeshJob(path, edgePath=None, useUpVectors=False):
+    name, ext = os.path.splitext(os.path.basename(path))
+    if ext.lower() == ".obj":
+        points, polyCounts, polyConnects = readObj(path)
+        edgeIDs, edgeVertices = readEdgeFile(edgePath or os.path.splitext(path)[0] + ".edges", len(points))
+        upVectors = getVertexNormals(points, polyCounts, polyConnects) if useUpVectors else None
+    elif ext.lower() == ".npz":
+        with np.load(path) as data:
+            points = data["points"]
+            if "edgeVertices" not in data:
+                raise Exception ("Mesh file " + path + " needs edgeVertices (edge IDs alone can't be mapped to Maya's edge numbering)!")
+            edgeVertices = data["edgeVertices"]
+            edgeIDs = data["edgeIDs"] if "edgeIDs" in data else np.arange(len(edgeVertices))
+            upVectors = None
+            if useUpVectors:
+                if "upVectors" in data:
+                    upVectors = data["upVectors"]
+                elif "polyCounts" in data:
+                    upVectors = getVertexNormals(points, data["polyCounts"], data["polyConnects"])
+                else:
+                    raise Exception ("Mesh file " + path + " has no upVectors (or faces to compute them from)!")
+    else:
+        raise Exception ("Unsupported mesh file " + path + " (use .obj or .npz)!")
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+    getUpVectors = (lambda pointIndices: np.asarray(upVectors, dtype=np.float64)[pointIndices]) if upVectors is not None else None
+    return pipeline.MeshJob.fromMeshArrays(name, edgeIDs, np.asarray(edgeVertices, dtype=np.int64), lambda pointIndices: points[pointIndices], getUpVectors)
+
+
+# buffers of one mesh, appended batch by batch; the header (<name>.json) is written by close(), abort() deletes everything instead
+class NoodleWriter(object):
+    def __init__(self, outputDir, name, params, writeObj=False):
+        self.prefix = os.path.join(outputDir, name)
+        self.name = name
+        self.params = params
+        if os.path.exists(self.prefix + ".json"):       # header of an earlier run: the mesh is incomplete until close()
+            os.remove(self.prefix + ".json")
+        self.files = dict((buffer, open(self.prefix + "." + buffer + ".bin", "wb")) for buffer, dtype, width in BUFFERS)
+        self.lengths = dict((buffer, 0) for buffer, dtype, width in BUFFERS)      # rows written so far
+        self.objFile = open(self.prefix + ".obj", "w") if writeObj else None
+        if self.objFile is not None:
+            self.objFile.write("o %s_noodles\n" % name)
+        self.write("faceOffsets", np.zeros(1))
+        self.write("edgeOffsets", np.zeros(1))
+
+    def write(self, buffer, values):
+        values = np.ascontiguousarray(values, dtype=BUFFER_TYPES[buffer])
+        values.tofile(self.files[buffer])
+        self.lengths[buffer] += len(values)
+
+    # one core.buildNoodleBatch() result (indices relative to the batch) plus the source edges of its chains
+    def writeBatch(self, points, polyCounts, polyConnects, faceOffsets, uvs, uvIds, edgeIDs, edgeOffsets):
+        vertexBase = self.lengths["points"]
+        uvBase = self.lengths["uvs"]
+        self.write("faceOffsets", faceOffsets[1:] + self.lengths["polyCounts"])
+        self.write("edgeOffsets", edgeOffsets[1:] + self.lengths["edgeIDs"])
+        if self.objFile is not None:
+            with profiling.stage("objWrite"):
+                writeObjBatch(self.objFile, points, polyCounts, polyConnects + vertexBase + 1, uvs, uvIds + uvBase + 1)
+        self.write("points", points)
+        self.write("polyCounts", polyCounts)
+        self.write("polyConnects", polyConnects + vertexBase)
+        self.write("uvs", uvs)
+        self.write("uvIds", uvIds + uvBase)
+        self.write("edgeIDs", edgeIDs)
+
+    def closeFiles(self):
+        for f in self.files.values():
+            f.close()
+        if self.objFile is not None:
+            self.objFile.close()
+
+    # failed mesh: delete its partial buffers (no header is written)
+    def abort(self):
+        self.closeFiles()
+        paths = [f.name for f in self.files.values()] + ([self.objFile.name] if self.objFile is not None else [])
+        for path in paths:
+            if os.path.exists(path):
+                os.remove(path)
+
+    # the header is written last (see fileUtils.writeAtomic()): a mesh is complete once its header exists
+    def close(self):
+        self.closeFiles()
+        buffers = {}
+        for buffer, dtype, width in BUFFERS:
+            length = self.lengths[buffer]
+            buffers[buffer] = {"path": os.path.basename(self.prefix) + "." + buffer + ".bin", "dtype": dtype,
+                               "shape": [length, width] if width else [length]}
+        header = {"name": self.name, "params": self.params, "buffers": buffers,
+                  "numNoodles": self.lengths["faceOffsets"] - 1, "numVertices": self.lengths["points"], "numFaces": self.lengths["polyCounts"]}
+        fileUtils.writeAtomic(self.prefix + ".json", lambda f: json.dump(header, f, indent=1, sort_keys=True))
+        return header
+
+def writeObjBatch(f, points, polyCounts, polyConnects, uvs, uvIds):
+    f.write("".join("v %.6g %.6g %.6g\n" % tuple(point) for point in points.tolist()))
+    f.write("".join("vt %.6g %.6g\n" % tuple(uv) for uv in uvs.tolist()))
+    corners = ["%d/%d" % corner for corner in zip(polyConnects.tolist(), uvIds.tolist())]
+    faceStarts = np.cumsum(polyCounts) - polyCounts
+    f.write("".join("f " + " ".join(corners[start:start + count]) + "\n" for start, count in zip(faceStarts.tolist(), polyCounts.tolist())))
+
+# {buffer: read-only np.memmap} of a mesh written by the CLI, from its <name>.json header
+def loadNoodleBuffers(headerPath):
+    with open(headerPath) as f:
+        header = json.load(f)
+    directory = os.path.dirname(headerPath)
+    buffers = {}
+    for buffer, info in header["buffers"].items():
+        shape = tuple(info["shape"])
+        if not np.prod(shape):
+            buffers[buffer] = np.zeros(shape, dtype=info["dtype"])          # empty files cannot be mapped
+        else:
+            buffers[buffer] = np.memmap(os.path.join(directory, info["path"]), dtype=info["dtype"], mode="r", shape=shape)
+    return buffers
+
+
+# chain one input and write its noodles batch by batch (module level so worker processes can unpickle it); returns its header
+def runFile(args):
+    path, edgePath, outputDir, params, batchPoints, writeObj = args
+    with profiling.stage("meshRead"):
+        job = readMeshJob(path, edgePath, params["useUpVectors"] or params["frameMode"] == "normal")
+    with profiling.stage("chaining"):
+        chains = core.buildEdgeChains(job.edgeIDs, job.edgeVertices)
+    profiling.count("edges", len(job.edgeIDs))
+    profiling.count("chains", len(chains))
+
+    writer = NoodleWriter(outputDir, job.name, params, writeObj)
+    try:
+        for start, end in getBatches([len(chain[1]) for chain in chains], batchPoints):
+            batch = chains[start:end]
+            chainPointsList = [job.points[chain[1]] for chain in batch]
+            upVectorsList = [job.upVectors[chain[1]] for chain in batch] if job.upVectors is not None else None
+            with profiling.stage("tubes"):
+                points, polyCounts, polyConnects, faceOffsets, uvs, uvIds = core.buildNoodleBatch(chainPointsList, params["radius"], params["sides"],
+                                                                                                   upVectorsList, params["caps"], params["frameMode"])
+            edgeOffsets = np.zeros(len(batch) + 1, dtype=np.int64)
+            edgeOffsets[1:] = np.cumsum([len(chain[0]) for chain in batch])
+            with profiling.stage("bufferWrite"):
+                writer.writeBatch(points, polyCounts, polyConnects, faceOffsets, uvs, uvIds,
+                                  np.array([edgeID for chain in batch for edgeID in chain[0]], dtype=np.int64), edgeOffsets)
+            profiling.count("noodles", len(batch))
+            profiling.count("verticesWritten", len(points))
+    except:
+        writer.abort()
+        raise
+    header = writer.close()
+    header["source"] = path
+    return header
+
+# (start, end) chain ranges of about batchPoints chain points each (at least one chain per batch)
+def getBatches(chainLengths, batchPoints):
+    batches = []
+    start = 0
+    size = 0
+    for index, length in enumerate(chainLengths):
+        if size and size + length > batchPoints:
+            batches.append((start, index))
+            start = index
+            size = 0
+        size += length
+    if start < len(chainLengths):
+        batches.append((start, len(chainLengths)))
+    return batches
+
+# headers of every input, in input order; inputs are handed to the workers one by one as they free up (never all loaded at once)
+def runFiles(paths, outputDir, params, edgePath=None, batchPoints=100000, writeObj=False, workers=1):
+    names = [os.path.splitext(os.path.basename(path))[0] for path in paths]
+    if len(set(names)) != len(names):
+        raise Exception ("Input files need unique names (outputs are written as <name>.*)!")
+    if edgePath is not None and len(paths) != 1:
+        raise Exception ("An edge file can only be given for a single input!")
+    if not os.path.isdir(outputDir):
+        os.makedirs(outputDir)
+
+    args = [(path, edgePath, outputDir, params, batchPoints, writeObj) for path in paths]
+    if workers is None:
+        workers = multiprocessing.cpu_count()
+    workers = min(workers, len(args))
+    if workers <= 1:
+        for arg in args:
+            yield runFile(arg)
+        return
+
+    pipeline.setPoolExecutable()
+    pool = multiprocessing.Pool(workers)
+    try:
+        for header in pool.imap(runFile, args, chunksize=1):
+            yield header
+    finally:
+        pool.close()
+        pool.join()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="pointNoodler batch CLI: noodles from exported meshes, without Maya", fromfile_prefix_chars="@")
+    parser.add_argument("inputs", nargs="+", help=".obj (with a .edges file next to it) or .npz mesh files, or @listFile")
+    parser.add_argument("-o", "--output", required=True, help="output directory")
+    parser.add_argument("--edges", help="edge file of a single .obj input (default: <input>.edges)")
+    parser.add_argument("--radius", type=float, default=0.1)
+    parser.add_argument("--sides", type=int, default=20)
+    parser.add_argument("--no-caps", action="store_true", help="leave the ends of open noodles open")
+    parser.add_argument("--frame-mode", default="average", choices=core.FRAME_MODES)
+    parser.add_argument("--up-vectors", action="store_true", help="use the vertex normals as upVectors")
+    parser.add_argument("--workers", type=int, default=1, help="meshes processed in parallel (0: one per CPU)")
+    parser.add_argument("--batch-points", type=int, default=100000, help="chain points built and written per batch (bounds memory)")
+    parser.add_argument("--obj", action="store_true", help="also write every mesh's noodles as <name>.obj")
+    parser.add_argument("--report", help="write stage timers / counters of this process as JSON to this file (see profiling.py)")
+    args = parser.parse_args(argv)
+
+    params = {"radius": args.radius, "sides": args.sides, "useUpVectors": args.up_vectors, "caps": not args.no_caps, "frameMode": args.frame_mode}
+    if args.report:
+        with profiling.capture(path=args.report):
+            printHeaders(runFiles(args.inputs, args.output, params, args.edges, args.batch_points, args.obj, args.workers or None))
+    else:
+        printHeaders(runFiles(args.inputs, args.output, params, args.edges, args.batch_points, args.obj, args.workers or None))
+    return 0
+
+# one summary line per finished mesh, as they come in
+def printHeaders(headers):
+    for header in headers:
+        print("%-30s %8d noodles %10d vertices %10d faces" % (header["name"], header["numNoodles"], header["numVertices"], header["numFaces"]))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
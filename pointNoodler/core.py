@@ -0,0 +1,598 @@
+"""
+-- pointNoodler core --
+Maya-independent topology and frame math used by pointNoodler.
+
+Everything in here works on plain arrays:
+-edge IDs           : (E,) int array of selected edge indices
+-edge vertices      : (E, 2) int array of each selected edge's point indices (same order as edge IDs)
+-points             : (V, 3) float64 array of mesh point positions
+-chains             : list of [[connected Edge/s], [connected Points]] entries (same format as getSegregatedPointIndices())
+
+The Maya adapters in pointNoodler/__init__.py only fetch these arrays from MFnMesh and push results back.
+"""
+import numpy as np
+from collections import deque
+from itertools import islice
+
+from pointNoodler import profiling
+
+WORLD_UP = np.array([0.0, 1.0, 0.0])
+
+# chain edges into [[connected Edge/s], [connected Points]] entries in O(E), the same chains as the reference segregatePointIndices():
+# through-paths continue across T-junctions and crossings wherever the reference pairs their edges, branches leaving the middle of
+# a chain are their own entries and closed loops repeat their first point (points[0] == points[-1])
+# -split pass: each edge extends the first chain holding one of its points (at its head / tail, otherwise it starts a branch),
+#  found through a point -> first chain index instead of a scan over every chain
+# -merge pass: the reference joins a chain with the one right after it when they share an end point, then starts over from the
+#  first chain; only the pair in front of a merged chain can start to match, so a stack replaces the restarts
+def buildEdgeChains(edgeIDs, edgeVertices):
+    chainEdges = []                         # per chain: deque of edge IDs, chains in order of their first edge
+    chainPoints = []                        # per chain: deque of point indices
+    firstChain = {}                         # point index -> index of the first chain holding it
+    seenEdges = set()
+
+    for edgeID, (p0, p1) in zip(np.asarray(edgeIDs).tolist(), np.asarray(edgeVertices).reshape(-1, 2).tolist()):
+        if edgeID in seenEdges:             # duplicate edge, skip
+            continue
+        seenEdges.add(edgeID)
+
+        numChains = len(chainPoints)
+        current = min(firstChain.get(p0, numChains), firstChain.get(p1, numChains))
+        if current < numChains:
+            points = chainPoints[current]
+            if p0 == points[0] or p1 == points[0]:                      # cases 1 / 2: extend the head
+                chainEdges[current].appendleft(edgeID)
+                points.appendleft(p1 if p0 == points[0] else p0)
+                firstChain[points[0]] = current
+                continue
+            if p0 == points[-1] or p1 == points[-1]:                    # cases 3 / 4: extend the tail
+                chainEdges[current].append(edgeID)
+                points.append(p1 if p0 == points[-1] else p0)
+                firstChain[points[-1]] = current
+                continue
+        # case 5: shared point inside the first chain holding it (T-section of the shared point), case 6: not connected anywhere
+        chainEdges.append(deque([edgeID]))
+        chainPoints.append(deque([p0, p1]))
+        firstChain.setdefault(p0, numChains)
+        firstChain.setdefault(p1, numChains)
+
+    # connecting chains with shared endpoints: the stack holds the chains already checked against the one after them
+    merged = []
+    for chain in zip(chainEdges, chainPoints):
+        while merged and mergeChains(merged[-1], chain):
+            chain = merged.pop()            # grown chain, check it against the one in front of it again
+        merged.append(chain)
+
+    return [[list(edges), list(points)] for edges, points in merged]
+
+# one step of the reference merge pass: join comp onto out when they share an end point (same cases in the same order)
+# returns False if they don't, or if comp holds the same points between the same ends (duplicate, left as it is)
+def mergeChains(outChain, compChain):
+    outEdges, outPoints = outChain
+    compEdges, compPoints = compChain
+    outHead, outTail = outPoints[0], outPoints[-1]
+    compHead, compTail = compPoints[0], compPoints[-1]
+
+    if outHead == compHead and outTail == compTail:
+        if set(outPoints) == set(compPoints):
+            return False                                    # case 0: duplicate set of points, skip entry
+        outPoints.extendleft(islice(compPoints, 1, None))  # case 1: points connected in a loop (closing the loop)
+        outEdges.extendleft(compEdges)
+    elif outHead == compHead:                               # case 2: current head connected to opposing head
+        outPoints.extendleft(islice(compPoints, 1, None))
+        outEdges.extendleft(compEdges)
+    elif outHead == compTail:                               # case 3: current head connected to opposing tail
+        outPoints.extendleft(islice(reversed(compPoints), 1, None))
+        outEdges.extendleft(reversed(compEdges))
+    elif outTail == compHead:                               # case 4: current tail connected to opposing head
+        outPoints.extend(islice(compPoints, 1, None))
+        outEdges.extend(compEdges)
+    elif outTail == compTail:                               # case 5: current tail connected to opposing tail
+        outPoints.extend(islice(reversed(compPoints), 1, None))
+        outEdges.extend(reversed(compEdges))
+    else:
+        return False
+    profiling.count("merges")
+    return True
+
+# reference chaining: the original split-as-you-go pass plus the merge pass of getSegregatedPointIndices(), unchanged apart from taking arrays
+def segregatePointIndices(edgeIDs, edgeVertices):
+    segregatedList = []                     # entry format: [[connected Edge/s], [connected Points]]
+
+    for edgeID, (inP0, inP1) in zip(np.asarray(edgeIDs).tolist(), np.asarray(edgeVertices).reshape(-1, 2).tolist()):
+        # if edge exists anywhere inside any of the lists so far, skip to next edge
+        for cidx in range(len(segregatedList)):
+            if edgeID in segregatedList[cidx][0]:
+                break
+        else:
+            for current in range(len(segregatedList)):
+                headPoint = segregatedList[current][1][0]                   # current head point (type: int)
+                tailPoint = segregatedList[current][1][-1]                  # current tail point (type: int)
+                currentPoints = segregatedList[current][1]                  # list of all point indices in current list to be compared  (type: list of ints)
+                currentEdgeIndices = segregatedList[current][0]             # list of current edge indices in list to be compared to  (type: list of ints)
+
+                if inP0 == headPoint:                               # case 1: incoming p0 matches head of existing list
+                    currentEdgeIndices.insert(0, edgeID)
+                    currentPoints.insert(0, inP1)
+                    break
+                elif inP1 == headPoint:                             # case 2: incoming p1 matches head of existing list
+                    currentEdgeIndices.insert(0, edgeID)
+                    currentPoints.insert(0, inP0)
+                    break
+                elif inP0 == tailPoint:                             # case 3: incoming p0 matches tail of existing list
+                    currentEdgeIndices.append(edgeID)
+                    currentPoints.append(inP1)
+                    break
+                elif inP1 == tailPoint:                             # case 4: incoming p1 matches tail of existing list
+                    currentEdgeIndices.append(edgeID)
+                    currentPoints.append(inP0)
+                    break
+                else:
+                    if inP0 in currentPoints or inP1 in currentPoints:      # case 5: either p1 or p0 is somewhere in the middle of existing list
+                        segregatedList.append([[edgeID], [inP0, inP1]])     # create a new point list entry (as a T-section of the shared point)
+                        break
+            else:
+                segregatedList.append([[edgeID], [inP0, inP1]])     # case 6: edge's points are not connected anywhere
+
+    # connecting point lists with shared endpoints
+    outList = segregatedList[:]
+    outIndex = 0
+    listLength = len(outList)
+
+    while outIndex + 1 < listLength:
+        isMerged = False
+        compIndex = outIndex + 1
+
+        outPoints = outList[outIndex][1]
+        outEdgeIndices = outList[outIndex][0]
+        compPoints = outList[compIndex][1]
+        compEdgeIndices = outList[compIndex][0]
+
+        outHead = outList[outIndex][1][0]
+        outTail = outList[outIndex][1][-1]
+        compHead = outList[compIndex][1][0]
+        compTail = outList[compIndex][1][-1]
+
+        while compIndex < listLength:
+            if outHead == compHead and outTail == compTail:
+                if set(outPoints) == set(compPoints):
+                    break                                   # case 0: duplicate set of points, skip entry
+                else:                                       # case 1: points connected in a loop (closing the loop)
+                    compPoints.reverse()
+                    compEdgeIndices.reverse()
+                    outPoints[:0] = compPoints[:-1]
+                    outEdgeIndices[:0] = compEdgeIndices
+                    isMerged = True
+                break
+
+            if outHead == compHead:                         # case 2: current head connected to opposing head
+                compPoints.reverse()
+                compEdgeIndices.reverse()
+                outPoints[:0] = compPoints[:-1]
+                outEdgeIndices[:0] = compEdgeIndices[:]
+                isMerged = True
+                break
+            elif outHead == compTail:                       # case 3: current head connected to opposing tail
+                outPoints[:0] = compPoints[:-1]
+                outEdgeIndices[:0] = compEdgeIndices[:]
+                isMerged = True
+                break
+            elif outTail == compHead:                       # case 4: current tail connected to opposing head
+                profiling.debug(lambda: compPoints[1:])
+                outPoints.extend(compPoints[1:])
+                outEdgeIndices.extend(compEdgeIndices[:])
+                isMerged = True
+                break
+            elif outTail == compTail:                       # case 5: current tail connected to opposing tail
+                compPoints.reverse()
+                compEdgeIndices.reverse()
+                outPoints.extend(compPoints[1:])
+                outEdgeIndices.extend(compEdgeIndices[:])
+                isMerged = True
+                break
+            else:
+                compIndex += 1
+
+        if isMerged == True:
+            profiling.count("merges")
+            outList.pop(compIndex)
+            listLength = len(outList)
+            outIndex = 0
+        else:
+            outIndex += 1
+
+    return outList
+
+# (n, 3) float64 point array for each chain's point indices
+def getChainPoints(points, segregatedList):
+    points = np.asarray(points, dtype=np.float64)
+    return [points[chain[1]] for chain in segregatedList]
+
+# normalize rows of an (n, 3) array, leaving zero-length rows untouched (same as MVector.normal())
+def normalizeRows(vectors):
+    lengths = np.sqrt(np.einsum("ij,ij->i", vectors, vectors))
+    lengths[lengths == 0.0] = 1.0
+    return vectors / lengths[:, None]
+
+FRAME_MODES = ("average", "rmf", "normal")
+
+# section frames of one chain as an (n, 4, 4) array of row-major matrices (rows: i, j, k, o), one per chain point
+# (single-chain form of getChainFrames(), see there for the frame modes)
+# closed: chainPoints is a loop (last point repeats the first)
+def getSectionMatrices(chainPoints, upVectors=None, closed=False, frameMode="average"):
+    chainPoints = np.asarray(chainPoints, dtype=np.float64)
+    return getChainFrames(chainPoints, np.array([0, len(chainPoints)]), frameMode, upVectors, [closed])
+
+# section frames of every chain at once: (P, 4, 4) row-major matrices (rows: i, j, k, o), one per point of the concatenated chains
+# points: (P, 3) chain points, chain after chain; chainOffsets: (C + 1,) first point of each chain; closed: (C,) loop flags (None: none)
+# frameMode:
+# -"average" : the original pointNoodler frames: i follows the chain, k = i ^ up, j = k ^ i (up: upVectors or world up),
+#              each section averaged with the previous one and the final (cap) section built from the last direction and world up
+#              (where i runs parallel to up, k comes from the nearest other section of the chain, see carryFallbackFrames())
+# -"rmf"     : rotation-minimizing frames (double reflection), starting from up (upVectors[0] or world up) at the first point;
+#              closed loops spread the remaining twist evenly along the loop so the seam matches
+# -"normal"  : j follows the upVectors (vertex normals) projected off the tangent, falling back to "rmf" where they run along the chain
+# closed loops: the first section is averaged with the last one and the final section repeats it
+def getChainFrames(points, chainOffsets, frameMode="average", upVectors=None, closed=None):
+    if frameMode not in FRAME_MODES:
+        raise Exception ("Unknown frame mode: %s (expected one of %s)" % (frameMode, ", ".join(FRAME_MODES)))
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+    if upVectors is not None:
+        upVectors = np.asarray(upVectors, dtype=np.float64).reshape(-1, 3)
+    elif frameMode == "normal":
+        raise Exception ("Normal-guided frames need upVectors (vertex normals)!")
+    layout = ChainLayout(chainOffsets, closed)
+
+    matrices = np.zeros((len(points), 4, 4))
+    if frameMode == "average":
+        matrices[:, :3, :3] = getAverageFrames(points, layout, upVectors)
+    else:
+        tangents = getChainTangents(points, layout)
+        j = getRotationMinimizingNormals(points, tangents, layout, upVectors)
+        if frameMode == "normal":
+            guided = upVectors - np.einsum("ij,ij->i", upVectors, tangents)[:, None] * tangents
+            usable = np.einsum("ij,ij->i", guided, guided) > 1e-12
+            j[usable] = normalizeRows(guided[usable])
+        matrices[:, 0, :3] = tangents
+        matrices[:, 1, :3] = j
+        matrices[:, 2, :3] = np.cross(tangents, j)
+    matrices[:, 3, :3] = points
+    matrices[:, 3, 3] = 1.0
+    return matrices
+
+# row bookkeeping shared by the batched frame functions
+class ChainLayout(object):
+    def __init__(self, chainOffsets, closed=None):
+        chainOffsets = np.asarray(chainOffsets, dtype=np.int64)
+        lengths = np.diff(chainOffsets)
+        numPoints = chainOffsets[-1]
+        self.chainIds = np.repeat(np.arange(len(lengths)), lengths)            # chain of every row
+        self.starts = chainOffsets[:-1]
+        self.ends = chainOffsets[1:] - 1                                        # last row of every chain (cap / seam)
+        self.rowStarts = self.starts[self.chainIds]
+        self.rowEnds = self.ends[self.chainIds]
+        self.maxLength = int(lengths.max()) if len(lengths) else 0
+        self.closed = np.zeros(len(lengths), dtype=bool) if closed is None else np.asarray(closed, dtype=bool)
+        self.closed &= lengths > 3
+        rows = np.arange(numPoints)
+        self.isFirst = rows == self.rowStarts
+        self.isLast = rows == self.rowEnds
+        self.rowClosed = self.closed[self.chainIds]
+
+# unit direction from every point to the next one of its chain (rows of last points are zero)
+def getChainDirections(points, layout):
+    directions = np.zeros_like(points)
+    inner = np.flatnonzero(~layout.isLast)
+    directions[inner] = normalizeRows(points[inner + 1] - points[inner])
+    return directions
+
+# tangent at every point: its direction averaged with the previous one (first: own direction, last: last direction; both averaged across the seam of closed loops)
+def getChainTangents(points, layout):
+    directions = getChainDirections(points, layout)
+    previous = np.zeros_like(directions)
+    previous[1:] = directions[:-1]
+    tangents = normalizeRows(directions + previous)
+    tangents[layout.isFirst] = directions[layout.isFirst]
+    lastRows = np.flatnonzero(layout.isLast & (layout.rowEnds > layout.rowStarts))
+    tangents[lastRows] = directions[lastRows - 1]
+    closedStarts = layout.starts[layout.closed]
+    closedEnds = layout.ends[layout.closed]
+    tangents[closedStarts] = normalizeRows(directions[closedStarts] + directions[closedEnds - 1])
+    tangents[closedEnds] = tangents[closedStarts]
+    return tangents
+
+# world axis least aligned with every row of vectors (fallback up vector)
+def getFallbackUp(vectors):
+    axes = np.eye(3)
+    return axes[np.argmin(np.abs(vectors), axis=1)]
+
+# k = i ^ up and j = k ^ i for every row, with the fallback up where i runs parallel to up; also returns the (n,) bool fallback rows
+def getCrossFrames(i, up):
+    up = np.broadcast_to(up, i.shape)
+    k = np.cross(i, up)
+    degenerate = (np.einsum("ij,ij->i", k, k) < 1e-20) & (np.einsum("ij,ij->i", i, i) > 0.0)
+    if degenerate.any():
+        k[degenerate] = np.cross(i[degenerate], getFallbackUp(i[degenerate]))
+    return k, np.cross(k, i), degenerate
+
+# fallback frames take k from referenceK (projected off i, where that leaves a usable k) instead of the world axis: the world axis
+# ignores where the chain comes from, so a chain turning into up would otherwise twist half a turn or average to a flat section
+def carryFallbackFrames(i, k, j, fallback, referenceK):
+    rows = np.flatnonzero(fallback)
+    carried = referenceK[rows] - np.einsum("ij,ij->i", referenceK[rows], i[rows])[:, None] * i[rows]
+    usable = np.einsum("ij,ij->i", carried, carried) > 1e-20
+    rows = rows[usable]
+    k[rows] = normalizeRows(carried[usable])
+    j[rows] = np.cross(k[rows], i[rows])
+
+# rows of the nearest regular (not fallback, not zero-length) section of every row's chain: the one before, else the one after
+# (-1 for chains without any)
+def getReferenceRows(k, fallback, layout):
+    rows = np.arange(len(k))
+    regular = ~fallback & (np.einsum("ij,ij->i", k, k) > 0.0)
+    before = np.maximum.accumulate(np.where(regular, rows, -1)) if len(rows) else rows
+    after = np.minimum.accumulate(np.where(regular, rows, len(rows))[::-1])[::-1] if len(rows) else rows
+    reference = np.where(before >= layout.rowStarts, before, after)
+    return np.where(reference <= layout.rowEnds, reference, -1)
+
+# frames of rows averaged with the frames of previousRows, axis by axis; where the two point apart (a chain reversing, or turning
+# through up and back) an axis sum vanishes and the row keeps its own frame
+def averageFrames(frames, rows, previousRows):
+    sums = frames[rows] + frames[previousRows]
+    averaged = np.stack([normalizeRows(sums[:, axis]) for axis in range(3)], axis=1) if len(rows) else sums
+    folded = (np.einsum("nij,nij->ni", sums, sums) < 1e-20).any(axis=1)
+    averaged[folded] = frames[rows[folded]]
+    return averaged
+
+# True if any section of the chain runs parallel to world up: its "average" frame takes k from the nearest regular section of the
+# chain (see carryFallbackFrames()), so it depends on more than the neighbouring points
+def hasFallbackFrames(chainPoints):
+    i = normalizeRows(np.diff(np.asarray(chainPoints, dtype=np.float64).reshape(-1, 3), axis=0))
+    return bool(getCrossFrames(i, WORLD_UP)[2].any())
+
+# (P, 3, 3) rows i, j, k of the "average" frames of getChainFrames()
+def getAverageFrames(points, layout, upVectors=None):
+    i = getChainDirections(points, layout)
+    k, j, fallback = getCrossFrames(i, WORLD_UP if upVectors is None else upVectors)
+    if fallback.any():
+        reference = getReferenceRows(k, fallback, layout)
+        carryFallbackFrames(i, k, j, fallback & (reference >= 0), k[reference])
+    frames = np.stack([i, j, k], axis=1)
+
+    # each section averaged with the previous one (rows 1.. of every chain up to the last direction)
+    averaged = frames.copy()
+    inner = np.flatnonzero(~layout.isFirst & ~layout.isLast)
+    averaged[inner] = averageFrames(frames, inner, inner - 1)
+
+    # cap: last direction with world up (a fallback cap frame follows the section before it)
+    lastRows = np.flatnonzero(layout.isLast & (layout.rowEnds > layout.rowStarts))
+    capI = i[lastRows - 1]
+    capK, capJ, capFallback = getCrossFrames(capI, WORLD_UP)
+    carryFallbackFrames(capI, capK, capJ, capFallback, averaged[lastRows - 1, 2])
+    averaged[lastRows] = np.stack([capI, capJ, capK], axis=1)
+
+    # closed loops: first section averaged with the last direction, cap repeats the first section
+    closedStarts = layout.starts[layout.closed]
+    closedEnds = layout.ends[layout.closed]
+    averaged[closedStarts] = averageFrames(frames, closedStarts, closedEnds - 1)
+    averaged[closedEnds] = averaged[closedStarts]
+    return averaged
+
+# j of the rotation-minimizing frames: the first point's up (projected off its tangent) carried along each chain by double reflection
+# (Wang et al. 2008); the per-step rotations are chained with a segmented prefix product, log2(longest chain) batched matmuls
+def getRotationMinimizingNormals(points, tangents, layout, upVectors=None):
+    numPoints = len(points)
+    steps = np.tile(np.eye(3), (numPoints, 1, 1))
+    inner = np.flatnonzero(~layout.isFirst)
+    if len(inner):
+        v1 = points[inner] - points[inner - 1]
+        reflect1 = getReflections(v1)
+        reflectedTangents = np.einsum("nij,nj->ni", reflect1, tangents[inner - 1])
+        reflect2 = getReflections(tangents[inner] - reflectedTangents)
+        steps[inner] = np.matmul(reflect2, reflect1)
+
+    # products[p] = steps[p] . steps[p - 1] ... steps[first row + 1] (Hillis-Steele scan, restarting at every chain)
+    products = steps
+    rows = np.arange(numPoints)
+    distance = 1
+    while distance < layout.maxLength:
+        apply = np.flatnonzero(rows - distance >= layout.rowStarts)
+        products[apply] = np.matmul(products[apply], products[apply - distance])
+        distance *= 2
+
+    # initial normal: up projected off the first tangent (fallback axis where they are parallel)
+    firstTangents = tangents[layout.starts]
+    up = np.tile(WORLD_UP, (len(layout.starts), 1)) if upVectors is None else upVectors[layout.starts].copy()
+    initial = up - np.einsum("ij,ij->i", up, firstTangents)[:, None] * firstTangents
+    degenerate = np.einsum("ij,ij->i", initial, initial) < 1e-12
+    if degenerate.any():
+        fallback = getFallbackUp(firstTangents[degenerate])
+        initial[degenerate] = fallback - np.einsum("ij,ij->i", fallback, firstTangents[degenerate])[:, None] * firstTangents[degenerate]
+    initial = normalizeRows(initial)
+
+    normals = np.einsum("nij,nj->ni", products, initial[layout.chainIds])
+    normals = normalizeRows(normals - np.einsum("ij,ij->i", normals, tangents)[:, None] * tangents)
+
+    # closed loops: rotate by a share of the seam mismatch proportional to the arc length, so the last frame lands on the first
+    if layout.closed.any():
+        closedRows = np.flatnonzero(layout.rowClosed)
+        stepLengths = np.zeros(numPoints)
+        stepLengths[inner] = np.sqrt(np.einsum("ij,ij->i", v1, v1))
+        arcLengths = np.cumsum(stepLengths)
+        arcLengths -= arcLengths[layout.rowStarts]
+        starts = layout.starts[layout.closed]
+        ends = layout.ends[layout.closed]
+        seamTangents = tangents[starts]
+        mismatch = np.arctan2(np.einsum("ij,ij->i", np.cross(normals[ends], normals[starts]), seamTangents), np.einsum("ij,ij->i", normals[ends], normals[starts]))
+        chainMismatch = np.zeros(len(layout.starts))
+        chainMismatch[layout.closed] = mismatch
+        chainLengths = np.ones(len(layout.starts))
+        chainLengths[layout.closed] = np.maximum(arcLengths[ends], 1e-300)
+        angles = chainMismatch[layout.chainIds[closedRows]] * arcLengths[closedRows] / chainLengths[layout.chainIds[closedRows]]
+        binormals = np.cross(tangents[closedRows], normals[closedRows])
+        normals[closedRows] = np.cos(angles)[:, None] * normals[closedRows] + np.sin(angles)[:, None] * binormals
+        normals[ends] = normals[starts]
+    return normals
+
+# (n, 3, 3) Householder reflections across the planes normal to the rows of v (identity for zero rows)
+def getReflections(v):
+    lengthSquared = np.einsum("ij,ij->i", v, v)
+    scale = np.where(lengthSquared > 1e-30, 2.0 / np.where(lengthSquared > 1e-30, lengthSquared, 1.0), 0.0)
+    return np.eye(3)[None, :, :] - scale[:, None, None] * v[:, :, None] * v[:, None, :]
+
+# place local tube points (x along the noodle, dropped) on their section frames: y * j + z * k + o
+# same result as flattening p.x and multiplying by each section's MMatrix, for all vertices at once
+def transformSections(localPoints, sectionIds, sectionMatrices):
+    localPoints = np.asarray(localPoints, dtype=np.float64)
+    frames = sectionMatrices[sectionIds]
+    return (localPoints[:, 1:2] * frames[:, 1, :3] + localPoints[:, 2:3] * frames[:, 2, :3]) + frames[:, 3, :3]
+
+# True if a chain's points (or source point indices) form a closed loop: the last point repeats the first (see buildEdgeChains())
+# and at least 3 points lie in between, the fewest a loop of mesh edges can have.  Every module tests closedness through this
+def isClosedChain(chainPoints):
+    return len(chainPoints) > 3 and np.array_equal(chainPoints[0], chainPoints[-1])
+
+# (startCap, endCap) from caps (True / False for both ends, or a (start, end) pair); closed loops never get caps
+def getCapFlags(caps, closed=False):
+    if closed:
+        return False, False
+    if isinstance(caps, (tuple, list)):
+        return bool(caps[0]), bool(caps[1])
+    return bool(caps), bool(caps)
+
+# generated tube layout for numSections sections: rings of `sides` points in order along the chain, one per chain point
+# (closed loops skip the last point, which repeats the first), followed by the start and end cap centers of the caps asked for
+def getTubeRingCount(numSections, closed=False):
+    return numSections if closed else numSections + 1
+
+# section index of every tube vertex
+def getTubeSectionIds(numSections, sides, caps=True, closed=False):
+    startCap, endCap = getCapFlags(caps, closed)
+    ringIds = np.repeat(np.arange(getTubeRingCount(numSections, closed)), sides)
+    capIds = [0] * startCap + [numSections] * endCap
+    return np.concatenate([ringIds, np.array(capIds, dtype=np.int64)])
+
+# local tube points (x along the noodle, always 0) placed on the section frames by transformSections()
+def getTubeLocalPoints(numSections, sides, radius, caps=True, closed=False):
+    startCap, endCap = getCapFlags(caps, closed)
+    numRings = getTubeRingCount(numSections, closed)
+    angles = 2.0 * np.pi * np.arange(sides) / sides
+    localPoints = np.zeros((numRings * sides + startCap + endCap, 3))
+    localPoints[:numRings * sides, 1] = np.tile(radius * np.cos(angles), numRings)
+    localPoints[:numRings * sides, 2] = np.tile(radius * np.sin(angles), numRings)
+    return localPoints
+
+# polyCounts and polyConnects of the tube from getTubeLocalPoints(): side quads section by section, then the start and end cap triangle fans
+# (closed loops wrap their last section back onto the first ring, so the tube has no seam)
+def getTubeTopology(numSections, sides, caps=True, closed=False):
+    startCap, endCap = getCapFlags(caps, closed)
+    numRings = getTubeRingCount(numSections, closed)
+    ring = np.arange(sides)
+    nxt = (ring + 1) % sides
+    base = (np.arange(numSections) * sides)[:, None]
+    nextBase = ((np.arange(numSections) + 1) % numRings * sides)[:, None]
+    quads = np.stack([base + ring, base + nxt, nextBase + nxt, nextBase + ring], axis=-1).reshape(-1, 4)
+
+    center = numRings * sides
+    fans = []
+    if startCap:
+        fans.append(np.stack([nxt, ring, np.full(sides, center)], axis=-1))
+        center += 1
+    if endCap:
+        end = numSections * sides
+        fans.append(np.stack([end + ring, end + nxt, np.full(sides, center)], axis=-1))
+
+    polyCounts = np.concatenate([np.full(len(quads), 4)] + [np.full(sides, 3)] * len(fans))
+    polyConnects = np.concatenate([quads.ravel()] + [fan.ravel() for fan in fans])
+    return polyCounts, polyConnects
+
+# UVs of the tube from getTubeTopology(): (U, 2) uvs and one UV index per polyConnects entry
+# sides are unrolled into u 0 - 1 along the chain and v 0.25 - 0.75 around it (with a seam column, and a seam row on closed loops),
+# the caps are discs centered at (0.125, 0.125) and (0.375, 0.125)
+def getTubeUVs(numSections, sides, caps=True, closed=False):
+    startCap, endCap = getCapFlags(caps, closed)
+    row = np.arange(numSections + 1)
+    column = np.arange(sides + 1)
+    sideUVs = np.stack([np.repeat(row / float(numSections), sides + 1), np.tile(0.25 + 0.5 * column / float(sides), numSections + 1)], axis=-1)
+
+    ring = np.arange(sides)
+    base = (np.arange(numSections) * (sides + 1))[:, None]
+    quadIds = np.stack([base + ring, base + ring + 1, base + sides + 2 + ring, base + sides + 1 + ring], axis=-1).reshape(-1, 4)
+
+    angles = 2.0 * np.pi * ring / sides
+    rim = 0.1 * np.stack([np.cos(angles), np.sin(angles)], axis=-1)
+    nxt = (ring + 1) % sides
+    uvBlocks = [sideUVs]
+    idBlocks = [quadIds.ravel()]
+    capBase = len(sideUVs)
+    if startCap:                                    # same winding as the cap fans in getTubeTopology()
+        uvBlocks.append(np.concatenate([rim + (0.125, 0.125), [(0.125, 0.125)]]))
+        idBlocks.append(np.stack([capBase + nxt, capBase + ring, np.full(sides, capBase + sides)], axis=-1).ravel())
+        capBase += sides + 1
+    if endCap:
+        uvBlocks.append(np.concatenate([rim + (0.375, 0.125), [(0.375, 0.125)]]))
+        idBlocks.append(np.stack([capBase + ring, capBase + nxt, np.full(sides, capBase + sides)], axis=-1).ravel())
+    return np.concatenate(uvBlocks), np.concatenate(idBlocks)
+
+# one tube mesh along a chain: points (V, 3), polyCounts, polyConnects, uvs (U, 2), uvIds (one per polyConnects entry)
+# closed: None detects loops from the chain points (isClosedChain()); frameMode: see getChainFrames()
+def buildTube(chainPoints, radius, sides=20, upVectors=None, caps=True, closed=None, frameMode="average"):
+    chainPoints = np.asarray(chainPoints, dtype=np.float64)
+    if closed is None:
+        closed = isClosedChain(chainPoints)
+    numSections = len(chainPoints) - 1
+    localPoints, sectionIds, polyCounts, polyConnects, uvs, uvIds = getTubeLayout(numSections, sides, radius, caps, closed)
+    points = transformSections(localPoints, sectionIds, getSectionMatrices(chainPoints, upVectors, closed, frameMode))
+    return points, polyCounts, polyConnects, uvs, uvIds
+
+# local points, section IDs, topology and UVs of one tube (everything that does not depend on the chain's positions)
+def getTubeLayout(numSections, sides, radius, caps=True, closed=False):
+    polyCounts, polyConnects = getTubeTopology(numSections, sides, caps, closed)
+    uvs, uvIds = getTubeUVs(numSections, sides, caps, closed)
+    return (getTubeLocalPoints(numSections, sides, radius, caps, closed), getTubeSectionIds(numSections, sides, caps, closed),
+            polyCounts, polyConnects, uvs, uvIds)
+
+# every chain of a mesh as one combined tube mesh (see buildTube(), closed loops are detected per chain): points (V, 3), polyCounts,
+# polyConnects, faceOffsets (C + 1,) so that chain c owns faces faceOffsets[c]:faceOffsets[c + 1], uvs (U, 2) and uvIds
+# the frames of all chains are computed in one getChainFrames() pass and all vertices placed in one transformSections() call;
+# tube layouts are shared by chains of the same length; no chains give empty arrays (faceOffsets [0])
+def buildNoodleBatch(chainPointsList, radius, sides=20, upVectorsList=None, caps=True, frameMode="average"):
+    chainPointsList = [np.asarray(chainPoints, dtype=np.float64) for chainPoints in chainPointsList]
+    if not chainPointsList:
+        noIndices = np.zeros(0, dtype=np.int64)
+        return np.zeros((0, 3)), noIndices, noIndices.copy(), np.zeros(1, dtype=np.int64), np.zeros((0, 2)), noIndices.copy()
+    chainOffsets = np.zeros(len(chainPointsList) + 1, dtype=np.int64)
+    chainOffsets[1:] = np.cumsum([len(chainPoints) for chainPoints in chainPointsList])
+    closedList = [isClosedChain(chainPoints) for chainPoints in chainPointsList]
+    allUpVectors = np.concatenate(upVectorsList) if upVectorsList is not None and len(upVectorsList) else None
+    frames = getChainFrames(np.concatenate(chainPointsList) if chainPointsList else np.zeros((0, 3)), chainOffsets, frameMode, allUpVectors, closedList)
+
+    layoutCache = {}
+    localBlocks = []
+    sectionBlocks = []
+    countBlocks = []
+    connectBlocks = []
+    uvBlocks = []
+    uvIdBlocks = []
+    faceOffsets = [0]
+    vertexOffset = 0
+    uvOffset = 0
+
+    for index, chainPoints in enumerate(chainPointsList):
+        key = (len(chainPoints) - 1, closedList[index])
+        if key not in layoutCache:
+            layoutCache[key] = getTubeLayout(key[0], sides, radius, caps, key[1])
+        localPoints, sectionIds, polyCounts, polyConnects, uvs, uvIds = layoutCache[key]
+        localBlocks.append(localPoints)
+        sectionBlocks.append(sectionIds + chainOffsets[index])
+        countBlocks.append(polyCounts)
+        connectBlocks.append(polyConnects + vertexOffset)
+        uvBlocks.append(uvs)
+        uvIdBlocks.append(uvIds + uvOffset)
+        faceOffsets.append(faceOffsets[-1] + len(polyCounts))
+        vertexOffset += len(localPoints)
+        uvOffset += len(uvs)
+
+    points = transformSections(np.concatenate(localBlocks), np.concatenate(sectionBlocks), frames)
+    return (points, np.concatenate(countBlocks), np.concatenate(connectBlocks), np.array(faceOffsets),
+            np.concatenate(uvBlocks), np.concatenate(uvIdBlocks))
@@ -0,0 +1,30 @@
+"""
+-- pointNoodler file helpers --
+Atomic file writes for everything pointNoodler stores on disk (chainCache.py entries, cli.py headers).
+
+writeAtomic() writes to <path>.tmp and then moves that file over path, so a reader (another Maya session sharing a cache
+directory, a farm job polling for finished meshes) sees either the old file or the complete new one, never a partial write,
+and a write that fails half-way leaves the old file untouched.
+
+    fileUtils.writeAtomic(path, lambda f: json.dump(header, f))
+    fileUtils.writeAtomic(path, lambda f: np.savez(f, **arrays), binary=True)
+"""
+import os
+
+
+# call write(f) on a temporary file next to path, then replace path with it (binary: open the file in "wb" mode)
+def writeAtomic(path, write, binary=False):
+    tempPath = path + ".tmp"
+    try:
+        with open(tempPath, "wb" if binary else "w") as f:
+            write(f)
+        if hasattr(os, "replace"):
+            os.replace(tempPath, path)
+        else:                       # Python 2: os.rename() won't overwrite on Windows
+            if os.path.exists(path):
+                os.remove(path)
+            os.rename(tempPath, path)
+    except BaseException:
+        if os.path.exists(tempPath):
+            os.remove(tempPath)
+        raise
@@ -0,0 +1,150 @@
+"""
+-- pointNoodler live evaluation --
+Cached, incremental version of core.buildNoodleBatch() used by the pointNoodlerNode (noodleNode.py).
+
+Chaining, tube topology and the local tube points only depend on the stored edge IDs, their vertex pairs in the source mesh,
+radius and sides, so they are built once and reused (see getTopologyKey()).  Between evaluations only the sections whose
+source points moved are re-framed and re-placed.
+"""
+import numpy as np
+
+from pointNoodler import core
+
+FRAME_MODES = ("average", "rmf")
+
+
+class LiveNoodle(object):
+    # frameMode: "average" or "rmf" (see core.getChainFrames()); "rmf" frames depend on the whole chain, so a chain is re-framed completely when any of its points moves
+    def __init__(self, frameMode="average"):
+        if frameMode not in FRAME_MODES:
+            raise Exception ("Live noodles support the 'average' and 'rmf' frame modes only!")
+        self.frameMode = frameMode
+        self.topologyKey = None
+        self.radius = None
+        self.sides = None
+
+        self.sourceIndices = None       # (S,) unique source mesh point indices used by the chains, in order of first use
+        self.chains = []                # per chain: indices into sourceIndices / sourcePoints
+        self.closed = []                # per chain: True for closed loops (seamless tube, every section re-framed when any point moves)
+        self.chainPoints = []           # per chain: (n, 3) source points of the last evaluation (None before the first)
+        self.matrices = []              # per chain: (n, 4, 4) section frames of the last evaluation
+        self.localPoints = []           # per chain: local tube points (shared by chains of the same length)
+        self.sectionIds = []            # per chain: section index of each tube vertex
+        self.vertexOffsets = None       # (C + 1,) first output vertex of each chain
+
+        self.points = None              # (V, 3) output tube points
+        self.polyCounts = None
+        self.polyConnects = None
+        self.faceOffsets = None         # (C + 1,) first output face of each chain
+        self.uvs = None                 # (U, 2) tube UVs
+        self.uvIds = None               # UV index of every polyConnects entry
+
+    # True if stored chains / topology can't be reused for this evaluation
+    def needsRebuild(self, topologyKey, radius, sides):
+        return topologyKey != self.topologyKey or radius != self.radius or sides != self.sides
+
+    # chain the stored edges and build the tube topology; resets the cached points so the next update() computes everything
+    def setTopology(self, topologyKey, edgeIDs, edgeVertices, radius, sides):
+        segregatedList = core.buildEdgeChains(edgeIDs, edgeVertices)
+
+        sourceLookup = {}
+        self.chains = []
+        self.closed = [core.isClosedChain(chain[1]) for chain in segregatedList]
+        for chain in segregatedList:
+            self.chains.append(np.array([sourceLookup.setdefault(pointIndex, len(sourceLookup)) for pointIndex in chain[1]], dtype=np.int64))
+        self.sourceIndices = np.empty(len(sourceLookup), dtype=np.int64)
+        for pointIndex, sourceIndex in sourceLookup.items():
+            self.sourceIndices[sourceIndex] = pointIndex
+
+        localCache = {}
+        countBlocks = []
+        connectBlocks = []
+        uvBlocks = []
+        uvIdBlocks = []
+        vertexOffsets = [0]
+        faceOffsets = [0]
+        uvOffset = 0
+        self.localPoints = []
+        self.sectionIds = []
+
+        for chain, closed in zip(self.chains, self.closed):
+            numSections = len(chain) - 1
+            if (numSections, closed) not in localCache:
+                localCache[numSections, closed] = (core.getTubeLocalPoints(numSections, sides, radius, True, closed),
+                                                   core.getTubeSectionIds(numSections, sides, True, closed),
+                                                   core.getTubeTopology(numSections, sides, True, closed),
+                                                   core.getTubeUVs(numSections, sides, True, closed))
+            localPoints, sectionIds, (polyCounts, polyConnects), (uvs, uvIds) = localCache[numSections, closed]
+            self.localPoints.append(localPoints)
+            self.sectionIds.append(sectionIds)
+            countBlocks.append(polyCounts)
+            connectBlocks.append(polyConnects + vertexOffsets[-1])
+            uvBlocks.append(uvs)
+            uvIdBlocks.append(uvIds + uvOffset)
+            vertexOffsets.append(vertexOffsets[-1] + len(localPoints))
+            faceOffsets.append(faceOffsets[-1] + len(polyCounts))
+            uvOffset += len(uvs)
+
+        self.polyCounts = np.concatenate(countBlocks) if countBlocks else np.zeros(0, dtype=np.int64)
+        self.polyConnects = np.concatenate(connectBlocks) if connectBlocks else np.zeros(0, dtype=np.int64)
+        self.uvs = np.concatenate(uvBlocks) if uvBlocks else np.zeros((0, 2))
+        self.uvIds = np.concatenate(uvIdBlocks) if uvIdBlocks else np.zeros(0, dtype=np.int64)
+        self.vertexOffsets = np.array(vertexOffsets)
+        self.faceOffsets = np.array(faceOffsets)
+        self.points = np.zeros((vertexOffsets[-1], 3))
+        self.chainPoints = [None] * len(self.chains)
+        self.matrices = [None] * len(self.chains)
+
+        self.topologyKey = topologyKey
+        self.radius = radius
+        self.sides = sides
+
+    # re-place the tube for new source positions (rows follow sourceIndices)
+    # returns the output vertex indices that changed (every vertex on the first evaluation after setTopology())
+    def update(self, sourcePoints):
+        sourcePoints = np.asarray(sourcePoints, dtype=np.float64)
+        changed = []
+
+        for index, chain in enumerate(self.chains):
+            newPoints = sourcePoints[chain]
+            oldPoints = self.chainPoints[index]
+            numSections = len(chain) - 1
+
+            # sections parallel to world up take their frame from farther along the chain (see core.carryFallbackFrames())
+            wholeChain = (self.closed[index] or self.frameMode != "average" or core.hasFallbackFrames(newPoints)
+                          or (oldPoints is not None and core.hasFallbackFrames(oldPoints)))
+            if oldPoints is None or (wholeChain and np.any(newPoints != oldPoints)):
+                self.matrices[index] = core.getSectionMatrices(newPoints, None, self.closed[index], self.frameMode)
+                first, last = 0, numSections
+            else:
+                moved = np.flatnonzero(np.any(newPoints != oldPoints, axis=1))
+                if len(moved) == 0:
+                    continue
+                # point p feeds sections p - 1 (direction ends at p), p (origin) and p + 1 (averaged with the previous direction)
+                first = max(moved[0] - 1, 0)
+                last = min(moved[-1] + 1, numSections)
+                self.matrices[index][first:last + 1] = getSectionWindow(newPoints, first, last)
+
+            self.chainPoints[index] = newPoints
+            sectionIds = self.sectionIds[index]
+            vertices = np.flatnonzero((sectionIds >= first) & (sectionIds <= last))
+            self.points[self.vertexOffsets[index] + vertices] = core.transformSections(self.localPoints[index][vertices], sectionIds[vertices], self.matrices[index])
+            changed.append(self.vertexOffsets[index] + vertices)
+
+        return np.concatenate(changed) if changed else np.zeros(0, dtype=np.int64)
+
+
+# key of everything the chains depend on: the source mesh's face counts / face vertex lists (which fix its edge numbering, so
+# count-preserving edits such as an edge spin or reordered faces change the key too), the vertex count the source indices point
+# into and the stored edge IDs.  The face lists come from two bulk reads (see pointNoodler.getMeshTopology()) and are compared as
+# raw bytes; the stored edges' vertex pairs, one API call per edge, only need to be read again when the key changes
+def getTopologyKey(numVertices, polyCounts, polyConnects, edgeIDs):
+    return (numVertices,) + tuple(np.asarray(values, dtype=np.int64).tobytes() for values in (polyCounts, polyConnects, edgeIDs))
+
+# section frames first..last of a chain, computed from the smallest window of points that gives the same result as the full chain:
+# one point before (for the averaging with the previous direction) and one after (the window's own cap is discarded unless it is the real cap)
+def getSectionWindow(chainPoints, first, last):
+    numSections = len(chainPoints) - 1
+    start = max(first - 1, 0)
+    end = min(last + 2, numSections + 1)
+    return core.getSectionMatrices(chainPoints[start:end])[first - start:last - start + 1]
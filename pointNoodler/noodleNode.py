@@ -0,0 +1,136 @@
+"""
+-- pointNoodlerNode plugin --
+Live (node-based) pointNoodler: takes a source mesh plus stored edge IDs and outputs the combined noodle mesh.
+
+    cmds.loadPlugin(".../pointNoodler/noodleNode.py")     # or pointNoodler.createLiveNoodle(), which loads it when needed
+
+Chaining and tube topology are cached per node (live.LiveNoodle) and only rebuilt when the source topology, edge IDs, radius, sides or
+frameMode change.  Each evaluation reads the source's face lists and points in bulk; the stored edges are only looked up again after a
+topology change.  While scrubbing an animated / edited mesh only the sections whose source points moved are recomputed and written to the
+cached output arrays.
+"""
+import maya.OpenMaya as om
+import maya.OpenMayaMPx as ompx
+
+import pointNoodler
+from pointNoodler import live
+
+kPluginNodeName = "pointNoodlerNode"
+kPluginNodeId = om.MTypeId(0x0007F100)     # local development ID range (0x00000000 - 0x0007ffff)
+
+
+class PointNoodlerNode(ompx.MPxNode):
+    inMesh = om.MObject()
+    edgeIds = om.MObject()
+    radius = om.MObject()
+    sides = om.MObject()
+    frameMode = om.MObject()
+    outMesh = om.MObject()
+
+    def __init__(self):
+        ompx.MPxNode.__init__(self)
+        self.liveNoodle = live.LiveNoodle()
+        self.outPoints = om.MFloatPointArray()      # output arrays are kept between evaluations and patched in place
+        self.outCounts = om.MIntArray()
+        self.outConnects = om.MIntArray()
+        self.outU = om.MFloatArray()
+        self.outV = om.MFloatArray()
+        self.outUVIds = om.MIntArray()
+
+    def compute(self, plug, data):
+        if plug != PointNoodlerNode.outMesh:
+            return om.kUnknownParameter
+
+        sourceMesh = data.inputValue(PointNoodlerNode.inMesh).asMesh()
+        edgeArray = om.MFnIntArrayData(data.inputValue(PointNoodlerNode.edgeIds).data()).array()
+        radius = data.inputValue(PointNoodlerNode.radius).asDouble()
+        sides = data.inputValue(PointNoodlerNode.sides).asInt()
+        frameMode = live.FRAME_MODES[data.inputValue(PointNoodlerNode.frameMode).asShort()]
+        if frameMode != self.liveNoodle.frameMode:
+            self.liveNoodle = live.LiveNoodle(frameMode)       # every frame changes: start over
+
+        sourceFn = om.MFnMesh(sourceMesh)
+        edgeIDs = pointNoodler.intArrayToArray(edgeArray, edgeArray.length())
+        polyCounts, polyConnects = pointNoodler.getMeshTopology(sourceFn)
+        topologyKey = live.getTopologyKey(sourceFn.numVertices(), polyCounts, polyConnects, edgeIDs)
+
+        rebuilt = self.liveNoodle.needsRebuild(topologyKey, radius, sides)
+        if rebuilt:
+            edgeIDs, edgeVertices = pointNoodler.getEdgeVertexArrays(sourceFn, edgeArray, edgeArray.length())
+            self.liveNoodle.setTopology(topologyKey, edgeIDs, edgeVertices, radius, sides)
+            self.outCounts = pointNoodler.toIntArray(self.liveNoodle.polyCounts)
+            self.outConnects = pointNoodler.toIntArray(self.liveNoodle.polyConnects)
+            self.outU = pointNoodler.toFloatArray(self.liveNoodle.uvs[:, 0])
+            self.outV = pointNoodler.toFloatArray(self.liveNoodle.uvs[:, 1])
+            self.outUVIds = pointNoodler.toIntArray(self.liveNoodle.uvIds)
+
+        # only the chain points are read from the source mesh
+        sourcePoints = om.MPointArray()
+        sourceFn.getPoints(sourcePoints)
+        chainPoints = pointNoodler.pointArrayToArray(sourcePoints)[self.liveNoodle.sourceIndices]
+        changed = self.liveNoodle.update(chainPoints)
+
+        if rebuilt:
+            self.outPoints = pointNoodler.toFloatPointArray(self.liveNoodle.points)
+        else:
+            for index, (x, y, z) in zip(changed.tolist(), self.liveNoodle.points[changed].tolist()):
+                self.outPoints.set(index, x, y, z)
+
+        outData = om.MFnMeshData().create()
+        outFn = om.MFnMesh()
+        outFn.create(self.outPoints.length(), self.outCounts.length(), self.outPoints, self.outCounts, self.outConnects, self.outU, self.outV, outData)
+        outFn.assignUVs(self.outCounts, self.outUVIds)
+        data.outputValue(PointNoodlerNode.outMesh).setMObject(outData)
+        data.setClean(plug)
+
+
+def nodeCreator():
+    return ompx.asMPxPtr(PointNoodlerNode())
+
+def nodeInitializer():
+    typedAttr = om.MFnTypedAttribute()
+    numericAttr = om.MFnNumericAttribute()
+    enumAttr = om.MFnEnumAttribute()
+
+    PointNoodlerNode.inMesh = typedAttr.create("inMesh", "im", om.MFnData.kMesh)
+    typedAttr.setStorable(False)
+
+    PointNoodlerNode.edgeIds = typedAttr.create("edgeIds", "eid", om.MFnData.kIntArray, om.MFnIntArrayData().create())
+
+    PointNoodlerNode.radius = numericAttr.create("radius", "rad", om.MFnNumericData.kDouble, 0.1)
+    numericAttr.setMin(0.0)
+    numericAttr.setKeyable(True)
+
+    PointNoodlerNode.sides = numericAttr.create("sides", "sd", om.MFnNumericData.kInt, 20)
+    numericAttr.setMin(3)
+    numericAttr.setKeyable(True)
+
+    PointNoodlerNode.frameMode = enumAttr.create("frameMode", "fm", 0)
+    for index, frameMode in enumerate(live.FRAME_MODES):
+        enumAttr.addField(frameMode, index)
+
+    PointNoodlerNode.outMesh = typedAttr.create("outMesh", "om", om.MFnData.kMesh)
+    typedAttr.setWritable(False)
+    typedAttr.setStorable(False)
+
+    inputs = (PointNoodlerNode.inMesh, PointNoodlerNode.edgeIds, PointNoodlerNode.radius, PointNoodlerNode.sides, PointNoodlerNode.frameMode)
+    for attr in inputs + (PointNoodlerNode.outMesh,):
+        PointNoodlerNode.addAttribute(attr)
+    for attr in inputs:
+        PointNoodlerNode.attributeAffects(attr, PointNoodlerNode.outMesh)
+
+def initializePlugin(mobject):
+    plugin = ompx.MFnPlugin(mobject, "Sim Luigi", "1.0")
+    try:
+        plugin.registerNode(kPluginNodeName, kPluginNodeId, nodeCreator, nodeInitializer)
+    except:
+        print ("Failed to register node: " + kPluginNodeName)
+        raise
+
+def uninitializePlugin(mobject):
+    plugin = ompx.MFnPlugin(mobject)
+    try:
+        plugin.deregisterNode(kPluginNodeId)
+    except:
+        print ("Failed to deregister node: " + kPluginNodeName)
+        raise
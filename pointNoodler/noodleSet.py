@@ -0,0 +1,145 @@
+"""
+-- NoodleSet --
+Array-backed storage for any number of noodle chains across any number of meshes (replaces the old Noodle stub
+and the nested {parentName: [[MPoint, ...]]} lists).
+
+All chains share contiguous buffers; chain c owns rows chainOffsets[c]:chainOffsets[c + 1] of the point buffers
+and edgeOffsets[c]:edgeOffsets[c + 1] of edgeIDs.  Per-chain accessors return views, not copies.
+"""
+import numpy as np
+
+from pointNoodler import core
+
+
+class NoodleSet(object):
+    __slots__ = ("points", "upVectors", "pointIndices", "chainOffsets", "edgeIDs", "edgeOffsets", "chainParents", "parentNames")
+
+    def __init__(self, points, upVectors, pointIndices, chainOffsets, edgeIDs, edgeOffsets, chainParents, parentNames):
+        self.points = points                # (P, 3) float64 chain points, chain after chain
+        self.upVectors = upVectors          # (P, 3) float64 upVectors (vertex normals) or None
+        self.pointIndices = pointIndices    # (P,) int32 source mesh point index of each point
+        self.chainOffsets = chainOffsets    # (C + 1,) int64 first point of each chain
+        self.edgeIDs = edgeIDs              # (E,) int32 source mesh edge IDs, chain after chain
+        self.edgeOffsets = edgeOffsets      # (C + 1,) int64 first edge of each chain
+        self.chainParents = chainParents    # (C,) int32 index into parentNames
+        self.parentNames = parentNames      # list of parent (mesh) names
+
+    # single-mesh set from [[connected Edge/s], [connected Points]] chains and the matching (P, 3) point / upVector rows (chain after chain)
+    @classmethod
+    def fromSegregatedList(cls, parentName, segregatedList, points, upVectors=None):
+        return cls.fromChainArrays(parentName, *(getChainArrays(segregatedList) + (points, upVectors)))
+
+    # single-mesh set from flat chain arrays (see getChainArrays(), e.g. a chainCache.ChainEntry) and the matching point / upVector rows
+    @classmethod
+    def fromChainArrays(cls, parentName, pointIndices, chainOffsets, edgeIDs, edgeOffsets, points, upVectors=None):
+        points = np.ascontiguousarray(points, dtype=np.float64).reshape(-1, 3)
+        if upVectors is not None:
+            upVectors = np.ascontiguousarray(upVectors, dtype=np.float64).reshape(-1, 3)
+        return cls(points, upVectors, pointIndices, chainOffsets, edgeIDs, edgeOffsets, np.zeros(len(chainOffsets) - 1, dtype=np.int32), [parentName])
+
+    # one set holding the chains of all given sets, in order (sets of the same parent share its parent ID)
+    @classmethod
+    def concatenate(cls, noodleSets):
+        noodleSets = list(noodleSets)
+        if not noodleSets:
+            return cls.empty()
+        parentNames = []
+        chainParents = []
+        for noodleSet in noodleSets:
+            for parentName in noodleSet.parentNames:
+                if parentName not in parentNames:
+                    parentNames.append(parentName)
+            remap = np.array([parentNames.index(parentName) for parentName in noodleSet.parentNames], dtype=np.int32)
+            chainParents.append(remap[noodleSet.chainParents])
+
+        hasUpVectors = all(noodleSet.upVectors is not None for noodleSet in noodleSets)
+        return cls(np.concatenate([noodleSet.points for noodleSet in noodleSets]),
+                   np.concatenate([noodleSet.upVectors for noodleSet in noodleSets]) if hasUpVectors else None,
+                   np.concatenate([noodleSet.pointIndices for noodleSet in noodleSets]),
+                   joinOffsets([noodleSet.chainOffsets for noodleSet in noodleSets]),
+                   np.concatenate([noodleSet.edgeIDs for noodleSet in noodleSets]),
+                   joinOffsets([noodleSet.edgeOffsets for noodleSet in noodleSets]),
+                   np.concatenate(chainParents),
+                   parentNames)
+
+    @classmethod
+    def empty(cls):
+        return cls(np.zeros((0, 3)), None, np.zeros(0, dtype=np.int32), np.zeros(1, dtype=np.int64),
+                   np.zeros(0, dtype=np.int32), np.zeros(1, dtype=np.int64), np.zeros(0, dtype=np.int32), [])
+
+    def __len__(self):
+        return len(self.chainOffsets) - 1
+
+    def numChains(self):
+        return len(self.chainOffsets) - 1
+
+    def numPoints(self):
+        return len(self.points)
+
+    # per-chain views
+    def chainPoints(self, chain):
+        return self.points[self.chainOffsets[chain]:self.chainOffsets[chain + 1]]
+
+    def chainUpVectors(self, chain):
+        if self.upVectors is None:
+            return None
+        return self.upVectors[self.chainOffsets[chain]:self.chainOffsets[chain + 1]]
+
+    def chainPointIndices(self, chain):
+        return self.pointIndices[self.chainOffsets[chain]:self.chainOffsets[chain + 1]]
+
+    def chainEdgeIDs(self, chain):
+        return self.edgeIDs[self.edgeOffsets[chain]:self.edgeOffsets[chain + 1]]
+
+    def chainParent(self, chain):
+        return self.parentNames[self.chainParents[chain]]
+
+    # closed loops repeat their first point at the end (see core.isClosedChain())
+    def isClosed(self, chain):
+        return core.isClosedChain(self.chainPointIndices(chain))
+
+    # chain indices belonging to parentName, in order
+    def chainsOf(self, parentName):
+        if parentName not in self.parentNames:
+            return []
+        return np.flatnonzero(self.chainParents == self.parentNames.index(parentName)).tolist()
+
+    # source edge IDs of all chains of parentName, chain after chain
+    def edgeIDsOf(self, parentName):
+        chains = self.chainsOf(parentName)
+        if not chains:
+            return np.zeros(0, dtype=np.int32)
+        return np.concatenate([self.chainEdgeIDs(chain) for chain in chains])
+
+    # [[connected Edge/s], [connected Points]] entries of the given chains (all by default), same format as getSegregatedPointIndices()
+    def toSegregatedList(self, chains=None):
+        if chains is None:
+            chains = range(self.numChains())
+        return [[self.chainEdgeIDs(chain).tolist(), self.chainPointIndices(chain).tolist()] for chain in chains]
+
+    def nbytes(self):
+        arrays = (self.points, self.upVectors, self.pointIndices, self.chainOffsets, self.edgeIDs, self.edgeOffsets, self.chainParents)
+        return sum(array.nbytes for array in arrays if array is not None)
+
+    def __repr__(self):
+        return "NoodleSet(%d chains, %d points, %d meshes)" % (self.numChains(), self.numPoints(), len(self.parentNames))
+
+
+# (pointIndices, chainOffsets, edgeIDs, edgeOffsets) of [[connected Edge/s], [connected Points]] chains, laid out as in NoodleSet
+def getChainArrays(segregatedList):
+    chainOffsets = np.zeros(len(segregatedList) + 1, dtype=np.int64)
+    chainOffsets[1:] = np.cumsum([len(chain[1]) for chain in segregatedList])
+    edgeOffsets = np.zeros(len(segregatedList) + 1, dtype=np.int64)
+    edgeOffsets[1:] = np.cumsum([len(chain[0]) for chain in segregatedList])
+    pointIndices = np.array([pointIndex for chain in segregatedList for pointIndex in chain[1]], dtype=np.int32)
+    edgeIDs = np.array([edgeID for chain in segregatedList for edgeID in chain[0]], dtype=np.int32)
+    return pointIndices, chainOffsets, edgeIDs, edgeOffsets
+
+# concatenate (n + 1,) offset arrays of consecutive blocks into one
+def joinOffsets(offsetsList):
+    joined = [np.zeros(1, dtype=np.int64)]
+    base = 0
+    for offsets in offsetsList:
+        joined.append(offsets[1:] + base)
+        base += offsets[-1]
+    return np.concatenate(joined)
@@ -0,0 +1,117 @@
+"""
+-- pointNoodler pipeline --
+Runs chaining and tube generation for many meshes across a process pool.
+
+Maya access stays on the main thread (pointNoodler.pointNoodlerParallel() extracts the arrays and applies the results);
+the jobs handled here are plain arrays, so worker processes never touch Maya.
+Results come back in job order and don't depend on the number of workers.
+"""
+import multiprocessing
+import os
+import sys
+
+import numpy as np
+
+from pointNoodler import core
+
+
+# arrays of one mesh needed for chaining and tube generation, limited to the points the selected edges use
+class MeshJob(object):
+    __slots__ = ("name", "edgeIDs", "edgeVertices", "pointIndices", "points", "upVectors", "chains")
+
+    def __init__(self, name, edgeIDs, edgeVertices, pointIndices, points, upVectors=None, chains=None):
+        self.name = name                    # parent (mesh) name the result is applied to
+        self.edgeIDs = edgeIDs              # (E,) selected edge IDs
+        self.edgeVertices = edgeVertices    # (E, 2) indices into points (not mesh point indices), None if chains are given
+        self.pointIndices = pointIndices    # (P,) mesh point index of each row of points
+        self.points = points                # (P, 3)
+        self.upVectors = upVectors          # (P, 3) or None for world up
+        self.chains = chains                # [[edge IDs], [rows of points]] chains already known (chain cache hit), None: chain the edges
+
+    # job from full-mesh edge vertices: only the points used by the selected edges are kept
+    # getPoints / getUpVectors get the point indices as a list of ints (Maya arrays reject numpy integers as indices)
+    @classmethod
+    def fromMeshArrays(cls, name, edgeIDs, edgeVertices, getPoints, getUpVectors=None):
+        pointIndices, localVertices = np.unique(np.asarray(edgeVertices).reshape(-1, 2), return_inverse=True)
+        pointList = pointIndices.tolist()
+        upVectors = getUpVectors(pointList) if getUpVectors is not None else None
+        return cls(name, np.asarray(edgeIDs), localVertices.reshape(-1, 2), pointIndices, getPoints(pointList), upVectors)
+
+    # job from cached chains (a chainCache.ChainEntry): no chaining in the worker, only the chains' points are fetched
+    @classmethod
+    def fromChainEntry(cls, name, entry, getPoints, getUpVectors=None):
+        pointIndices, localIndices = np.unique(entry.pointIndices, return_inverse=True)
+        pointList = pointIndices.tolist()
+        upVectors = getUpVectors(pointList) if getUpVectors is not None else None
+        chains = [[entry.edgeIDs[entry.edgeOffsets[chain]:entry.edgeOffsets[chain + 1]].tolist(),
+                   localIndices[entry.chainOffsets[chain]:entry.chainOffsets[chain + 1]].tolist()] for chain in range(entry.numChains())]
+        return cls(name, entry.edgeIDs, None, pointIndices, getPoints(pointList), upVectors, chains)
+
+    def __getstate__(self):
+        return tuple(getattr(self, slot) for slot in self.__slots__)
+
+    def __setstate__(self, state):
+        for slot, value in zip(self.__slots__, state):
+            setattr(self, slot, value)
+
+
+# result of one MeshJob: chains in mesh point indices plus the combined tube mesh (see core.buildNoodleBatch())
+class MeshResult(object):
+    __slots__ = ("name", "segregatedList", "points", "polyCounts", "polyConnects", "faceOffsets", "uvs", "uvIds")
+
+    def __init__(self, name, segregatedList, points, polyCounts, polyConnects, faceOffsets, uvs, uvIds):
+        self.name = name
+        self.segregatedList = segregatedList
+        self.points = points
+        self.polyCounts = polyCounts
+        self.polyConnects = polyConnects
+        self.faceOffsets = faceOffsets
+        self.uvs = uvs
+        self.uvIds = uvIds
+
+    def __getstate__(self):
+        return tuple(getattr(self, slot) for slot in self.__slots__)
+
+    def __setstate__(self, state):
+        for slot, value in zip(self.__slots__, state):
+            setattr(self, slot, value)
+
+
+# chain and build the tube mesh of one job (module level so worker processes can unpickle it)
+def runMeshJob(args):
+    job, radius, sides, caps, frameMode = args
+    localChains = job.chains if job.chains is not None else core.buildEdgeChains(job.edgeIDs, job.edgeVertices)
+    chainPointsList = [job.points[chain[1]] for chain in localChains]
+    upVectorsList = [job.upVectors[chain[1]] for chain in localChains] if job.upVectors is not None else None
+    points, polyCounts, polyConnects, faceOffsets, uvs, uvIds = core.buildNoodleBatch(chainPointsList, radius, sides, upVectorsList, caps, frameMode)
+
+    pointIndices = job.pointIndices.tolist()
+    segregatedList = [[chain[0], [pointIndices[index] for index in chain[1]]] for chain in localChains]
+    return MeshResult(job.name, segregatedList, points, polyCounts, polyConnects, faceOffsets, uvs, uvIds)
+
+# run every job, serially for workers <= 1, otherwise across a pool of that many processes (None: one per CPU)
+# results are returned in job order
+def runMeshJobs(jobs, radius, sides=20, workers=1, caps=True, frameMode="average"):
+    args = [(job, radius, sides, caps, frameMode) for job in jobs]
+    if workers is None:
+        workers = multiprocessing.cpu_count()
+    workers = min(workers, len(args))
+    if workers <= 1:
+        return [runMeshJob(arg) for arg in args]
+
+    setPoolExecutable()
+    pool = multiprocessing.Pool(workers)
+    try:
+        return pool.map(runMeshJob, args, chunksize=1)
+    finally:
+        pool.close()
+        pool.join()
+
+# spawned workers must not start another Maya GUI: point multiprocessing at mayapy when running inside maya(.exe)
+def setPoolExecutable():
+    executable = sys.executable
+    name, ext = os.path.splitext(os.path.basename(executable))
+    if name.lower() == "maya":
+        mayapy = os.path.join(os.path.dirname(executable), "mayapy" + ext)
+        if os.path.exists(mayapy):
+            multiprocessing.set_executable(mayapy)
@@ -0,0 +1,178 @@
+"""
+-- pointNoodler profiling --
+Stage timers, counters, optional cProfile capture and debug output for the noodle pipeline.
+
+Everything is off by default: stage() returns a shared no-op context manager and count() / debug() return immediately,
+so the hooks left in the pipeline cost next to nothing.  debug() takes a callable for anything expensive to format
+(it is only called while debug output is switched on).
+
+Stages    : selection, chainCache, edgeFetch, pointFetch, chaining, resample, tubes, meshCreate, parent, registry (scene scan),
+            pipeline (pointNoodlerParallel() worker processes are timed as a whole),
+            meshRead, bufferWrite, objWrite (cli.py)
+Counters  : edges, chains, merges, chainCacheHits, chainCacheMisses, resampleDropped, resamplePoints,
+            noodles, verticesWritten
+
+    profiling.start(profile=True, debug=False)
+    noodleSet = pointNoodler.getNoodleSetFromEdges()
+    pointNoodler.pointNoodlerSet(noodleSet, 0.1)
+    report = profiling.stop()               # {"totalSeconds", "stages", "counters", "profile"}
+    print(profiling.formatReport(report))
+    profiling.writeReport(report, "noodleReport.json")
+
+or, as a block:
+
+    with profiling.capture(path="noodleReport.json") as session:
+        ...
+    session.report
+"""
+import cProfile
+import json
+import pstats
+import sys
+import time
+
+try:
+    from StringIO import StringIO
+except ImportError:
+    from io import StringIO
+
+_session = None             # active Session, None while profiling is off
+
+
+class Session(object):
+    __slots__ = ("startTime", "stages", "counters", "debugEnabled", "profiler", "report")
+
+    def __init__(self, profile=False, debug=False):
+        self.startTime = time.time()
+        self.stages = {}                # stage name -> [seconds, calls]
+        self.counters = {}              # counter name -> total
+        self.debugEnabled = debug
+        self.profiler = cProfile.Profile() if profile else None
+        self.report = None
+
+
+class StageTimer(object):
+    __slots__ = ("session", "name", "startTime")
+
+    def __init__(self, session, name):
+        self.session = session
+        self.name = name
+
+    def __enter__(self):
+        self.startTime = time.time()
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        entry = self.session.stages.setdefault(self.name, [0.0, 0])
+        entry[0] += time.time() - self.startTime
+        entry[1] += 1
+        return False
+
+
+class NullStage(object):
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        return False
+
+NULL_STAGE = NullStage()
+
+
+# switch instrumentation on (profile: also run cProfile, debug: print debug() output)
+def start(profile=False, debug=False):
+    global _session
+    if _session is not None:
+        raise Exception ("Profiling is already running! Call profiling.stop() first.")
+    _session = Session(profile, debug)
+    if _session.profiler is not None:
+        _session.profiler.enable()
+    return _session
+
+# switch instrumentation off and return the report of the finished session
+def stop():
+    global _session
+    session = _session
+    if session is None:
+        raise Exception ("Profiling is not running! Call profiling.start() first.")
+    _session = None
+
+    profileText = None
+    if session.profiler is not None:
+        session.profiler.disable()
+        stream = StringIO()
+        pstats.Stats(session.profiler, stream=stream).sort_stats("cumulative").print_stats(40)
+        profileText = stream.getvalue()
+
+    session.report = {
+        "totalSeconds": time.time() - session.startTime,
+        "stages": dict((name, {"seconds": seconds, "calls": calls}) for name, (seconds, calls) in session.stages.items()),
+        "counters": dict(session.counters),
+        "profile": profileText,
+    }
+    return session.report
+
+def isActive():
+    return _session is not None
+
+# time the enclosed block under name (no-op while profiling is off)
+def stage(name):
+    if _session is None:
+        return NULL_STAGE
+    return StageTimer(_session, name)
+
+# add value to counter name (no-op while profiling is off)
+def count(name, value=1):
+    if _session is not None:
+        _session.counters[name] = _session.counters.get(name, 0) + value
+
+# print message (or the result of calling it) while debug output is on
+def debug(message):
+    if _session is None or not _session.debugEnabled:
+        return
+    if callable(message):
+        message = message()
+    sys.stdout.write(str(message) + "\n")
+
+
+class capture(object):
+    """start() / stop() as a with-block; the report is kept on the session (and written to path, if given)."""
+
+    def __init__(self, profile=False, debug=False, path=None):
+        self.profile = profile
+        self.debug = debug
+        self.path = path
+        self.session = None
+
+    def __enter__(self):
+        self.session = start(self.profile, self.debug)
+        return self.session
+
+    def __exit__(self, excType, excValue, traceback):
+        report = stop()
+        if self.path is not None:
+            writeReport(report, self.path)
+        return False
+
+
+def writeReport(report, path):
+    with open(path, "w") as f:
+        json.dump(report, f, indent=1, sort_keys=True)
+
+# plain-text table of a report (stages sorted by time)
+def formatReport(report):
+    lines = ["%-28s %10s %8s" % ("stage", "seconds", "calls")]
+    for name, stats in sorted(report["stages"].items(), key=lambda item: -item[1]["seconds"]):
+        lines.append("%-28s %10.4f %8d" % (name, stats["seconds"], stats["calls"]))
+    lines.append("%-28s %10.4f" % ("total", report["totalSeconds"]))
+    if report["counters"]:
+        lines.append("")
+        lines.append("%-28s %10s" % ("counter", "value"))
+        for name, value in sorted(report["counters"].items()):
+            lines.append("%-28s %10d" % (name, value))
+    if report["profile"]:
+        lines.append("")
+        lines.append(report["profile"])
+    return "\n".join(lines)
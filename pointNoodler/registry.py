@@ -0,0 +1,227 @@
+"""
+-- pointNoodler noodle registry --
+Index of the noodles this package generated, keyed by source mesh, so they can be found, deleted and rebuilt per mesh
+without scanning the scene by name (cmds.ls("pNoodle*") also matched unrelated nodes and could only take everything).
+
+Records are keyed by node UUIDs (cmds.ls(node, uuid=True)), not DAG paths, so renaming or reparenting a noodle or its
+source mesh keeps it in the index; paths are looked up from the UUIDs when needed.
+
+Every registered noodle transform is tagged with where it came from, so the index survives reloading the package and
+reopening the scene (the first lookup collects the tagged nodes with a single ls call):
+-noodleSource  : source mesh (full path when the noodle was made) ("" for noodles created without a parent)
+-noodleSourceId: UUID of the source mesh ("" for noodles created without a parent)
+-noodleEdgeIds : source edge IDs of its chains, chain after chain (empty for noodles generated from points only)
+-noodleParams  : generation parameters as JSON (radius, sides, useUpVectors, caps, frameMode; "node" for live noodles)
+
+    pointNoodler.defaultRegistry.noodlesOf(meshName)            # noodle transforms of one mesh (dict lookup)
+    pointNoodler.deleteNoodles([meshName])                      # delete them (every registered noodle by default), one undo chunk
+    pointNoodler.regenerateNoodles([meshName], radius=0.2)      # rebuild them from their stored edge IDs, one undo chunk
+    pointNoodler.updateNoodles(0.1)                             # rebuild only the selected meshes whose edge selection / parameters changed
+
+Noodles deleted outside the registry (by hand, by undo, or with their source mesh) drop out of the index the next time their
+mesh is looked up; rebuild() re-reads the tags, e.g. after an undo brought noodles back.
+"""
+import json
+
+import numpy as np
+
+try:
+    import maya.cmds as cmds
+except ImportError:     # headless: the registry is only used with a (stand-in) Maya scene
+    cmds = None
+
+from pointNoodler import profiling
+
+TAG_SOURCE = "noodleSource"
+TAG_SOURCE_ID = "noodleSourceId"
+TAG_EDGE_IDS = "noodleEdgeIds"
+TAG_PARAMS = "noodleParams"
+
+
+class NoodleRecord(object):
+    __slots__ = ("noodleId", "noodlePath", "sourceId", "sourcePath", "edgeIDs", "params")
+
+    def __init__(self, noodleId, noodlePath, sourceId, sourcePath, edgeIDs, params):
+        self.noodleId = noodleId            # UUID of the noodle transform
+        self.noodlePath = noodlePath        # its last known full path
+        self.sourceId = sourceId            # UUID of the source mesh, None for noodles created without a parent
+        self.sourcePath = sourcePath        # its last known full path (None without a parent)
+        self.edgeIDs = edgeIDs              # (E,) int32 source mesh edge IDs, chain after chain
+        self.params = params                # dict of generation parameters
+
+    # current full path of the noodle transform (last known path once it is gone)
+    @property
+    def noodle(self):
+        self.noodlePath = getPath(self.noodleId, self.noodlePath) or self.noodlePath
+        return self.noodlePath
+
+    # current full path of the source mesh (last known path once it is gone), None for noodles created without a parent
+    @property
+    def source(self):
+        if self.sourceId is not None:
+            self.sourcePath = getPath(self.sourceId, self.sourcePath) or self.sourcePath
+        return self.sourcePath
+
+    def exists(self):
+        return getPath(self.noodleId, self.noodlePath) is not None
+
+    # live noodles (pointNoodlerNode) follow their source mesh on their own
+    def isLive(self):
+        return "node" in self.params
+
+    def __repr__(self):
+        return "NoodleRecord(%s <- %s, %d edges)" % (self.noodle, self.source, len(self.edgeIDs))
+
+
+class NoodleRegistry(object):
+    def __init__(self):
+        self.records = {}                   # noodle UUID -> NoodleRecord
+        self.sourceNoodles = {}             # source mesh UUID (None: no parent) -> [noodle UUID, ...] in creation order
+        self.scanned = False                # tagged noodles already in the scene are collected on first use
+
+    # tag noodle with its source mesh, edge IDs and parameters and add it to the index; returns the noodle's full path
+    def register(self, noodle, source, edgeIDs=None, params=None):
+        noodle = getLongName(noodle)
+        source = getLongName(source) if source is not None else None
+        sourceId = getUUID(source) if source is not None else None
+        edgeIDs = np.asarray(edgeIDs if edgeIDs is not None else [], dtype=np.int32)
+        params = getParams(params or {})
+        tagNoodle(noodle, source, sourceId, edgeIDs, params)
+        self.ensureScanned()
+        self.add(NoodleRecord(getUUID(noodle), noodle, sourceId, source, edgeIDs, params))
+        return noodle
+
+    def add(self, record):
+        self.remove([record.noodleId])
+        self.records[record.noodleId] = record
+        self.sourceNoodles.setdefault(record.sourceId, []).append(record.noodleId)
+
+    # drop noodles (by UUID) from the index (the nodes are left alone)
+    def remove(self, noodleIds):
+        for noodleId in noodleIds:
+            record = self.records.pop(noodleId, None)
+            if record is None:
+                continue
+            sourceNoodles = self.sourceNoodles[record.sourceId]
+            sourceNoodles.remove(noodleId)
+            if not sourceNoodles:
+                del self.sourceNoodles[record.sourceId]
+
+    # NoodleRecords of one source mesh (None: noodles created without a parent), noodles that no longer exist are dropped
+    def recordsOf(self, source):
+        self.ensureScanned()
+        if source is None:
+            return self.recordsOfId(None)
+        sourceId = getUUID(source)
+        return self.recordsOfId(sourceId) if sourceId is not None else []
+
+    def recordsOfId(self, sourceId):
+        records = [self.records[noodleId] for noodleId in self.sourceNoodles.get(sourceId, [])]
+        missing = [record.noodleId for record in records if not record.exists()]
+        if missing:
+            self.remove(missing)
+        return [self.records[noodleId] for noodleId in self.sourceNoodles.get(sourceId, [])]
+
+    def noodlesOf(self, source):
+        return [record.noodle for record in self.recordsOf(source)]
+
+    # NoodleRecords of the given source meshes (every registered noodle by default)
+    def getRecords(self, sources=None):
+        self.ensureScanned()
+        if sources is None:
+            return [record for sourceId in list(self.sourceNoodles) for record in self.recordsOfId(sourceId)]
+        return [record for source in sources for record in self.recordsOf(source)]
+
+    # source meshes (current full paths) that have registered noodles
+    def sources(self):
+        self.ensureScanned()
+        return [records[0].source for records in (self.recordsOfId(sourceId) for sourceId in list(self.sourceNoodles)) if records]
+
+    def record(self, noodle):
+        self.ensureScanned()
+        return self.records.get(getUUID(noodle))
+
+    # delete the noodles of the given records (and the pointNoodlerNodes of live ones) with a single delete; returns the deleted noodles
+    def delete(self, records):
+        records = [record for record in records if record.exists()]
+        noodles = [record.noodle for record in records]
+        liveNodes = [record.params["node"] for record in records if record.isLive() and cmds.objExists(record.params["node"])]
+        if noodles or liveNodes:
+            cmds.delete(noodles + liveNodes)
+        self.remove([record.noodleId for record in records])
+        return noodles
+
+    # re-read the index from the tagged nodes in the scene
+    def rebuild(self):
+        with profiling.stage("registry"):
+            self.records = {}
+            self.sourceNoodles = {}
+            for noodle in cmds.ls("*." + TAG_SOURCE, objectsOnly=True, long=True, recursive=True) or []:
+                self.add(readRecord(noodle))
+            self.scanned = True
+
+    def ensureScanned(self):
+        if not self.scanned:
+            self.rebuild()
+
+    def __len__(self):
+        self.ensureScanned()
+        return len(self.records)
+
+
+class undoChunk(object):
+    """cmds.undoInfo chunk around a with-block: everything done inside undoes in one step."""
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        cmds.undoInfo(openChunk=True, chunkName=self.name)
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        cmds.undoInfo(closeChunk=True)
+        return False
+
+
+# generation parameters as they come back from the tags (JSON types: tuples become lists)
+def getParams(params):
+    return json.loads(json.dumps(params))
+
+def getLongName(name):
+    names = cmds.ls(name, long=True)
+    return names[0] if names else name
+
+# UUID of a node, None if it does not exist
+def getUUID(name):
+    uuids = cmds.ls(name, uuid=True)
+    return uuids[0] if uuids else None
+
+# current full path of the node with uuid, None if it no longer exists
+# (lastPath picks between nodes sharing a UUID, e.g. the same asset referenced twice)
+def getPath(uuid, lastPath=None):
+    paths = cmds.ls(uuid, long=True) or []
+    if not paths:
+        return None
+    return lastPath if lastPath in paths else paths[0]
+
+def tagNoodle(noodle, source, sourceId, edgeIDs, params):
+    for attr, dataType in ((TAG_SOURCE, "string"), (TAG_SOURCE_ID, "string"), (TAG_EDGE_IDS, "Int32Array"), (TAG_PARAMS, "string")):
+        if not cmds.attributeQuery(attr, node=noodle, exists=True):
+            cmds.addAttr(noodle, longName=attr, dataType=dataType)
+    cmds.setAttr(noodle + "." + TAG_SOURCE, source or "", type="string")
+    cmds.setAttr(noodle + "." + TAG_SOURCE_ID, sourceId or "", type="string")
+    cmds.setAttr(noodle + "." + TAG_EDGE_IDS, edgeIDs.tolist(), type="Int32Array")
+    cmds.setAttr(noodle + "." + TAG_PARAMS, json.dumps(params, sort_keys=True), type="string")
+
+# noodles tagged before noodleSourceId existed are matched to their source by its stored path
+def readRecord(noodle):
+    source = cmds.getAttr(noodle + "." + TAG_SOURCE) or None
+    sourceId = None
+    if cmds.attributeQuery(TAG_SOURCE_ID, node=noodle, exists=True):
+        sourceId = cmds.getAttr(noodle + "." + TAG_SOURCE_ID) or None
+    elif source is not None:
+        sourceId = getUUID(source) or source
+    edgeIDs = np.asarray(cmds.getAttr(noodle + "." + TAG_EDGE_IDS) or [], dtype=np.int32)
+    params = json.loads(cmds.getAttr(noodle + "." + TAG_PARAMS) or "{}")
+    return NoodleRecord(getUUID(noodle), noodle, sourceId, source, edgeIDs, params)
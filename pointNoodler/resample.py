@@ -0,0 +1,204 @@
+"""
+-- pointNoodler resampling --
+Optional stage between getNoodleSetFromEdges() and pointNoodlerSet(): changes how many chain points (= tube sections)
+each noodle gets, vectorized over every chain of a NoodleSet at once.
+
+-simplifyChains()  : drops points while every original point stays within `tolerance` of the simplified path
+                     (nearly straight runs collapse, curved runs keep their points)
+-refineChains()    : Catmull-Rom spline resampling to a target segment length, or to a total point budget
+-resampleChains()  : refine, then simplify (smooth curves without spending sections on straight runs)
+
+    noodleSet = pointNoodler.getNoodleSetFromEdges()
+    noodleSet = resample.resampleChains(noodleSet, tolerance=0.01, segmentLength=0.2)
+    pointNoodler.pointNoodlerSet(noodleSet, 0.1)
+
+Chain ends (and the seam point of closed loops) always stay in place.  Resampled sets keep the source edge IDs of each chain;
+generated points have pointIndices -1.
+"""
+import numpy as np
+
+from pointNoodler import profiling
+from pointNoodler.noodleSet import NoodleSet
+
+
+# refine (segmentLength / pointBudget) and / or simplify (tolerance) every chain; arguments left as None skip that step
+def resampleChains(noodleSet, tolerance=None, segmentLength=None, pointBudget=None):
+    if segmentLength is not None or pointBudget is not None:
+        noodleSet = refineChains(noodleSet, segmentLength, pointBudget)
+    if tolerance is not None:
+        noodleSet = simplifyChains(noodleSet, tolerance)
+    return noodleSet
+
+# drop chain points that can go without any original point ending up further than tolerance from the simplified chain
+# rounds of: pick removable points (interior points deviating least from their kept neighbours, never two neighbours at once,
+# ties split by position so a straight run halves every round),
+# check the error of every original point against its new segment, keep the removals whose segments stay within tolerance
+# (rejected points are kept for good), until no point is left to try
+def simplifyChains(noodleSet, tolerance):
+    with profiling.stage("resample"):
+        points = noodleSet.points
+        numPoints = len(points)
+        chainOffsets = noodleSet.chainOffsets
+        chainIds = getPointChainIds(chainOffsets)
+
+        kept = np.ones(numPoints, dtype=bool)
+        fixed = np.zeros(numPoints, dtype=bool)         # chain ends never go, nor do points whose removal was rejected
+        fixed[chainOffsets[:-1][np.diff(chainOffsets) > 0]] = True
+        fixed[chainOffsets[1:][np.diff(chainOffsets) > 0] - 1] = True
+
+        while True:
+            keptIndices = np.flatnonzero(kept)
+            prevKept = np.roll(keptIndices, 1)
+            nextKept = np.roll(keptIndices, -1)
+            interior = ~fixed[keptIndices]              # interior points always have kept neighbours in their own chain
+
+            deviation = np.full(len(keptIndices), np.inf)
+            deviation[interior] = getSegmentDistances(points[keptIndices[interior]], points[prevKept[interior]], points[nextKept[interior]])
+            deviation[deviation > tolerance] = np.inf
+
+            # strict local minima of the deviation among kept neighbours, so no two neighbours are removed together
+            # ties go to the point at the even kept position: on a run of equal deviations (exactly collinear points, all 0.0)
+            # every other point is a candidate, so the run halves each round instead of losing one point per round
+            neighbourBefore = np.roll(deviation, 1)
+            neighbourAfter = np.roll(deviation, -1)
+            even = np.arange(len(keptIndices)) % 2 == 0
+            candidate = (np.isfinite(deviation) & ((deviation < neighbourBefore) | ((deviation == neighbourBefore) & even))
+                         & ((deviation < neighbourAfter) | ((deviation == neighbourAfter) & even)))
+            if not candidate.any():
+                break
+
+            trial = kept.copy()
+            trial[keptIndices[candidate]] = False
+            segmentStart, segmentEnd = getSegmentBounds(trial)
+            error = getSegmentDistances(points, points[segmentStart], points[segmentEnd])
+            error[trial] = 0.0
+
+            # each candidate sits alone on its new segment: accept it if no original point of that segment is out of tolerance
+            trialIndices = np.flatnonzero(trial)
+            segmentError = np.maximum.reduceat(error, trialIndices) if len(trialIndices) else error
+            candidateIndices = keptIndices[candidate]
+            candidateError = segmentError[np.searchsorted(trialIndices, candidateIndices) - 1]
+            accepted = candidateIndices[candidateError <= tolerance]
+            fixed[candidateIndices[candidateError > tolerance]] = True
+            kept[accepted] = False
+            profiling.count("resampleDropped", len(accepted))
+
+        return selectPoints(noodleSet, kept, chainIds)
+
+# resample every chain along a Catmull-Rom spline through its points, with segments of about segmentLength
+# pointBudget: choose the segment length so that the whole set has at most about pointBudget points instead
+# (the noodles then have about pointBudget * sides vertices)
+def refineChains(noodleSet, segmentLength=None, pointBudget=None):
+    if segmentLength is None and pointBudget is None:
+        raise Exception ("Specify a segmentLength or a pointBudget to refine chains!")
+    with profiling.stage("resample"):
+        points = noodleSet.points
+        chainOffsets = noodleSet.chainOffsets
+        numChains = len(chainOffsets) - 1
+        starts = chainOffsets[:-1]
+        ends = chainOffsets[1:] - 1
+
+        # arc length of every point along its chain, and of every chain
+        stepLengths = np.zeros(len(points))
+        if len(points) > 1:
+            stepLengths[1:] = np.sqrt(np.einsum("ij,ij->i", points[1:] - points[:-1], points[1:] - points[:-1]))
+        stepLengths[starts[np.diff(chainOffsets) > 0]] = 0.0     # no length between chains
+        arcLengths = np.cumsum(stepLengths)
+        nonEmpty = np.diff(chainOffsets) > 0
+        chainLengths = np.zeros(numChains)
+        chainLengths[nonEmpty] = arcLengths[ends[nonEmpty]] - arcLengths[starts[nonEmpty]]
+
+        if segmentLength is None:
+            segmentLength = chainLengths.sum() / max(pointBudget - numChains, numChains, 1)
+        if segmentLength <= 0.0:
+            return noodleSet
+        numSegments = np.maximum(np.round(chainLengths / segmentLength).astype(np.int64), 1)
+        numSegments[np.diff(chainOffsets) < 2] = 0          # single points / empty chains stay as they are
+
+        newOffsets = np.zeros(numChains + 1, dtype=np.int64)
+        newOffsets[1:] = np.cumsum(np.where(numSegments > 0, numSegments + 1, np.diff(chainOffsets)))
+        sampleChains = np.repeat(np.arange(numChains), np.diff(newOffsets))
+        sampleSteps = np.arange(newOffsets[-1]) - newOffsets[sampleChains]
+        samplePositions = arcLengths[starts[sampleChains]] + chainLengths[sampleChains] * sampleSteps / np.maximum(numSegments[sampleChains], 1)
+
+        # segment (point p to p + 1) of every sample, kept inside its own chain
+        segment = np.searchsorted(arcLengths, samplePositions, side="right") - 1
+        segment = np.clip(segment, starts[sampleChains], np.maximum(ends[sampleChains] - 1, starts[sampleChains]))
+        segmentSpan = arcLengths[np.minimum(segment + 1, len(points) - 1)] - arcLengths[segment]
+        u = np.where(segmentSpan > 0.0, (samplePositions - arcLengths[segment]) / np.where(segmentSpan > 0.0, segmentSpan, 1.0), 0.0)
+        u = np.clip(u, 0.0, 1.0)
+
+        # neighbouring control points: clamped at open ends, wrapped around the seam of closed loops
+        closed = getClosedChains(noodleSet)
+        p1 = segment
+        p2 = np.minimum(segment + 1, ends[sampleChains])
+        p0 = segment - 1
+        p3 = segment + 2
+        wrapStart = p0 < starts[sampleChains]
+        wrapEnd = p3 > ends[sampleChains]
+        p0 = np.where(wrapStart, np.where(closed[sampleChains], ends[sampleChains] - 1, starts[sampleChains]), p0)
+        p3 = np.where(wrapEnd, np.where(closed[sampleChains], starts[sampleChains] + 1, ends[sampleChains]), p3)
+
+        newPoints = getCatmullRomPoints(points[p0], points[p1], points[p2], points[p3], u)
+        lastSamples = newOffsets[1:][numSegments > 0] - 1
+        newPoints[lastSamples] = points[ends[numSegments > 0]]      # exact chain ends (and seams)
+
+        newUpVectors = None
+        if noodleSet.upVectors is not None:
+            upVectors = noodleSet.upVectors
+            newUpVectors = upVectors[p1] * (1.0 - u)[:, None] + upVectors[p2] * u[:, None]
+            lengths = np.sqrt(np.einsum("ij,ij->i", newUpVectors, newUpVectors))
+            newUpVectors /= np.where(lengths > 0.0, lengths, 1.0)[:, None]
+
+        newPointIndices = np.full(newOffsets[-1], -1, dtype=np.int32)
+        hasPoints = np.diff(newOffsets) > 0
+        newPointIndices[newOffsets[:-1][hasPoints]] = noodleSet.pointIndices[starts[hasPoints]]
+        newPointIndices[newOffsets[1:][hasPoints] - 1] = noodleSet.pointIndices[ends[hasPoints]]
+
+        profiling.count("resamplePoints", len(newPoints))
+        return NoodleSet(newPoints, newUpVectors, newPointIndices, newOffsets, noodleSet.edgeIDs, noodleSet.edgeOffsets,
+                         noodleSet.chainParents, noodleSet.parentNames)
+
+
+# chain index of every point
+def getPointChainIds(chainOffsets):
+    return np.repeat(np.arange(len(chainOffsets) - 1), np.diff(chainOffsets))
+
+# (C,) bool, True for closed loops (same test as NoodleSet.isClosed())
+def getClosedChains(noodleSet):
+    offsets = noodleSet.chainOffsets
+    closed = np.zeros(len(offsets) - 1, dtype=bool)
+    longEnough = np.diff(offsets) > 2
+    closed[longEnough] = noodleSet.pointIndices[offsets[:-1][longEnough]] == noodleSet.pointIndices[offsets[1:][longEnough] - 1]
+    return closed
+
+# distance of every point to the segment from start to end (rows of (n, 3) arrays)
+def getSegmentDistances(points, start, end):
+    direction = end - start
+    lengthSquared = np.einsum("ij,ij->i", direction, direction)
+    t = np.einsum("ij,ij->i", points - start, direction) / np.where(lengthSquared > 0.0, lengthSquared, 1.0)
+    closest = start + np.clip(t, 0.0, 1.0)[:, None] * direction
+    offset = points - closest
+    return np.sqrt(np.einsum("ij,ij->i", offset, offset))
+
+# for every point, the kept point at or before it and the kept point after it (kept points are their own segment start)
+def getSegmentBounds(kept):
+    indices = np.arange(len(kept))
+    segmentStart = np.maximum.accumulate(np.where(kept, indices, 0))
+    segmentEnd = np.minimum.accumulate(np.where(kept, indices, len(kept) - 1)[::-1])[::-1]
+    return segmentStart, np.where(kept, np.minimum(indices + 1, len(kept) - 1), segmentEnd)
+
+# uniform Catmull-Rom point between p1 (u = 0) and p2 (u = 1)
+def getCatmullRomPoints(p0, p1, p2, p3, u):
+    u = u[:, None]
+    u2 = u * u
+    u3 = u2 * u
+    return 0.5 * ((2.0 * p1) + (p2 - p0) * u + (2.0 * p0 - 5.0 * p1 + 4.0 * p2 - p3) * u2 + (3.0 * p1 - p0 - 3.0 * p2 + p3) * u3)
+
+# NoodleSet with only the kept points
+def selectPoints(noodleSet, kept, chainIds):
+    newOffsets = np.zeros(len(noodleSet.chainOffsets), dtype=np.int64)
+    newOffsets[1:] = np.cumsum(np.bincount(chainIds[kept], minlength=len(newOffsets) - 1))
+    upVectors = noodleSet.upVectors[kept] if noodleSet.upVectors is not None else None
+    return NoodleSet(noodleSet.points[kept], upVectors, noodleSet.pointIndices[kept], newOffsets, noodleSet.edgeIDs, noodleSet.edgeOffsets,
+                     noodleSet.chainParents, noodleSet.parentNames)
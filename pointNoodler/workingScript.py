@@ -1,19 +1,18 @@
+import importlib
+
 import maya.cmds as cmds
 import maya.OpenMaya as om
 import pointNoodler as pm
 
 cmds.polyCube(w = 4, d = 4, sx = 4, sy = 2, sz = 4)
 
-reload(pm)
+importlib.reload(pm)
 pm.deleteNoodles()
-masterList = pm.getPointDictFromEdges()
-keyLength = len(masterList.keys())
-print keyLength
-
-for index in xrange(keyLength):
-    pointList = masterList.items()[index][1][0]
-    print "pointList length = " + str(len(pointList))
-    parentName = masterList.items()[index][0]
-    pm.pointNoodler(pointList, 0.1, parentName)
+noodleSet = pm.getNoodleSetFromEdges()
+print (noodleSet)
 
- 
\ No newline at end of file
+for chain in range(noodleSet.numChains()):
+    pointList = noodleSet.chainPoints(chain)
+    print ("pointList length = " + str(len(pointList)))
+    parentName = noodleSet.chainParent(chain)
+    pm.pointNoodler(pointList, 0.1, parentName, edgeIDs=noodleSet.chainEdgeIDs(chain))
@@ -0,0 +1,609 @@
+"""
+Stand-in maya.OpenMaya (API 1.0): value types, selection lists and the MFnMesh calls used by pointNoodler, plus the attribute /
+data block classes its live node (noodleNode.py) uses.  Out-parameters are filled in place, like the real API.
+"""
+import ctypes
+import math
+
+from maya import _scene
+
+
+kUnknownParameter = 5
+
+
+class MSpace(object):
+    kObject = 2
+    kWorld = 4
+
+
+class MTypeId(object):
+    def __init__(self, value):
+        self._value = value
+
+    def id(self):
+        return self._value
+
+
+# value types
+class MVector(object):
+    def __init__(self, x=0.0, y=0.0, z=0.0):
+        if isinstance(x, (MVector, MPoint, MFloatVector, MFloatPoint)):
+            x, y, z = x.x, x.y, x.z
+        self.x = float(x)
+        self.y = float(y)
+        self.z = float(z)
+
+    def __add__(self, other):
+        return MVector(self.x + other.x, self.y + other.y, self.z + other.z)
+
+    def __sub__(self, other):
+        return MVector(self.x - other.x, self.y - other.y, self.z - other.z)
+
+    def __neg__(self):
+        return MVector(-self.x, -self.y, -self.z)
+
+    def __mul__(self, other):
+        if isinstance(other, MVector):       # dot product
+            return self.x * other.x + self.y * other.y + self.z * other.z
+        return MVector(self.x * other, self.y * other, self.z * other)
+
+    __rmul__ = __mul__
+
+    def __xor__(self, other):               # cross product
+        return MVector(self.y * other.z - self.z * other.y, self.z * other.x - self.x * other.z, self.x * other.y - self.y * other.x)
+
+    def __getitem__(self, index):
+        return (self.x, self.y, self.z)[index]
+
+    def length(self):
+        return math.sqrt(self.x * self.x + self.y * self.y + self.z * self.z)
+
+    def normal(self):
+        length = self.length()
+        if length == 0.0:
+            return MVector(self)
+        return MVector(self.x / length, self.y / length, self.z / length)
+
+    def normalize(self):
+        n = self.normal()
+        self.x, self.y, self.z = n.x, n.y, n.z
+        return self
+
+    def __repr__(self):
+        return "MVector(%r, %r, %r)" % (self.x, self.y, self.z)
+
+
+class MFloatVector(MVector):
+    pass
+
+
+class MPoint(object):
+    def __init__(self, x=0.0, y=0.0, z=0.0, w=1.0):
+        if isinstance(x, (MPoint, MFloatPoint)):
+            x, y, z, w = x.x, x.y, x.z, x.w
+        elif isinstance(x, MVector):
+            x, y, z = x.x, x.y, x.z
+        self.x = float(x)
+        self.y = float(y)
+        self.z = float(z)
+        self.w = float(w)
+
+    def __sub__(self, other):
+        if isinstance(other, (MPoint, MFloatPoint)):
+            return MVector(self.x - other.x, self.y - other.y, self.z - other.z)
+        return MPoint(self.x - other.x, self.y - other.y, self.z - other.z, self.w)
+
+    def __add__(self, other):
+        return MPoint(self.x + other.x, self.y + other.y, self.z + other.z, self.w)
+
+    def __mul__(self, other):
+        if isinstance(other, MMatrix):      # row vector * matrix
+            m = other._m
+            v = (self.x, self.y, self.z, self.w)
+            return MPoint(*[sum(v[r] * m[r][c] for r in range(4)) for c in range(4)])
+        return MPoint(self.x * other, self.y * other, self.z * other, self.w)
+
+    def __getitem__(self, index):
+        return (self.x, self.y, self.z, self.w)[index]
+
+    def distanceTo(self, other):
+        return (self - other).length()
+
+    def __repr__(self):
+        return "MPoint(%r, %r, %r, %r)" % (self.x, self.y, self.z, self.w)
+
+
+class MFloatPoint(MPoint):
+    pass
+
+
+class MMatrix(object):
+    def __init__(self):
+        self._m = [[1.0 if r == c else 0.0 for c in range(4)] for r in range(4)]
+
+    def __call__(self, row, column):
+        return self._m[row][column]
+
+    def __mul__(self, other):
+        return fromRows([[sum(self._m[r][n] * other._m[n][c] for n in range(4)) for c in range(4)] for r in range(4)])
+
+
+def fromRows(rows):
+    matrix = MMatrix()
+    matrix._m = [list(map(float, row)) for row in rows]
+    return matrix
+
+
+# arrays
+class _Array(list):
+    _itemType = None
+    _width = 1                  # C values per item of the (src[], count) constructor / get()
+
+    def __init__(self, *args):
+        if len(args) == 2 and isinstance(args[0], _Pointer):       # (src[], count): copy count items out of a C buffer
+            values = args[0]._buffer[:args[1] * self._width]
+            list.__init__(self, [self._fromValues(values[index:index + self._width]) for index in range(0, len(values), self._width)])
+        else:
+            list.__init__(self, *args)
+
+    def _fromValues(self, values):
+        return self._itemType(*values)
+
+    def length(self):
+        return len(self)
+
+    def set(self, value, index):
+        self[index] = self._convert(value)
+
+    def append(self, value):
+        list.append(self, self._convert(value))
+
+    def setLength(self, length):
+        if length < len(self):
+            del self[length:]
+        else:
+            self.extend(self._convert(self._itemType()) for _ in range(length - len(self)))
+
+    def clear(self):
+        del self[:]
+
+    def _convert(self, value):
+        if self._itemType is None or isinstance(value, self._itemType):
+            return value
+        return self._itemType(value)
+
+
+class MIntArray(_Array):
+    _itemType = int
+
+    def get(self, ptr):         # get(int[]): copy every item into a C buffer (see MScriptUtil)
+        ptr._fill(self)
+
+
+class MDoubleArray(_Array):
+    _itemType = float
+
+
+class MFloatArray(_Array):
+    _itemType = float
+
+
+class MPointArray(_Array):
+    _itemType = MPoint
+    _width = 4
+
+    def set(self, *args):       # set(MPoint, index) or set(index, x, y, z, w=1.0)
+        if isinstance(args[0], MPoint):
+            self[args[1]] = self._convert(args[0])
+        else:
+            self[args[0]] = self._itemType(*args[1:])
+
+    def get(self, ptr):         # get(double[][4]) / get(float[][4])
+        ptr._fill([value for p in self for value in (p.x, p.y, p.z, p.w)])
+
+
+class MFloatPointArray(MPointArray):
+    _itemType = MFloatPoint
+
+
+class MVectorArray(_Array):
+    _itemType = MVector
+
+
+class MFloatVectorArray(_Array):
+    _itemType = MFloatVector
+
+    def get(self, ptr):         # get(float[][3])
+        ptr._fill([value for v in self for value in (v.x, v.y, v.z)])
+
+
+# typed C buffer of an MScriptUtil; int(pointer) is its address, like a SWIG pointer of the real API
+class _Pointer(object):
+    def __init__(self, ctype, values):
+        self._buffer = (ctype * len(values))(*values)
+
+    def __int__(self):
+        return ctypes.addressof(self._buffer)
+
+    __long__ = __int__
+
+    def _fill(self, values):
+        if len(values) > len(self._buffer):
+            raise RuntimeError("(kInvalidParameter): buffer too small")
+        self._buffer[:len(values)] = values
+
+
+class MScriptUtil(object):
+    def __init__(self):
+        self._values = []
+        self._pointers = {}         # one buffer per pointer type, kept while the util lives
+
+    def createFromList(self, values, length):
+        self._values = list(values)[:length]
+        self._pointers = {}
+
+    def _pointer(self, ctype):
+        if ctype not in self._pointers:
+            self._pointers[ctype] = _Pointer(ctype, self._values)
+        return self._pointers[ctype]
+
+    def asIntPtr(self):
+        return self._pointer(ctypes.c_int)
+
+    def asFloatPtr(self):
+        return self._pointer(ctypes.c_float)
+
+    def asFloat3Ptr(self):
+        return self._pointer(ctypes.c_float)
+
+    def asFloat4Ptr(self):
+        return self._pointer(ctypes.c_float)
+
+    def asDouble4Ptr(self):
+        return self._pointer(ctypes.c_double)
+
+    def asInt2Ptr(self):
+        return [[0, 0]]
+
+    def getInt2ArrayItem(self, ptr, row, column):
+        return ptr[row][column]
+
+    @staticmethod
+    def createMatrixFromList(values, matrix):
+        values = list(values)
+        matrix._m = [[float(values[r * 4 + c]) for c in range(4)] for r in range(4)]
+
+
+# scene access
+class MObject(object):
+    def __init__(self, other=None):
+        self._node = other._node if other is not None else None
+        self._component = other._component if other is not None else None     # (component type, [indices])
+        self._data = other._data if other is not None else None               # MIntArray of MFnIntArrayData objects
+
+    def isNull(self):
+        return self._node is None and self._component is None
+
+    def apiTypeStr(self):
+        if self._component is not None:
+            return {"edge": "kMeshEdgeComponent", "vertex": "kMeshVertComponent", "face": "kMeshPolygonComponent"}[self._component[0]]
+        if self._node is None:
+            return "kInvalid"
+        return {"transform": "kTransform", "mesh": "kMesh"}[self._node.nodeType]
+
+
+class MDagPath(object):
+    def __init__(self):
+        self._node = None
+
+    def isValid(self):
+        return self._node is not None and self._node.name in _scene.nodes
+
+    def fullPathName(self):
+        return self._node.fullPathName()
+
+    def partialPathName(self):
+        return self._node.name
+
+    def node(self):
+        obj = MObject()
+        obj._node = self._node
+        return obj
+
+
+class MSelectionList(object):
+    def __init__(self):
+        self._items = []    # [(Node, (component type, [indices]) or None)]
+
+    def add(self, name):
+        self._items.append((_scene.find(name), None))
+
+    def length(self):
+        return len(self._items)
+
+    def isEmpty(self):
+        return len(self._items) == 0
+
+    def getDagPath(self, index, dagPath, component=None):
+        node, comp = self._items[index]
+        dagPath._node = node
+        if component is not None:
+            component._node = None
+            component._component = comp
+
+    def getDependNode(self, index, obj):
+        obj._node = self._items[index][0]
+        obj._component = None
+
+
+class MGlobal(object):
+    @staticmethod
+    def getActiveSelectionList(selList):
+        selList._items = []
+        for nodeName, componentType, indices in _scene.selection:
+            comp = (componentType, list(indices)) if componentType is not None else None
+            selList._items.append((_scene.nodes[nodeName], comp))
+
+
+class MFnSingleIndexedComponent(object):
+    def __init__(self, component=None):
+        self._component = component._component if component is not None else None
+
+    def elementCount(self):
+        return len(self._component[1])
+
+    def getElements(self, array):
+        array.clear()
+        for index in self._component[1]:
+            array.append(index)
+
+
+class MFnDependencyNode(object):
+    def __init__(self, obj=None):
+        self._node = obj._node if obj is not None else None
+
+    def name(self):
+        return self._node.name
+
+
+class MFnDagNode(MFnDependencyNode):
+    def fullPathName(self):
+        return self._node.fullPathName()
+
+    def partialPathName(self):
+        return self._node.name
+
+
+def _meshNode(target):
+    node = target._node
+    shape = node.shape() if node is not None else None
+    if shape is None:
+        raise RuntimeError("(kInvalidParameter): Object is incompatible with this method")
+    return shape
+
+
+class MFnMesh(object):
+    def __init__(self, target=None):
+        self._node = _meshNode(target) if target is not None else None
+
+    def _data(self):
+        return self._node.mesh
+
+    def numVertices(self):
+        return len(self._data().points)
+
+    def numEdges(self):
+        return len(self._data().getEdges())
+
+    def numPolygons(self):
+        return len(self._data().polyCounts)
+
+    def getPoint(self, index, point, space=MSpace.kObject):
+        point.x, point.y, point.z = self._data().points[index]
+        point.w = 1.0
+
+    def getPoints(self, pointArray, space=MSpace.kObject):
+        pointArray.clear()
+        for p in self._data().points:
+            pointArray.append(pointArray._itemType(p[0], p[1], p[2]))
+
+    def setPoints(self, pointArray, space=MSpace.kObject):
+        self._data().setPoints([[p.x, p.y, p.z] for p in pointArray])
+
+    def getEdgeVertices(self, edgeID, ptr):
+        ptr[0][0], ptr[0][1] = self._data().getEdges()[edgeID]
+
+    def getVertexNormal(self, index, angleWeighted, normal, space=MSpace.kObject):
+        normal.x, normal.y, normal.z = self._data().vertexNormals()[index]
+
+    def getVertexNormals(self, angleWeighted, normals, space=MSpace.kObject):
+        normals.clear()
+        for n in self._data().vertexNormals():
+            normals.append(MFloatVector(n[0], n[1], n[2]))
+
+    def getVertices(self, polyCounts, polyConnects):
+        polyCounts.clear()
+        polyConnects.clear()
+        for count in self._data().polyCounts:
+            polyCounts.append(count)
+        for index in self._data().polyConnects:
+            polyConnects.append(index)
+
+    # create(numVertices, numPolygons, vertexArray, polygonCounts, polygonConnects[, uArray, vArray][, parent])
+    def create(self, numVertices, numPolygons, vertexArray, polygonCounts, polygonConnects, *args):
+        uvs = None
+        if args and isinstance(args[0], MFloatArray):
+            uvs = [[u, v] for u, v in zip(args[0], args[1])]
+            args = args[2:]
+        parent = args[0] if args else None
+        result = self._create(vertexArray, polygonCounts, polygonConnects, parent)
+        self._data().uvs = uvs
+        return result
+
+    # face-vertex UV assignment; uvCounts must match the polygon counts
+    def assignUVs(self, uvCounts, uvIds):
+        if list(uvCounts) != self._data().polyCounts or len(uvIds) != len(self._data().polyConnects):
+            raise RuntimeError("(kInvalidParameter): UV counts do not match the polygons")
+        if self._data().uvs is None or (len(uvIds) and max(uvIds) >= len(self._data().uvs)):
+            raise RuntimeError("(kInvalidParameter): UV index out of range")
+        self._data().uvIds = list(uvIds)
+
+    def numUVs(self):
+        return len(self._data().uvs or [])
+
+    def _create(self, vertexArray, polygonCounts, polygonConnects, parent):
+        parentNode = parent._node if parent is not None and not parent.isNull() else None
+        points = [[p.x, p.y, p.z] for p in vertexArray]
+        if parentNode is not None and parentNode.nodeType == "mesh":        # mesh data object (MFnMeshData)
+            parentNode.mesh = _scene.MeshData(points, polygonCounts, polygonConnects)
+            self._node = parentNode
+            return parent
+        if parentNode is not None:
+            shape = _scene.Node(_scene.shapeName(parentNode.name), "mesh", parentNode)
+            shape.mesh = _scene.MeshData(points, polygonCounts, polygonConnects)
+            parentNode.children.append(shape)
+            _scene.nodes[shape.name] = shape
+            self._node = shape
+            return _pathTo(parentNode).node()
+        transform = _scene.createMesh(points, polygonCounts, polygonConnects)
+        self._node = transform.shape()
+        return _pathTo(transform).node()
+
+
+class MFnMeshData(object):
+    # mesh data object: a free "mesh" node outside the scene, filled by MFnMesh.create(..., parent=<this object>)
+    def create(self):
+        obj = MObject()
+        obj._node = _scene.Node("meshData", "mesh")
+        return obj
+
+
+class MFnIntArrayData(object):
+    def __init__(self, obj=None):
+        self._obj = obj
+
+    def create(self, array=()):
+        self._obj = MObject()
+        self._obj._data = MIntArray(array)
+        return self._obj
+
+    def array(self):
+        return MIntArray(self._obj._data)
+
+
+def _pathTo(node):
+    path = MDagPath()
+    path._node = node
+    return path
+
+
+class MItMeshVertex(object):
+    def __init__(self, target):
+        self._points = _meshNode(target).mesh.points
+        self._index = 0
+
+    def isDone(self):
+        return self._index >= len(self._points)
+
+    def next(self):
+        self._index += 1
+
+    def index(self):
+        return self._index
+
+    def position(self, space=MSpace.kObject):
+        return MPoint(*self._points[self._index])
+
+
+# node attributes and the data block of MPxNode.compute() (maya.OpenMayaMPx stand-in)
+class MFnData(object):
+    kIntArray = 7
+    kMesh = 12
+
+
+class MFnNumericData(object):
+    kInt = 7
+    kDouble = 11
+
+
+class _Attribute(MObject):
+    def __init__(self, longName, shortName, default=None):
+        MObject.__init__(self)
+        self.longName = longName
+        self.shortName = shortName
+        self.default = default
+
+
+class MFnAttribute(object):
+    def __init__(self):
+        self._attr = None
+
+    # create(longName, shortName, type[, default])
+    def create(self, longName, shortName, attrType, default=None):
+        self._attr = _Attribute(longName, shortName, default)
+        return self._attr
+
+    def _flag(self, *args):     # setStorable / setKeyable / ...: flags only matter to the real dependency graph
+        pass
+
+    setStorable = setWritable = setReadable = setKeyable = setHidden = _flag
+
+    def setMin(self, value):
+        self._attr.minimum = value
+
+
+class MFnTypedAttribute(MFnAttribute):
+    pass
+
+
+class MFnNumericAttribute(MFnAttribute):
+    pass
+
+
+class MFnEnumAttribute(MFnAttribute):
+    def create(self, longName, shortName, default=0):
+        self._attr = _Attribute(longName, shortName, default)
+        self._attr.fields = {}
+        return self._attr
+
+    def addField(self, name, index):
+        self._attr.fields[name] = index
+
+
+class MDataHandle(object):
+    def __init__(self, value=None):
+        self._value = value
+
+    def asMesh(self):
+        return self._value
+
+    def data(self):
+        return self._value
+
+    def asDouble(self):
+        return float(self._value)
+
+    def asInt(self):
+        return int(self._value)
+
+    asShort = asInt
+
+    def setMObject(self, obj):
+        self._value = obj
+
+
+class MDataBlock(object):
+    # values: {attribute long name: value}; attributes without a value read their default
+    def __init__(self, values):
+        self.values = dict(values)
+        self.outputs = {}           # attribute long name -> MDataHandle written by compute()
+        self.cleanPlugs = []
+
+    def inputValue(self, attr):
+        return MDataHandle(self.values.get(attr.longName, attr.default))
+
+    def outputValue(self, attr):
+        return self.outputs.setdefault(attr.longName, MDataHandle())
+
+    def setClean(self, plug):
+        self.cleanPlugs.append(plug)
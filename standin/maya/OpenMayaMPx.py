@@ -0,0 +1,44 @@
+"""
+Stand-in maya.OpenMayaMPx (API 1.0): just enough of MPxNode / MFnPlugin to register pointNoodler's live node and call its compute().
+There is no dependency graph: tests build an OpenMaya.MDataBlock of input values and call compute(plug, data) themselves.
+"""
+
+nodeTypes = {}          # registered node type name -> (type ID, node class instance creator)
+
+
+class MPxNode(object):
+    attributes = ()         # per subclass, in addAttribute() order
+    affects = ()            # per subclass: [(input attribute, affected attribute)]
+
+    def __init__(self):
+        pass
+
+    @classmethod
+    def addAttribute(cls, attr):
+        cls.attributes = tuple(cls.attributes) + (attr,)
+
+    @classmethod
+    def attributeAffects(cls, whenChanges, isAffected):
+        cls.affects = tuple(cls.affects) + ((whenChanges, isAffected),)
+
+
+def asMPxPtr(node):
+    return node
+
+
+class MFnPlugin(object):
+    def __init__(self, mobject=None, vendor=None, version=None):
+        pass
+
+    def registerNode(self, typeName, typeId, creator, initializer):
+        if typeName in nodeTypes:
+            raise RuntimeError("(kFailure): node type " + typeName + " is already registered")
+        initializer()
+        nodeTypes[typeName] = (typeId, creator)
+
+    def deregisterNode(self, typeId):
+        for typeName, (registeredId, creator) in list(nodeTypes.items()):
+            if registeredId is typeId or registeredId.id() == typeId.id():
+                del nodeTypes[typeName]
+                return
+        raise RuntimeError("(kFailure): node type is not registered")
@@ -0,0 +1,12 @@
+"""
+-- stand-in maya package --
+Minimal, pure-Python replacement for the parts of maya.cmds / maya.OpenMaya / maya.OpenMayaMPx (API 1.0) that pointNoodler touches,
+so the full getPointDictFromEdges() -> pointNoodler() flow and the live node's compute() can run headless (tests, benchmarks, build farm).
+
+Usage: put this folder (standin/) in front of sys.path before importing pointNoodler.
+    sys.path.insert(0, "<repo>/standin")
+    import maya.cmds as cmds        # stand-in
+    import pointNoodler
+
+Not a full emulation: only meshes (transform + shape pairs) in a flat in-memory scene, no history, object space only.
+"""
@@ -0,0 +1,246 @@
+"""
+In-memory scene shared by the stand-in maya.cmds and maya.OpenMaya modules.
+"""
+import math
+import re
+import uuid
+from collections import OrderedDict
+
+nodes = OrderedDict()       # node name -> Node (short names are unique in the stand-in scene)
+selection = []              # active selection: [(node name, component type or None, [component indices])]
+nameCounters = {}           # base name -> last number handed out for "name#" requests
+undoChunks = []             # names of the closed top-level undo chunks, oldest first (nothing is actually undoable)
+openUndoChunks = []         # names of the currently open (nested) undo chunks
+
+
+class Node(object):
+    def __init__(self, name, nodeType, parent=None):
+        self.name = name
+        self.nodeType = nodeType        # "transform" or "mesh"
+        self.parent = parent            # Node or None (world)
+        self.children = []
+        self.mesh = None                # MeshData for "mesh" nodes
+        self.attrs = OrderedDict()      # dynamic attributes (addAttr / setAttr)
+        self.uuid = str(uuid.uuid4()).upper()       # kept through rename / reparent, like Maya's node UUIDs
+
+    def fullPathName(self):
+        path = ""
+        node = self
+        while node is not None:
+            path = "|" + node.name + path
+            node = node.parent
+        return path
+
+    def shape(self):
+        if self.nodeType == "mesh":
+            return self
+        for child in self.children:
+            if child.nodeType == "mesh":
+                return child
+        return None
+
+
+class MeshData(object):
+    def __init__(self, points, polyCounts, polyConnects):
+        self.points = [list(map(float, p[:3])) for p in points]
+        self.polyCounts = list(polyCounts)
+        self.polyConnects = list(polyConnects)
+        self.edges = None               # [(p0, p1)] in order of first appearance while walking the faces
+        self.normals = None             # cached vertex normals, cleared when points change
+        self.uvs = None                 # [[u, v]] from MFnMesh.create(), or None
+        self.uvIds = None               # face-vertex UV indices from MFnMesh.assignUVs()
+
+    def getEdges(self):
+        if self.edges is None:
+            self.edges = []
+            edgeLookup = {}
+            offset = 0
+            for count in self.polyCounts:
+                face = self.polyConnects[offset:offset + count]
+                for corner in range(count):
+                    p0 = face[corner]
+                    p1 = face[(corner + 1) % count]
+                    key = (min(p0, p1), max(p0, p1))
+                    if key not in edgeLookup:
+                        edgeLookup[key] = len(self.edges)
+                        self.edges.append((p0, p1))
+                offset += count
+        return self.edges
+
+    def setPoints(self, points):
+        self.points = [list(map(float, p[:3])) for p in points]
+        self.normals = None
+
+    def vertexNormals(self):
+        if self.normals is not None:
+            return self.normals
+        normals = [[0.0, 0.0, 0.0] for _ in self.points]
+        offset = 0
+        for count in self.polyCounts:
+            face = self.polyConnects[offset:offset + count]
+            n = [0.0, 0.0, 0.0]         # Newell normal (area weighted)
+            for corner in range(count):
+                a = self.points[face[corner]]
+                b = self.points[face[(corner + 1) % count]]
+                n[0] += (a[1] - b[1]) * (a[2] + b[2])
+                n[1] += (a[2] - b[2]) * (a[0] + b[0])
+                n[2] += (a[0] - b[0]) * (a[1] + b[1])
+            for v in face:
+                for axis in range(3):
+                    normals[v][axis] += n[axis]
+            offset += count
+        for n in normals:
+            length = math.sqrt(n[0] * n[0] + n[1] * n[1] + n[2] * n[2])
+            if length > 0.0:
+                n[0] /= length
+                n[1] /= length
+                n[2] /= length
+        self.normals = normals
+        return normals
+
+
+def reset():
+    nodes.clear()
+    del selection[:]
+    nameCounters.clear()
+    del undoChunks[:]
+    del openUndoChunks[:]
+
+
+def uniqueName(name):
+    if name.endswith("#"):
+        base = name[:-1]
+        number = nameCounters.get(base, 0) + 1
+        while base + str(number) in nodes:
+            number += 1
+        nameCounters[base] = number
+        return base + str(number)
+    if name not in nodes:
+        return name
+    match = re.match(r"(.*?)(\d*)$", name)
+    base = match.group(1)
+    number = int(match.group(2) or 0) + 1
+    while base + str(number) in nodes:
+        number += 1
+    return base + str(number)
+
+
+def shapeName(transformName):
+    match = re.match(r"(.*?)(\d*)$", transformName)
+    return uniqueName(match.group(1) + "Shape" + match.group(2))
+
+
+def find(name):
+    if isinstance(name, Node):
+        return name
+    shortName = name.split(".")[0].split("|")[-1]
+    if shortName not in nodes:
+        raise RuntimeError("No object matches name: " + str(name))
+    return nodes[shortName]
+
+
+def createMesh(points, polyCounts, polyConnects, name="polySurface#", parent=None):
+    transform = Node(uniqueName(name), "transform")
+    nodes[transform.name] = transform
+    if parent is not None:
+        reparent(transform, find(parent))
+    shape = Node(shapeName(transform.name), "mesh", transform)
+    shape.mesh = MeshData(points, polyCounts, polyConnects)
+    transform.children.append(shape)
+    nodes[shape.name] = shape
+    return transform
+
+
+def reparent(node, parent):
+    if parent is not None and parent.nodeType == "mesh":     # parenting under a shape goes to its transform
+        parent = parent.parent
+    if node.parent is not None:
+        node.parent.children.remove(node)
+    node.parent = parent
+    if parent is not None:
+        parent.children.append(node)
+
+
+def deleteNode(node):
+    if node.name not in nodes:
+        return
+    for child in list(node.children):
+        deleteNode(child)
+    if node.parent is not None and node in node.parent.children:
+        node.parent.children.remove(node)
+    del nodes[node.name]
+    selection[:] = [entry for entry in selection if entry[0] != node.name]
+
+
+# mesh generators (same vertex layout as Maya where pointNoodler depends on it)
+def cylinderMesh(radius, axis, height, sx, sy):
+    ax = [float(a) for a in axis]
+    length = math.sqrt(sum(a * a for a in ax))
+    ax = [a / length for a in ax]
+    helper = [0.0, 1.0, 0.0] if abs(ax[1]) < 0.9 else [1.0, 0.0, 0.0]
+    b = cross(ax, helper)
+    bLength = math.sqrt(sum(v * v for v in b))
+    b = [v / bLength for v in b]
+    c = cross(ax, b)
+
+    points = []
+    for ring in range(sy + 1):          # rings along the axis, sx points each
+        t = -height / 2.0 + ring * (height / float(sy))
+        for side in range(sx):
+            angle = 2.0 * math.pi * side / sx
+            ca = radius * math.cos(angle)
+            sa = radius * math.sin(angle)
+            points.append([t * ax[n] + ca * b[n] + sa * c[n] for n in range(3)])
+    points.append([-height / 2.0 * ax[n] for n in range(3)])    # bottom cap center
+    points.append([height / 2.0 * ax[n] for n in range(3)])     # top cap center
+
+    polyCounts = []
+    polyConnects = []
+    for ring in range(sy):
+        for side in range(sx):
+            nxt = (side + 1) % sx
+            polyCounts.append(4)
+            polyConnects.extend([ring * sx + side, ring * sx + nxt, (ring + 1) * sx + nxt, (ring + 1) * sx + side])
+    bottom = (sy + 1) * sx
+    for side in range(sx):
+        polyCounts.append(3)
+        polyConnects.extend([(side + 1) % sx, side, bottom])
+    for side in range(sx):
+        polyCounts.append(3)
+        polyConnects.extend([sy * sx + side, sy * sx + (side + 1) % sx, bottom + 1])
+    return points, polyCounts, polyConnects
+
+
+def cubeMesh(w, h, d, sx, sy, sz):
+    faces = [
+        ((-w / 2.0, -h / 2.0, d / 2.0), (w, 0, 0), (0, h, 0), sx, sy),      # +z
+        ((w / 2.0, -h / 2.0, -d / 2.0), (-w, 0, 0), (0, h, 0), sx, sy),     # -z
+        ((w / 2.0, -h / 2.0, d / 2.0), (0, 0, -d), (0, h, 0), sz, sy),      # +x
+        ((-w / 2.0, -h / 2.0, -d / 2.0), (0, 0, d), (0, h, 0), sz, sy),     # -x
+        ((-w / 2.0, h / 2.0, d / 2.0), (w, 0, 0), (0, 0, -d), sx, sz),      # +y
+        ((-w / 2.0, -h / 2.0, -d / 2.0), (w, 0, 0), (0, 0, d), sx, sz),     # -y
+    ]
+    points = []
+    weld = {}
+    polyCounts = []
+    polyConnects = []
+
+    def pointIndex(p):
+        key = tuple(round(v, 9) for v in p)
+        if key not in weld:
+            weld[key] = len(points)
+            points.append(list(p))
+        return weld[key]
+
+    for origin, u, v, nu, nv in faces:
+        grid = [[pointIndex([origin[n] + u[n] * a / float(nu) + v[n] * b / float(nv) for n in range(3)])
+                 for a in range(nu + 1)] for b in range(nv + 1)]
+        for b in range(nv):
+            for a in range(nu):
+                polyCounts.append(4)
+                polyConnects.extend([grid[b][a], grid[b][a + 1], grid[b + 1][a + 1], grid[b + 1][a]])
+    return points, polyCounts, polyConnects
+
+
+def cross(a, b):
+    return [a[1] * b[2] - a[2] * b[1], a[2] * b[0] - a[0] * b[2], a[0] * b[1] - a[1] * b[0]]
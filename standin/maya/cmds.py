@@ -0,0 +1,196 @@
+"""
+Stand-in maya.cmds: the handful of commands pointNoodler and its driver scripts use.
+"""
+import fnmatch
+import re
+
+from maya import _scene
+
+COMPONENT_TYPES = {"e": "edge", "vtx": "vertex", "f": "face"}
+
+
+def polyCylinder(radius=1.0, axis=(0, 1, 0), height=2.0, sx=20, sy=1, name="pCylinder#", **kwargs):
+    points, polyCounts, polyConnects = _scene.cylinderMesh(float(radius), axis, float(height), int(kwargs.get("subdivisionsX", sx)), int(kwargs.get("subdivisionsY", sy)))
+    transform = _scene.createMesh(points, polyCounts, polyConnects, name)
+    return [transform.name, _scene.uniqueName("polyCylinder#")]
+
+
+def polyCube(w=1.0, h=1.0, d=1.0, sx=1, sy=1, sz=1, name="pCube#", **kwargs):
+    points, polyCounts, polyConnects = _scene.cubeMesh(float(w), float(h), float(d), int(sx), int(sy), int(sz))
+    transform = _scene.createMesh(points, polyCounts, polyConnects, name)
+    return [transform.name, _scene.uniqueName("polyCube#")]
+
+
+def parent(*args, **kwargs):
+    args = flatten(args)
+    children = args[:-1] if not kwargs.get("world") else args
+    newParent = None if kwargs.get("world") else _scene.find(args[-1])
+    result = []
+    for child in children:
+        if not objExists(child):        # history nodes returned by poly* commands are not DAG nodes, nothing to parent
+            continue
+        node = _scene.find(child)
+        _scene.reparent(node, newParent)
+        result.append(node.name)
+    return result
+
+
+def listRelatives(node, shapes=False, children=False, parent=False, fullPath=False, **kwargs):
+    node = _scene.find(flatten([node])[0])
+    if parent:
+        related = [node.parent] if node.parent is not None else []
+    elif shapes:
+        related = [child for child in node.children if child.nodeType == "mesh"]
+    else:
+        related = list(node.children)
+    if not related:
+        return None
+    return [n.fullPathName() if fullPath else n.name for n in related]
+
+
+def ls(*patterns, **kwargs):
+    patterns = flatten(patterns)
+    if kwargs.get("selection") or kwargs.get("sl"):
+        return flatten([entryName(entry) for entry in _scene.selection])
+    names = list(_scene.nodes.keys())
+    attrs = {}                          # "node.attr" patterns: nodes that have the attribute, listed as plugs unless objectsOnly
+    if patterns:
+        matched = []
+        for name in names:
+            for pattern in patterns:
+                if pattern == _scene.nodes[name].uuid:      # UUIDs resolve to their node
+                    matched.append(name)
+                    break
+                nodePattern, _, attr = pattern.split("|")[-1].partition(".")
+                if fnmatch.fnmatchcase(name, nodePattern) and (not attr or attr in _scene.nodes[name].attrs):
+                    matched.append(name)
+                    attrs[name] = attr
+                    break
+        names = matched
+    nodeType = kwargs.get("type")
+    if nodeType is not None:
+        names = [name for name in names if _scene.nodes[name].nodeType == nodeType]
+    if kwargs.get("uuid"):
+        return [_scene.nodes[name].uuid for name in names]
+    plugs = dict((name, "." + attrs[name] if attrs.get(name) and not (kwargs.get("objectsOnly") or kwargs.get("o")) else "") for name in names)
+    if kwargs.get("long"):
+        return [_scene.nodes[name].fullPathName() + plugs[name] for name in names]
+    return [name + plugs[name] for name in names]
+
+
+def objExists(name):
+    try:
+        _scene.find(name)
+        return True
+    except RuntimeError:
+        return False
+
+
+def delete(*args, **kwargs):
+    for name in flatten(args):
+        if objExists(name):
+            _scene.deleteNode(_scene.find(name))
+
+
+def undoInfo(**kwargs):
+    if kwargs.get("openChunk"):
+        _scene.openUndoChunks.append(kwargs.get("chunkName", ""))
+    elif kwargs.get("closeChunk"):
+        name = _scene.openUndoChunks.pop()
+        if not _scene.openUndoChunks:
+            _scene.undoChunks.append(name)
+    return None
+
+
+def select(*args, **kwargs):
+    if kwargs.get("clear") or kwargs.get("cl"):
+        del _scene.selection[:]
+        return
+    if not (kwargs.get("add") or kwargs.get("af")):
+        del _scene.selection[:]
+    for item in flatten(args):
+        nodeName, componentType, indices = parseSelectionItem(item)
+        for entry in _scene.selection:
+            if entry[0] == nodeName and entry[1] == componentType and componentType is not None:
+                entry[2].extend(index for index in indices if index not in entry[2])
+                break
+        else:
+            _scene.selection.append((nodeName, componentType, indices))
+
+
+def rename(name, newName):
+    node = _scene.find(name)
+    newName = _scene.uniqueName(newName)
+    del _scene.nodes[node.name]
+    _scene.selection[:] = [(newName if entry[0] == node.name else entry[0],) + tuple(entry[1:]) for entry in _scene.selection]
+    node.name = newName
+    _scene.nodes[newName] = node
+    shape = node.shape() if node.nodeType == "transform" else None
+    if shape is not None:       # keep the default shape name in step with its transform, like Maya
+        rename(shape.name, _scene.shapeName(newName))
+    return newName
+
+
+def sets(*args, **kwargs):
+    if kwargs.get("edit") and kwargs.get("forceElement"):
+        for name in flatten(args):
+            _scene.find(name).attrs["shadingGroup"] = kwargs["forceElement"]
+    return None
+
+
+def addAttr(node, longName=None, dataType=None, attributeType=None, defaultValue=None, **kwargs):
+    node = _scene.find(node)
+    longName = longName or kwargs.get("ln")
+    if longName in node.attrs:
+        raise RuntimeError("Found a similar attribute name: " + longName)
+    node.attrs[longName] = defaultValue
+
+
+def setAttr(plug, *values, **kwargs):
+    nodeName, attr = plug.rsplit(".", 1)
+    node = _scene.find(nodeName)
+    if attr not in node.attrs:
+        raise RuntimeError("No object matches name: " + plug)
+    node.attrs[attr] = values[0] if len(values) == 1 else list(values)
+
+
+def getAttr(plug, **kwargs):
+    nodeName, attr = plug.rsplit(".", 1)
+    node = _scene.find(nodeName)
+    if attr not in node.attrs:
+        raise ValueError("No object matches name: " + plug)
+    return node.attrs[attr]
+
+
+def attributeQuery(attr, node=None, exists=False, **kwargs):
+    return attr in _scene.find(node).attrs
+
+
+def flatten(args):
+    out = []
+    for arg in args:
+        if isinstance(arg, (list, tuple)):
+            out.extend(flatten(arg))
+        else:
+            out.append(arg)
+    return out
+
+
+def parseSelectionItem(item):
+    match = re.match(r"^([^.]+)\.(e|vtx|f)\[(\d+)(?::(\d+))?\]$", item)
+    if match is None:
+        return _scene.find(item).name, None, []
+    node = _scene.find(match.group(1))
+    if node.nodeType == "mesh":
+        node = node.parent
+    start = int(match.group(3))
+    end = int(match.group(4)) if match.group(4) else start
+    return node.name, COMPONENT_TYPES[match.group(2)], list(range(start, end + 1))
+
+
+def entryName(entry):
+    nodeName, componentType, indices = entry
+    if componentType is None:
+        return nodeName
+    key = [k for k, v in COMPONENT_TYPES.items() if v == componentType][0]
+    return ["%s.%s[%d]" % (nodeName, key, index) for index in indices]
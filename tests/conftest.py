@@ -0,0 +1,37 @@
+"""
+Test setup: the suite runs headless against the stand-in maya package (standin/), like benchmarks/benchNoodler.py.
+"""
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "standin"))
+sys.path.insert(0, ROOT)
+
+import numpy as np
+import pytest
+
+import maya.cmds as cmds
+from maya import _scene
+import pointNoodler
+from pointNoodler import registry
+
+
+# empty stand-in scene and noodle registry
+@pytest.fixture
+def scene(monkeypatch):
+    _scene.reset()
+    monkeypatch.setattr(pointNoodler, "defaultRegistry", registry.NoodleRegistry())
+    return _scene
+
+# scene with a 4x2x4 subdivided cube (pCube1) and its first 30 edges selected: open chains and T-junctions
+@pytest.fixture
+def cubeScene(scene):
+    cmds.polyCube(w=4, d=4, sx=4, sy=2, sz=4)
+    cmds.select("pCube1.e[0:29]")
+    return scene
+
+# (points, polyCounts, polyConnects) of a stand-in mesh (transform or shape name / path)
+def getMeshArrays(name):
+    mesh = _scene.find(name).shape().mesh
+    return np.array(mesh.points), np.array(mesh.polyCounts, dtype=np.int64), np.array(mesh.polyConnects, dtype=np.int64)
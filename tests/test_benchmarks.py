@@ -0,0 +1,29 @@
+"""
+benchmarks/benchNoodler.py: every scenario and stage runs, and the baseline comparison reports slowdowns.
+"""
+import json
+import os
+import sys
+
+from conftest import ROOT
+
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+import benchNoodler
+
+
+def test_all_scenarios_run(scene, tmpdir):
+    output = str(tmpdir.join("results.json"))
+    baseline = str(tmpdir.join("baseline.json"))
+    assert benchNoodler.main(["--sizes", "10", "--repeat", "1", "--baseline", baseline, "--require-baseline"]) == 2
+    assert benchNoodler.main(["--sizes", "10", "--repeat", "1", "--baseline", baseline, "--output", output, "--save-baseline"]) == 0
+    with open(output) as f:
+        results = json.load(f)
+    stages = ("chain", "reference", "frames", "framesRmf", "tubes", "resample", "maya", "noodleSet", "cacheHit")
+    assert sorted(results) == sorted("%s/10/%s" % (name, stage) for name in benchNoodler.SCENARIOS for stage in stages)
+
+def test_find_regressions():
+    baseline = {"loop/10/chain": {"seconds": 0.1}, "loop/10/tubes": {"seconds": 0.001}}
+    results = {"loop/10/chain": {"seconds": 0.2}, "loop/10/tubes": {"seconds": 0.004}, "loop/10/frames": {"seconds": 1.0}}
+    # tubes stays under minSeconds, frames has no baseline entry
+    assert benchNoodler.findRegressions(results, baseline, 1.5, 0.005) == [("loop/10/chain", 0.1, 0.2)]
+    assert benchNoodler.findRegressions(results, baseline, 2.5, 0.005) == []
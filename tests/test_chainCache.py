@@ -0,0 +1,129 @@
+"""
+chainCache.py: hits skip chaining, topology edits invalidate, entries survive the on-disk store.
+"""
+import os
+
+import numpy as np
+
+from maya import _scene
+import pointNoodler
+from pointNoodler import chainCache, core, profiling
+
+from conftest import getMeshArrays
+
+
+# topology edit that keeps every count: faces in reverse order, which renumbers the stand-in's (and Maya's) edges
+def reverseFaces(name):
+    mesh = _scene.find(name).shape().mesh
+    faces = []
+    offset = 0
+    for count in mesh.polyCounts:
+        faces.append(mesh.polyConnects[offset:offset + count])
+        offset += count
+    mesh.polyCounts = [len(face) for face in faces[::-1]]
+    mesh.polyConnects = [point for face in faces[::-1] for point in face]
+    mesh.edges = None
+    mesh.normals = None
+
+def getCounters(run):
+    profiling.start()
+    try:
+        result = run()
+    finally:
+        report = profiling.stop()
+    return result, report["counters"]
+
+def assertSameNoodleSet(noodleSetA, noodleSetB):
+    assert noodleSetA.toSegregatedList() == noodleSetB.toSegregatedList()
+    assert np.array_equal(noodleSetA.points, noodleSetB.points)
+
+
+def test_hit_returns_same_chains(cubeScene):
+    cache = chainCache.ChainCache()
+    first, counters = getCounters(lambda: pointNoodler.getNoodleSetFromEdges(cache=cache))
+    assert counters.get("chainCacheMisses") == 1 and "chainCacheHits" not in counters
+    second, counters = getCounters(lambda: pointNoodler.getNoodleSetFromEdges(cache=cache))
+    assert counters.get("chainCacheHits") == 1 and "chainCacheMisses" not in counters
+    assertSameNoodleSet(first, second)
+    assertSameNoodleSet(first, pointNoodler.getNoodleSetFromEdges())
+
+def test_topology_edit_invalidates(cubeScene):
+    cache = chainCache.ChainCache()
+    before = pointNoodler.getNoodleSetFromEdges(cache=cache)
+    reverseFaces("pCube1")
+    after, counters = getCounters(lambda: pointNoodler.getNoodleSetFromEdges(cache=cache))
+    assert counters.get("chainCacheMisses") == 1
+    assert len(cache) == 1
+    expected = pointNoodler.getNoodleSetFromEdges()
+    assertSameNoodleSet(after, expected)
+    assert before.toSegregatedList() != expected.toSegregatedList()       # the same edge IDs now name other edges
+
+def test_selection_order_is_part_of_the_key(cubeScene):
+    cache = chainCache.ChainCache()
+    pointNoodler.getNoodleSetFromEdges(cache=cache)
+    cubeScene.selection[0][2].reverse()
+    reordered = pointNoodler.getNoodleSetFromEdges(cache=cache)
+    assert len(cache) == 2
+    assertSameNoodleSet(reordered, pointNoodler.getNoodleSetFromEdges())
+
+def test_lru_limit():
+    cache = chainCache.ChainCache(maxEntries=2)
+    entry = chainCache.ChainEntry.fromSegregatedList([[[0], [0, 1]]])
+    for index in range(3):
+        cache.put("mesh", "topology", "selection%d" % index, entry)
+    assert len(cache) == 2 and cache.get("mesh", "topology", "selection0") is None
+    assert cache.get("mesh", "topology", "selection2") is entry
+
+def test_disk_roundtrip_and_invalidation(tmpdir):
+    directory = str(tmpdir.join("chains"))
+    segregatedList = core.buildEdgeChains([4, 5, 6, 9, 8, 7], [(0, 1), (1, 2), (2, 3), (10, 11), (11, 12), (12, 10)])
+    cache = chainCache.ChainCache(directory=directory)
+    topologyKey = chainCache.getTopologyKey([3], [0, 1, 2])
+    selectionKey = chainCache.getSelectionKey([4, 5, 6, 9, 8, 7])
+    cache.put("mesh", topologyKey, selectionKey, chainCache.ChainEntry.fromSegregatedList(segregatedList))
+
+    entry = chainCache.ChainCache(directory=directory).get("mesh", topologyKey, selectionKey)
+    assert entry.toSegregatedList() == segregatedList
+    assert entry.closed.tolist() == [False, True]
+    assert not entry.pointIndices.flags.writeable
+
+    cache.get("mesh", chainCache.getTopologyKey([3], [0, 2, 1]), selectionKey)       # seen with new topology: old entries dropped
+    assert len(cache) == 0
+    assert chainCache.ChainCache(directory=directory).get("mesh", topologyKey, selectionKey) is None
+
+def test_disk_store_is_capped(tmpdir):
+    directory = str(tmpdir.join("chains"))
+    cache = chainCache.ChainCache(maxEntries=2, directory=directory)
+    entry = chainCache.ChainEntry.fromSegregatedList([[[0], [0, 1]]])
+    cache.put("mesh", "topology", "selection0", entry)
+    cache.put("mesh", "topology", "selection1", entry)
+    os.utime(cache.getPath(("topology", "selection0")), (1000, 1000))
+    os.utime(cache.getPath(("topology", "selection1")), (2000, 2000))
+    chainCache.ChainCache(directory=directory).get("mesh", "topology", "selection0")      # loading refreshes the file
+    cache.put("mesh", "topology", "selection2", entry)
+    assert sorted(os.listdir(directory)) == ["topology_selection0.npz", "topology_selection2.npz"]
+
+def test_closed_entries_match_core():
+    entry = chainCache.ChainEntry.fromSegregatedList([[[0, 1], [0, 1, 0]], [[2, 3, 4], [0, 1, 2, 0]], [[5], [3, 4]]])
+    assert entry.closed.tolist() == [False, True, False]
+
+def test_parallel_noodles_use_the_cache(cubeScene):
+    cache = chainCache.ChainCache()
+    first, counters = getCounters(lambda: pointNoodler.pointNoodlerParallel(0.05, 6, cache=cache))
+    assert counters.get("chainCacheMisses") == 1 and len(cache) == 1
+    second, counters = getCounters(lambda: pointNoodler.pointNoodlerParallel(0.05, 6, workers=2, cache=cache))
+    assert counters.get("chainCacheHits") == 1 and "edgeFetch" not in counters
+    assert second["|pCube1"][1] == first["|pCube1"][1] == pointNoodler.getNoodleSetFromEdges().toSegregatedList()
+    assert [array.tolist() for array in getMeshArrays(second["|pCube1"][0])] == [array.tolist() for array in getMeshArrays(first["|pCube1"][0])]
+
+def test_update_and_regenerate_use_the_cache(cubeScene):
+    cache = chainCache.ChainCache()
+    _, counters = getCounters(lambda: pointNoodler.updateNoodles(0.1, 6, cache=cache))
+    assert counters.get("chainCacheMisses") == 1
+    _, counters = getCounters(lambda: pointNoodler.updateNoodles(0.2, 6, cache=cache))        # new radius, same chains
+    assert counters.get("chainCacheHits") == 1 and counters.get("noodles") == 12
+
+    # stored edge IDs are chained in selection order again
+    noodles, counters = getCounters(lambda: pointNoodler.regenerateNoodles(cache=cache, sides=8))
+    assert counters.get("chainCacheHits") == 1 and len(cache) == 1 and len(noodles) == 1
+    assert pointNoodler.defaultRegistry.recordsOf("|pCube1")[0].params["sides"] == 8
@@ -0,0 +1,89 @@
+"""
+cli.py: buffers of an exported mesh match pointNoodlerSet() on the same mesh, failed meshes leave nothing behind.
+"""
+import os
+
+import numpy as np
+import pytest
+
+import maya.cmds as cmds
+from maya import _scene
+import pointNoodler
+from pointNoodler import cli, core
+
+from conftest import getMeshArrays
+
+SELECTED = list(range(30))          # cubeScene's edge selection
+
+
+# pCube1 as <directory>/cube.obj plus cube.edges ("edgeID p0 p1" per selected edge, as exported from Maya)
+def exportCube(directory, edgeColumns=3):
+    points, polyCounts, polyConnects = getMeshArrays("pCube1")
+    objPath = os.path.join(directory, "cube.obj")
+    with open(objPath, "w") as f:
+        f.write("".join("v %r %r %r\n" % tuple(point) for point in points.tolist()))
+        faceStarts = np.cumsum(polyCounts) - polyCounts
+        for start, count in zip(faceStarts.tolist(), polyCounts.tolist()):
+            f.write("f " + " ".join(str(index + 1) for index in polyConnects[start:start + count].tolist()) + "\n")
+    edges = _scene.find("pCube1").shape().mesh.getEdges()
+    with open(os.path.join(directory, "cube.edges"), "w") as f:
+        for edgeID in SELECTED:
+            f.write(" ".join(str(value) for value in ([edgeID] + list(edges[edgeID]))[3 - edgeColumns:]) + "\n")
+    return objPath
+
+
+@pytest.mark.parametrize("frameMode, batchPoints", [("average", 100000), ("average", 10), ("rmf", 7), ("normal", 100000)])
+def test_buffers_match_point_noodler_set(cubeScene, tmpdir, frameMode, batchPoints):
+    objPath = exportCube(str(tmpdir))
+    outputDir = str(tmpdir.join("out"))
+    args = [objPath, "-o", outputDir, "--radius", "0.05", "--sides", "6", "--frame-mode", frameMode, "--batch-points", str(batchPoints)]
+    assert cli.main(args) == 0
+    buffers = cli.loadNoodleBuffers(os.path.join(outputDir, "cube.json"))
+
+    noodleSet = pointNoodler.getNoodleSetFromEdges()
+    noodle = pointNoodler.pointNoodlerSet(noodleSet, 0.05, 6, frameMode=frameMode)["|pCube1"]
+    points, polyCounts, polyConnects = getMeshArrays(noodle)
+    np.testing.assert_allclose(buffers["points"], points, rtol=0, atol=1e-5)
+    assert np.array_equal(buffers["polyCounts"], polyCounts)
+    assert np.array_equal(buffers["polyConnects"], polyConnects)
+    assert np.array_equal(buffers["faceOffsets"], cmds.getAttr(noodle + ".noodleFaceOffsets"))
+    assert np.array_equal(buffers["edgeIDs"], np.concatenate([noodleSet.chainEdgeIDs(chain) for chain in range(noodleSet.numChains())]))
+    assert len(buffers["edgeOffsets"]) == noodleSet.numChains() + 1
+
+def test_vertex_only_edge_file(cubeScene, tmpdir):
+    objPath = exportCube(str(tmpdir), edgeColumns=2)
+    job = cli.readMeshJob(objPath)
+    assert job.edgeIDs.tolist() == list(range(len(SELECTED)))
+    assert len(core.buildEdgeChains(job.edgeIDs, job.edgeVertices)) == pointNoodler.getNoodleSetFromEdges().numChains()
+
+def test_edge_ids_alone_are_rejected(cubeScene, tmpdir):
+    objPath = exportCube(str(tmpdir), edgeColumns=1)
+    with pytest.raises(Exception, match="only has edge IDs"):
+        cli.readMeshJob(objPath)
+
+def test_edge_vertices_out_of_range(cubeScene, tmpdir):
+    objPath = exportCube(str(tmpdir))
+    with open(os.path.join(str(tmpdir), "cube.edges"), "a") as f:
+        f.write("99 0 1000\n")
+    with pytest.raises(Exception, match="outside of the mesh"):
+        cli.readMeshJob(objPath)
+
+def test_failed_mesh_leaves_no_files(cubeScene, tmpdir, monkeypatch):
+    objPath = exportCube(str(tmpdir))
+    outputDir = str(tmpdir.join("out"))
+    args = [objPath, "-o", outputDir, "--radius", "0.05", "--sides", "6", "--batch-points", "10", "--obj"]
+    assert cli.main(args) == 0
+    assert os.path.exists(os.path.join(outputDir, "cube.json"))
+
+    buildNoodleBatch = core.buildNoodleBatch
+    calls = []
+    def failingBuild(*buildArgs, **kwargs):
+        calls.append(None)
+        if len(calls) == 3:
+            raise RuntimeError("batch failed")
+        return buildNoodleBatch(*buildArgs, **kwargs)
+    monkeypatch.setattr(core, "buildNoodleBatch", failingBuild)
+
+    with pytest.raises(RuntimeError):
+        cli.main(args)
+    assert os.listdir(outputDir) == []          # the earlier run's header and buffers are gone too
@@ -0,0 +1,214 @@
+"""
+core.py: chaining against the reference path, frames against the original MVector loop, seamless loops, RMF seams.
+"""
+import numpy as np
+import pytest
+
+import maya.cmds as cmds
+import maya.OpenMaya as om
+from maya import _scene
+from pointNoodler import core
+
+
+# edge selection of chains of `lengths` edges (closed: loops of `lengths` edges), edges shuffled across all chains and randomly flipped
+def makeChainSelection(rng, lengths, closed=False):
+    edgeVertices = []
+    base = 0
+    for length in lengths:
+        if closed:
+            edgeVertices.extend((base + index, base + (index + 1) % length) for index in range(length))
+            base += length
+        else:
+            edgeVertices.extend((base + index, base + index + 1) for index in range(length))
+            base += length + 1
+    return shuffleSelection(rng, np.arange(len(edgeVertices)) + 100, np.array(edgeVertices, dtype=np.int64))
+
+def shuffleSelection(rng, edgeIDs, edgeVertices):
+    order = rng.permutation(len(edgeIDs))
+    edgeVertices = edgeVertices[order].copy()
+    flip = rng.rand(len(order)) < 0.5
+    edgeVertices[flip] = edgeVertices[flip][:, ::-1]
+    return edgeIDs[order], edgeVertices
+
+def assertSameChains(edgeIDs, edgeVertices):
+    chains = core.buildEdgeChains(edgeIDs, edgeVertices)
+    assert chains == core.segregatePointIndices(edgeIDs, edgeVertices)
+    return chains
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_chaining_matches_reference_open_chains(seed):
+    rng = np.random.RandomState(seed)
+    assertSameChains(*makeChainSelection(rng, rng.randint(1, 9, size=rng.randint(1, 5))))
+
+@pytest.mark.parametrize("seed", range(20))
+def test_chaining_matches_reference_closed_loops(seed):
+    rng = np.random.RandomState(seed)
+    assertSameChains(*makeChainSelection(rng, rng.randint(3, 12, size=rng.randint(1, 3)), closed=True))
+
+def test_closed_loop_in_order():
+    chains = assertSameChains(np.arange(6), np.array([(index, (index + 1) % 6) for index in range(6)]))
+    assert chains == [[[5, 0, 1, 2, 3, 4], [5, 0, 1, 2, 3, 4, 5]]]
+
+def test_chaining_continues_through_junctions():
+    # T-junction: the spine 0-1-2 stays one chain, the tooth 1-3 is a branch
+    assert assertSameChains([0, 1, 2], [(0, 1), (1, 2), (1, 3)]) == [[[0, 1], [0, 1, 2]], [[2], [1, 3]]]
+    # crossing at point 1: two through-paths, 0-1-2 and 3-1-4
+    assert assertSameChains([0, 1, 2, 3], [(0, 1), (1, 2), (3, 1), (1, 4)]) == [[[0, 1], [0, 1, 2]], [[2, 3], [3, 1, 4]]]
+
+def test_chaining_skips_duplicate_edges():
+    assert assertSameChains([5, 6, 5], [(0, 1), (1, 2), (0, 1)]) == [[[5, 6], [0, 1, 2]]]
+
+# random edge subsets of a subdivided cube: junctions of 3 and 4 edges, crossing loops, duplicates, any order and direction
+@pytest.mark.parametrize("seed", range(10))
+def test_chaining_matches_reference_on_mesh_selections(scene, seed):
+    cmds.polyCube(w=4, d=4, sx=4, sy=2, sz=4)
+    meshEdges = np.array(_scene.find("pCube1").shape().mesh.getEdges())
+    rng = np.random.RandomState(seed)
+    for trial in range(50):
+        edgeIDs = rng.choice(len(meshEdges), rng.randint(1, len(meshEdges) + 1), replace=trial % 2 == 0)
+        assertSameChains(*shuffleSelection(rng, edgeIDs, meshEdges[edgeIDs]))
+
+def test_cube_selection_through_paths(cubeScene):
+    meshEdges = np.array(_scene.find("pCube1").shape().mesh.getEdges())
+    chains = assertSameChains(np.arange(30), meshEdges[:30])
+    assert len(chains) == 12
+    assert sorted(edgeID for chain in chains for edgeID in chain[0]) == list(range(30))
+
+
+# section matrices of the original pointNoodler() loop (MVector math per section, see the baseline), rows i, j, k, o
+def getReferenceMatrices(chainPoints):
+    pointList = [om.MPoint(*point) for point in chainPoints.tolist()]
+    numSections = len(pointList) - 1
+    matrices = []
+    oldI = oldJ = oldK = None
+    for section in range(numSections):
+        o = pointList[section]
+        i = pointList[section + 1] - o
+        i.normalize()
+        k = i ^ om.MVector(0, 1, 0)
+        j = k ^ i
+        if section > 0:
+            rows = ((i + oldI).normal(), (j + oldJ).normal(), (k + oldK).normal())
+        else:
+            rows = (i, j, k)
+        matrices.append([list(rows[0]), list(rows[1]), list(rows[2]), [o.x, o.y, o.z]])
+        oldI, oldJ, oldK = i, j, k
+    i = oldI
+    k = i ^ om.MVector(0, 1, 0)
+    j = k ^ i
+    o = pointList[numSections]
+    matrices.append([list(i), list(j), list(k), [o.x, o.y, o.z]])
+    return np.array(matrices)
+
+# the batched frames round differently from MVector, measured worst case over 200 chains: 2.5 eps per frame
+# row and 4 ulp per noodle point (a few ulp, not within 1 ulp)
+@pytest.mark.parametrize("seed", range(20))
+def test_average_frames_match_original_loop(seed):
+    rng = np.random.RandomState(seed)
+    chainPoints = np.cumsum(rng.rand(12, 3) * [1.0, 0.3, 1.0] + [0.2, -0.1, 0.2], axis=0)     # never parallel to world up
+    matrices = core.getSectionMatrices(chainPoints)
+    reference = getReferenceMatrices(chainPoints)
+    assert np.array_equal(matrices[:, 3, :3], reference[:, 3])
+    assert np.abs(matrices[:, :3, :3] - reference[:, :3]).max() <= 4 * np.finfo(np.float64).eps
+
+    localPoints = core.getTubeLocalPoints(len(chainPoints) - 1, 8, 0.3)
+    sectionIds = core.getTubeSectionIds(len(chainPoints) - 1, 8)
+    referenceMatrices = np.concatenate([reference, np.tile([0.0, 0.0, 0.0, 1.0], (len(reference), 1))[:, :, None]], axis=2)
+    points = core.transformSections(localPoints, sectionIds, matrices)
+    expected = core.transformSections(localPoints, sectionIds, referenceMatrices)
+    assert (np.abs(points - expected) <= 4 * np.spacing(np.abs(expected).max(axis=1, keepdims=True))).all()
+
+def test_transform_sections_matches_matrix_product():
+    rng = np.random.RandomState(4)
+    chainPoints = np.cumsum(rng.rand(6, 3) + 0.1, axis=0)
+    matrices = core.getSectionMatrices(chainPoints)
+    localPoints = core.getTubeLocalPoints(5, 8, 0.3)
+    sectionIds = core.getTubeSectionIds(5, 8)
+    points = core.transformSections(localPoints, sectionIds, matrices)
+    # row vector (0, y, z, 1) times the row-major section matrix
+    flat = np.concatenate([np.zeros((len(localPoints), 1)), localPoints[:, 1:], np.ones((len(localPoints), 1))], axis=1)
+    expected = np.einsum("nr,nrc->nc", flat, matrices[sectionIds])[:, :3]
+    np.testing.assert_allclose(points, expected, rtol=0, atol=1e-13)
+
+def makeClosedChain(numPoints, twist=0.0):
+    t = np.arange(numPoints) * (2.0 * np.pi / numPoints)
+    points = np.stack([np.cos(t) * (2.0 + np.cos(3.0 * t)), np.sin(t) * (2.0 + np.cos(3.0 * t)), np.sin(3.0 * t) + twist * t], axis=-1)
+    return np.concatenate([points, points[:1]])
+
+def test_closed_loop_tube_is_seamless():
+    chainPoints = makeClosedChain(16)
+    sides = 6
+    points, polyCounts, polyConnects, uvs, uvIds = core.buildTube(chainPoints, 0.2, sides)
+    numSections = len(chainPoints) - 1
+    assert len(points) == numSections * sides                       # one ring per distinct point, no caps
+    assert (polyCounts == 4).all() and len(polyCounts) == numSections * sides
+    assert np.array_equal(np.unique(polyConnects), np.arange(len(points)))
+    # the last section wraps onto the first ring
+    lastQuads = polyConnects.reshape(-1, 4)[-sides:]
+    assert set(lastQuads[:, 2:].ravel().tolist()) == set(range(sides))
+    # every edge is shared by exactly two quads: a closed surface without a seam
+    quads = polyConnects.reshape(-1, 4)
+    edges = np.sort(np.stack([quads, np.roll(quads, -1, axis=1)], axis=-1).reshape(-1, 2), axis=1)
+    assert (np.unique(edges, axis=0, return_counts=True)[1] == 2).all()
+
+def test_closed_loop_frames_match_at_seam():
+    for frameMode in core.FRAME_MODES:
+        chainPoints = makeClosedChain(20)
+        upVectors = np.tile([0.0, 0.0, 1.0], (len(chainPoints), 1))
+        matrices = core.getSectionMatrices(chainPoints, upVectors, closed=True, frameMode=frameMode)
+        np.testing.assert_allclose(matrices[-1], matrices[0], atol=1e-12)
+
+
+def test_open_tube_has_capped_rings():
+    chainPoints = np.cumsum(np.random.RandomState(6).rand(5, 3) + 0.1, axis=0)
+    sides = 8
+    points, polyCounts, polyConnects, uvs, uvIds = core.buildTube(chainPoints, 0.2, sides)
+    assert len(points) == len(chainPoints) * sides + 2              # one ring per point plus the two cap centers
+    assert len(polyCounts) == (len(chainPoints) - 1) * sides + 2 * sides and polyCounts.sum() == len(polyConnects) == len(uvIds)
+    assert np.array_equal(np.unique(polyConnects), np.arange(len(points)))
+    assert uvIds.max() < len(uvs)
+
+def test_empty_batch_gives_empty_arrays():
+    points, polyCounts, polyConnects, faceOffsets, uvs, uvIds = core.buildNoodleBatch([], 0.1, 6)
+    assert points.shape == (0, 3) and uvs.shape == (0, 2)
+    assert len(polyCounts) == len(polyConnects) == len(uvIds) == 0 and faceOffsets.tolist() == [0]
+
+def test_rmf_seam_closes_and_frames_stay_orthonormal():
+    chainPoints = makeClosedChain(64, twist=0.0)
+    chainOffsets = np.array([0, len(chainPoints)])
+    matrices = core.getChainFrames(chainPoints, chainOffsets, "rmf", None, [True])
+    np.testing.assert_allclose(matrices[-1], matrices[0], atol=1e-12)
+    rotations = matrices[:, :3, :3]
+    np.testing.assert_allclose(np.einsum("nij,nkj->nik", rotations, rotations), np.tile(np.eye(3), (len(rotations), 1, 1)), atol=1e-12)
+    # the twist is spread along the loop: neighbouring normals stay close
+    normals = matrices[:, 1, :3]
+    assert np.einsum("ij,ij->i", normals[1:], normals[:-1]).min() > 0.9
+
+def test_rmf_batch_matches_single_chains():
+    chains = [makeClosedChain(12), np.cumsum(np.random.RandomState(5).rand(9, 3), axis=0)]
+    chainOffsets = np.array([0, len(chains[0]), len(chains[0]) + len(chains[1])])
+    batch = core.getChainFrames(np.concatenate(chains), chainOffsets, "rmf", None, [True, False])
+    single = np.concatenate([core.getSectionMatrices(chains[0], None, True, "rmf"), core.getSectionMatrices(chains[1], None, False, "rmf")])
+    np.testing.assert_allclose(batch, single, atol=1e-12)
+
+# chains turning into / out of world up (the "average" frames' fallback axis), also as a long vertical run and as the last section
+@pytest.mark.parametrize("chainPoints", [
+    [[0, 0, 0], [1, 0, 0], [2, 0, 0], [2, 1, 0], [2, 2, 0]],
+    [[2, 2, 0], [2, 1, 0], [2, 0, 0], [1, 0, 0], [0, 0, 0]],
+    [[0, 0, 0], [0, 1, 0], [0, 2, 0], [1, 2, 0], [1, 2, 1]],
+    [[0, 0, 0], [0, 0, 1], [0, 1, 1], [0, 2, 1], [0, 3, 1], [0, 4, 1], [1, 4, 1]],
+    [[0, 0, 0], [1, 0, 0], [1, -1, 0]],
+])
+def test_average_frames_turning_into_up_stay_round(chainPoints):
+    matrices = core.getSectionMatrices(np.array(chainPoints, dtype=np.float64))
+    k = matrices[:, 2, :3]
+    j = matrices[:, 1, :3]
+    # no flat sections (k / j are only unit length where i is square to up, as in the original frames)
+    assert np.einsum("ij,ij->i", k, k).min() > 0.1 and np.einsum("ij,ij->i", j, j).min() > 0.1
+    assert np.einsum("ij,ij->i", k[1:], k[:-1]).min() > 0.0                         # no half turns between neighbouring sections
+
+def test_average_frames_fold_back_keep_own_frame():
+    # up and straight back down: the averaged i vanishes, the section keeps its own frame
+    matrices = core.getSectionMatrices(np.array([[0, 0, 0], [1, 0, 0], [1, 1, 0], [1, 0, 0]], dtype=np.float64))
+    np.testing.assert_allclose(matrices[2, :3, :3], [[0, -1, 0], [1, 0, 0], [0, 0, 1]], atol=1e-15)
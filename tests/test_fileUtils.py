@@ -0,0 +1,35 @@
+"""
+fileUtils.py: atomic writes replace the old file completely or not at all.
+"""
+import json
+import os
+
+import pytest
+
+from pointNoodler import fileUtils
+
+
+def test_write_replaces_existing_file(tmpdir):
+    path = str(tmpdir.join("header.json"))
+    fileUtils.writeAtomic(path, lambda f: json.dump({"version": 1}, f))
+    fileUtils.writeAtomic(path, lambda f: json.dump({"version": 2}, f))
+    with open(path) as f:
+        assert json.load(f) == {"version": 2}
+    fileUtils.writeAtomic(path, lambda f: f.write(b"\x00\x01"), binary=True)
+    with open(path, "rb") as f:
+        assert f.read() == b"\x00\x01"
+    assert os.listdir(str(tmpdir)) == ["header.json"]
+
+def test_failed_write_keeps_old_file(tmpdir):
+    path = str(tmpdir.join("header.json"))
+    fileUtils.writeAtomic(path, lambda f: f.write("complete"))
+
+    def failingWrite(f):
+        f.write("partial")
+        raise ValueError("disk full")
+
+    with pytest.raises(ValueError):
+        fileUtils.writeAtomic(path, failingWrite)
+    with open(path) as f:
+        assert f.read() == "complete"
+    assert os.listdir(str(tmpdir)) == ["header.json"]
@@ -0,0 +1,158 @@
+"""
+live.py / noodleNode.py: incremental updates give the same tube as a full core.buildNoodleBatch() rebuild.
+"""
+import numpy as np
+import pytest
+
+import maya.OpenMaya as om
+from maya import _scene
+from pointNoodler import core, live, noodleNode
+
+
+# two open chains (0-1-...-7, 8-...-12) and a closed loop (13-...-20-13)
+EDGE_VERTICES = np.array([(index, index + 1) for index in range(7)] + [(index, index + 1) for index in range(8, 12)]
+                         + [(13 + index, 13 + (index + 1) % 8) for index in range(8)])
+EDGE_IDS = np.arange(len(EDGE_VERTICES)) * 3
+
+def makeMeshPoints(rng):
+    points = np.cumsum(rng.rand(21, 3) + [0.3, 0.1, 0.2], axis=0)
+    t = np.arange(8) * (np.pi / 4.0)
+    points[13:] = np.stack([np.cos(t), np.sin(t) * 1.5, np.sin(2.0 * t) * 0.3], axis=-1) * 3.0
+    return points
+
+def getFullRebuild(segregatedList, meshPoints, radius, sides, frameMode):
+    return core.buildNoodleBatch([meshPoints[chain[1]] for chain in segregatedList], radius, sides, None, True, frameMode)
+
+
+@pytest.mark.parametrize("frameMode", ["average", "rmf"])
+def test_incremental_update_matches_full_rebuild(frameMode):
+    rng = np.random.RandomState(7)
+    meshPoints = makeMeshPoints(rng)
+    noodle = live.LiveNoodle(frameMode)
+    noodle.setTopology("key", EDGE_IDS, EDGE_VERTICES, 0.25, 6)
+    segregatedList = core.buildEdgeChains(EDGE_IDS, EDGE_VERTICES)
+    assert sum(noodle.closed) == 1
+
+    changed = noodle.update(meshPoints[noodle.sourceIndices])
+    assert len(changed) == len(noodle.points)
+    points, polyCounts, polyConnects, faceOffsets, uvs, uvIds = getFullRebuild(segregatedList, meshPoints, 0.25, 6, frameMode)
+    assert np.array_equal(noodle.polyCounts, polyCounts) and np.array_equal(noodle.polyConnects, polyConnects)
+    assert np.array_equal(noodle.uvIds, uvIds)
+    np.testing.assert_allclose(noodle.points, points, rtol=0, atol=1e-12)
+
+    # move single points (chain ends, interior, loop) and small groups, comparing after every step
+    for moved in ([0], [4], [7], [9, 10], [15], [13, 20], list(range(21))):
+        meshPoints[moved] += rng.normal(scale=0.2, size=(len(moved), 3))
+        changed = noodle.update(meshPoints[noodle.sourceIndices])
+        assert len(changed)
+        np.testing.assert_allclose(noodle.points, getFullRebuild(segregatedList, meshPoints, 0.25, 6, frameMode)[0], rtol=0, atol=1e-12)
+
+    assert len(noodle.update(meshPoints[noodle.sourceIndices])) == 0
+
+def test_untouched_chains_keep_their_vertices():
+    rng = np.random.RandomState(8)
+    meshPoints = makeMeshPoints(rng)
+    noodle = live.LiveNoodle()
+    noodle.setTopology(None, EDGE_IDS, EDGE_VERTICES, 0.25, 6)
+    noodle.update(meshPoints[noodle.sourceIndices])
+    meshPoints[10] += 0.5
+    changed = noodle.update(meshPoints[noodle.sourceIndices])
+    chain = [index for index, chainIndices in enumerate(noodle.chains) if 10 in noodle.sourceIndices[chainIndices]][0]
+    assert changed.min() >= noodle.vertexOffsets[chain] and changed.max() < noodle.vertexOffsets[chain + 1]
+
+def test_incremental_update_through_vertical_sections():
+    # one open chain along x, with points moved onto / off a vertical run (the "average" frames' fallback axis)
+    meshPoints = np.array([[index, 0.0, 0.1 * index] for index in range(8)])
+    edgeVertices = np.array([(index, index + 1) for index in range(7)])
+    noodle = live.LiveNoodle()
+    noodle.setTopology(None, np.arange(7), edgeVertices, 0.25, 6)
+    segregatedList = core.buildEdgeChains(np.arange(7), edgeVertices)
+    noodle.update(meshPoints[noodle.sourceIndices])
+    steps = (([4], [3.0, 1.0, 0.3]), ([5], [3.0, 2.0, 0.3]), ([4], [3.5, 1.0, 0.4]), ([4, 5], [4.0, 0.0, 0.4]), ([1], [0.0, 1.0, 0.0]),
+             ([2, 3, 4, 5, 6], [[1.0, 0.0, 0.1], [1.0, 1.0, 0.1], [1.0, 2.0, 0.1], [1.0, 3.0, 0.1], [1.0, 4.0, 0.1]]),
+             ([1], [0.0, 0.5, -1.0]))          # the vertical run's frames follow the section before it, beyond the moved window
+    for moved, position in steps:
+        meshPoints[moved] = position
+        noodle.update(meshPoints[noodle.sourceIndices])
+        np.testing.assert_allclose(noodle.points, getFullRebuild(segregatedList, meshPoints, 0.25, 6, "average")[0], rtol=0, atol=1e-12)
+
+def test_topology_key_tracks_the_source_faces():
+    polyCounts = np.array([4, 4])
+    polyConnects = np.array([0, 1, 2, 3, 1, 4, 5, 2])
+    key = live.getTopologyKey(6, polyCounts, polyConnects, EDGE_IDS)
+    assert key == live.getTopologyKey(6, polyCounts.tolist(), polyConnects.tolist(), EDGE_IDS.tolist())
+    # same counts, same edge IDs, faces listed in another order (renumbers the edges)
+    assert live.getTopologyKey(6, polyCounts, np.roll(polyConnects, 4), EDGE_IDS) != key
+    assert live.getTopologyKey(7, polyCounts, polyConnects, EDGE_IDS) != key
+    assert live.getTopologyKey(6, polyCounts, polyConnects, EDGE_IDS[:-1]) != key
+    assert not live.LiveNoodle().needsRebuild(None, None, None)
+    with pytest.raises(Exception, match="frame modes"):
+        live.LiveNoodle("cross")
+
+
+# the registered pointNoodlerNode class, driven through a stand-in data block
+@pytest.fixture
+def noodleNodeClass():
+    noodleNode.initializePlugin(None)
+    yield noodleNode.PointNoodlerNode
+    noodleNode.uninitializePlugin(None)
+
+# cube shape (pCube1) as the node's inMesh, plus a data block of its first 30 edges
+def makeDataBlock(nodeClass, frameMode=0):
+    sourceMesh = om.MObject()
+    sourceMesh._node = _scene.find("pCube1").shape()
+    return om.MDataBlock({"inMesh": sourceMesh, "edgeIds": om.MFnIntArrayData().create(list(range(30))), "radius": 0.25, "sides": 6, "frameMode": frameMode})
+
+def computeOutMesh(node, nodeClass, data):
+    node.compute(nodeClass.outMesh, data)
+    assert data.cleanPlugs[-1] is nodeClass.outMesh
+    mesh = data.outputs["outMesh"].data()._node.mesh
+    return np.array(mesh.points), np.array(mesh.polyCounts), np.array(mesh.polyConnects), np.array(mesh.uvIds)
+
+def getExpectedMesh(frameMode):
+    mesh = _scene.find("pCube1").shape().mesh
+    segregatedList = core.buildEdgeChains(range(30), [mesh.getEdges()[edgeID] for edgeID in range(30)])
+    return getFullRebuild(segregatedList, np.array(mesh.points), 0.25, 6, frameMode)
+
+def countEdgeLookups(monkeypatch):
+    calls = []
+    getEdgeVertices = om.MFnMesh.getEdgeVertices
+    monkeypatch.setattr(om.MFnMesh, "getEdgeVertices", lambda self, edgeID, ptr: calls.append(edgeID) or getEdgeVertices(self, edgeID, ptr))
+    return calls
+
+def test_node_compute_matches_full_rebuild(cubeScene, noodleNodeClass, monkeypatch):
+    assert noodleNodeClass.frameMode in noodleNodeClass.attributes
+    assert (noodleNodeClass.frameMode, noodleNodeClass.outMesh) in noodleNodeClass.affects
+    node = noodleNode.nodeCreator()
+    data = makeDataBlock(noodleNodeClass)
+    assert node.compute(noodleNodeClass.radius, data) == om.kUnknownParameter
+
+    edgeLookups = countEdgeLookups(monkeypatch)
+    points, polyCounts, polyConnects, uvIds = computeOutMesh(node, noodleNodeClass, data)
+    expected = getExpectedMesh("average")
+    np.testing.assert_allclose(points, expected[0], rtol=0, atol=1e-6)
+    assert np.array_equal(polyCounts, expected[1]) and np.array_equal(polyConnects, expected[2]) and np.array_equal(uvIds, expected[5])
+    assert len(edgeLookups) == 30
+
+    # moved points: sections are patched in place, the stored edges are not looked up again
+    mesh = _scene.find("pCube1").shape().mesh
+    mesh.setPoints((np.array(mesh.points) * [1.0, 1.5, 0.5]).tolist())
+    points = computeOutMesh(node, noodleNodeClass, data)[0]
+    np.testing.assert_allclose(points, getExpectedMesh("average")[0], rtol=0, atol=1e-6)
+    assert len(edgeLookups) == 30
+
+    # same counts, faces listed in reverse order: the edges are renumbered, so the chains are rebuilt
+    faces = np.split(np.array(mesh.polyConnects), np.cumsum(mesh.polyCounts)[:-1])[::-1]
+    mesh.__init__(mesh.points, mesh.polyCounts[::-1], np.concatenate(faces))
+    points, polyCounts, polyConnects, uvIds = computeOutMesh(node, noodleNodeClass, data)
+    expected = getExpectedMesh("average")
+    np.testing.assert_allclose(points, expected[0], rtol=0, atol=1e-6)
+    assert np.array_equal(polyConnects, expected[2])
+    assert len(edgeLookups) == 60
+
+def test_node_follows_the_frame_mode(cubeScene, noodleNodeClass):
+    node = noodleNode.nodeCreator()
+    computeOutMesh(node, noodleNodeClass, makeDataBlock(noodleNodeClass))
+    points = computeOutMesh(node, noodleNodeClass, makeDataBlock(noodleNodeClass, frameMode=live.FRAME_MODES.index("rmf")))[0]
+    assert node.liveNoodle.frameMode == "rmf"
+    np.testing.assert_allclose(points, getExpectedMesh("rmf")[0], rtol=0, atol=1e-6)
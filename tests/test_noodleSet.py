@@ -0,0 +1,58 @@
+"""
+noodleSet.py: array-backed chains, their per-chain views and concatenation.
+"""
+import numpy as np
+
+from pointNoodler import core
+from pointNoodler.noodleSet import NoodleSet
+
+
+# an open chain (0-1-2) and a closed loop (3-4-5-3)
+SEGREGATED_LIST = [[[10, 11], [0, 1, 2]], [[12, 13, 14], [3, 4, 5, 3]]]
+
+def makeNoodleSet(parentName, segregatedList=SEGREGATED_LIST, offset=0.0):
+    pointIndices = [pointIndex for chain in segregatedList for pointIndex in chain[1]]
+    points = np.array([(pointIndex, 0.0, offset) for pointIndex in pointIndices])
+    return NoodleSet.fromSegregatedList(parentName, segregatedList, points, points * 2.0)
+
+
+def test_chain_accessors():
+    noodleSet = makeNoodleSet("|mesh")
+    assert len(noodleSet) == noodleSet.numChains() == 2 and noodleSet.numPoints() == 7
+    assert noodleSet.chainPointIndices(1).tolist() == [3, 4, 5, 3]
+    assert noodleSet.chainEdgeIDs(0).tolist() == [10, 11]
+    np.testing.assert_array_equal(noodleSet.chainPoints(0)[:, 0], [0, 1, 2])
+    np.testing.assert_array_equal(noodleSet.chainUpVectors(1), noodleSet.chainPoints(1) * 2.0)
+    assert noodleSet.chainPoints(1).base is not None                # views, not copies
+    assert noodleSet.chainParent(1) == "|mesh" and noodleSet.chainsOf("|mesh") == [0, 1] and noodleSet.chainsOf("|other") == []
+    assert noodleSet.edgeIDsOf("|mesh").tolist() == [10, 11, 12, 13, 14] and len(noodleSet.edgeIDsOf("|other")) == 0
+    assert noodleSet.toSegregatedList() == SEGREGATED_LIST
+    assert noodleSet.nbytes() > 0 and repr(noodleSet) == "NoodleSet(2 chains, 7 points, 1 meshes)"
+
+def test_closed_test_is_shared():
+    noodleSet = makeNoodleSet("|mesh", [[[1, 2], [0, 1, 0]], [[3, 4, 5], [0, 1, 2, 0]]])
+    assert [noodleSet.isClosed(chain) for chain in range(2)] == [False, True]
+    assert [core.isClosedChain(noodleSet.chainPoints(chain)) for chain in range(2)] == [False, True]
+
+def test_concatenate_merges_parents():
+    setA = makeNoodleSet("|meshA")
+    setB = makeNoodleSet("|meshB", [[[7], [8, 9]]], offset=1.0)
+    setC = makeNoodleSet("|meshA", [[[20, 21], [30, 31, 32]]], offset=2.0)
+    joined = NoodleSet.concatenate([setA, setB, setC])
+    assert joined.parentNames == ["|meshA", "|meshB"]
+    assert joined.chainParents.tolist() == [0, 0, 1, 0]
+    assert joined.chainsOf("|meshA") == [0, 1, 3] and joined.chainsOf("|meshB") == [2]
+    assert joined.toSegregatedList() == SEGREGATED_LIST + [[[7], [8, 9]], [[20, 21], [30, 31, 32]]]
+    np.testing.assert_array_equal(joined.chainPoints(3), setC.chainPoints(0))
+    np.testing.assert_array_equal(joined.chainUpVectors(2), setB.chainUpVectors(0))
+    assert joined.edgeIDsOf("|meshA").tolist() == [10, 11, 12, 13, 14, 20, 21]
+
+    # up vectors are kept only if every set has them
+    setB.upVectors = None
+    assert NoodleSet.concatenate([setA, setB]).upVectors is None
+
+def test_empty_sets():
+    for noodleSet in (NoodleSet.empty(), NoodleSet.concatenate([])):
+        assert noodleSet.numChains() == 0 and noodleSet.numPoints() == 0 and noodleSet.parentNames == []
+        assert noodleSet.toSegregatedList() == []
+    assert NoodleSet.concatenate([NoodleSet.empty(), makeNoodleSet("|mesh")]).toSegregatedList() == SEGREGATED_LIST
@@ -0,0 +1,57 @@
+"""
+pipeline.py: results don't depend on the number of worker processes.
+"""
+import numpy as np
+
+import maya.cmds as cmds
+import pointNoodler
+from pointNoodler import pipeline
+
+from conftest import getMeshArrays
+
+
+def makeJobs(count):
+    rng = np.random.RandomState(11)
+    jobs = []
+    for index in range(count):
+        numPoints = 40 + index * 7
+        points = np.cumsum(rng.rand(numPoints, 3) + 0.05, axis=0)
+        edgeVertices = np.array([(point, point + 1) for point in range(numPoints - 1) if point % 9 != 8])
+        order = rng.permutation(len(edgeVertices))
+        jobs.append(pipeline.MeshJob.fromMeshArrays("mesh%d" % index, order * 2, edgeVertices[order], lambda indices: points[indices]))
+    return jobs
+
+def assertSameResults(resultsA, resultsB):
+    assert len(resultsA) == len(resultsB)
+    for resultA, resultB in zip(resultsA, resultsB):
+        for slot in pipeline.MeshResult.__slots__:
+            valueA, valueB = getattr(resultA, slot), getattr(resultB, slot)
+            if isinstance(valueA, np.ndarray):
+                assert np.array_equal(valueA, valueB), slot
+            else:
+                assert valueA == valueB, slot
+
+
+def test_run_mesh_jobs_independent_of_workers():
+    jobs = makeJobs(5)
+    serial = pipeline.runMeshJobs(jobs, 0.1, 8, workers=1)
+    assert [result.name for result in serial] == [job.name for job in jobs]
+    assertSameResults(serial, pipeline.runMeshJobs(jobs, 0.1, 8, workers=2))
+    assertSameResults(serial, pipeline.runMeshJobs(jobs, 0.1, 8, workers=3, frameMode="average"))
+
+def test_run_mesh_jobs_rmf_independent_of_workers():
+    jobs = makeJobs(3)
+    assertSameResults(pipeline.runMeshJobs(jobs, 0.1, 6, workers=1, frameMode="rmf"), pipeline.runMeshJobs(jobs, 0.1, 6, workers=2, frameMode="rmf"))
+
+def test_point_noodler_parallel_independent_of_workers(scene):
+    def getNoodlePoints(workers):
+        scene.reset()
+        cmds.polyCube(w=4, d=4, sx=4, sy=2, sz=4)
+        cmds.polyCube(w=2, h=3, d=2, sx=2, sy=3, sz=2)
+        cmds.select("pCube1.e[0:29]", "pCube2.e[4:20]")
+        noodles = pointNoodler.pointNoodlerParallel(0.05, 6, workers=workers)
+        return [(name, segregatedList, [array.tolist() for array in getMeshArrays(noodle)]) for name, (noodle, segregatedList) in sorted(noodles.items())]
+
+    serial = getNoodlePoints(1)
+    assert len(serial) == 2
+    assert serial == getNoodlePoints(2)
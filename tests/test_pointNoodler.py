@@ -0,0 +1,111 @@
+"""
+pointNoodler/__init__.py: the getPointDictFromEdges() -> pointNoodler() flow, headless on the stand-in scene.
+"""
+import numpy as np
+import pytest
+
+import maya.cmds as cmds
+import maya.OpenMaya as om
+import pointNoodler
+from pointNoodler import core
+
+from conftest import getMeshArrays
+
+
+def test_point_dict_follows_mesh_points(cubeScene):
+    meshPoints = getMeshArrays("pCube1")[0]
+    pointDict = pointNoodler.getPointDictFromEdges(splitChains=True)
+    noodleSet = pointNoodler.getNoodleSetFromEdges()
+    assert list(pointDict) == ["|pCube1"]
+    assert len(pointDict["|pCube1"]) == noodleSet.numChains()
+    for chain, pointList in enumerate(pointDict["|pCube1"]):
+        assert all(isinstance(point, om.MPoint) for point in pointList)
+        np.testing.assert_array_equal(pointNoodler.pointsToArray(pointList), meshPoints[noodleSet.chainPointIndices(chain)])
+
+    flat = pointNoodler.getPointDictFromEdges()
+    assert len(flat["|pCube1"]) == 1 and len(flat["|pCube1"][0]) == noodleSet.numPoints()
+
+def test_point_noodler_places_the_tube(cubeScene):
+    pointList = pointNoodler.getPointDictFromEdges(splitChains=True)["|pCube1"][0]
+    noodle = pointNoodler.pointNoodler(pointList, 0.1, "|pCube1", sides=8)
+    assert cmds.listRelatives(noodle, parent=True, fullPath=True) == ["|pCube1"]
+    points, polyCounts, polyConnects = getMeshArrays(noodle)
+    expected = core.buildTube(pointNoodler.pointsToArray(pointList), 0.1, 8)
+    np.testing.assert_allclose(points, expected[0], rtol=0, atol=1e-6)           # MFloatPointArray: float32 positions
+    assert np.array_equal(polyCounts, expected[1]) and np.array_equal(polyConnects, expected[2])
+    assert pointNoodler.defaultRegistry.noodlesOf("pCube1") == ["|pCube1|" + noodle.split("|")[-1]]
+
+def test_point_noodler_checks_its_arguments(cubeScene):
+    with pytest.raises(Exception, match="at least 2 points"):
+        pointNoodler.pointNoodler([om.MPoint()], 0.1, None)
+    with pytest.raises(Exception, match="radius is invalid"):
+        pointNoodler.pointNoodler([om.MPoint(), om.MPoint(1, 0, 0)], "0.1", None)
+
+def test_maya_arrays_round_trip():
+    rng = np.random.RandomState(2)
+    points = rng.rand(50, 3) * 100.0
+    pointArray = pointNoodler.toFloatPointArray(points)
+    assert isinstance(pointArray, om.MFloatPointArray) and pointArray.length() == 50
+    np.testing.assert_array_equal([(p.x, p.y, p.z, p.w) for p in pointArray], np.concatenate([points.astype(np.float32), np.ones((50, 1))], axis=1))
+    values = rng.randint(-1000, 1000, size=40)
+    intArray = pointNoodler.toIntArray(values)
+    assert list(intArray) == values.tolist()
+    assert pointNoodler.intArrayToArray(intArray, 40).tolist() == values.tolist()
+    floatArray = pointNoodler.toFloatArray(values / 7.0)
+    np.testing.assert_array_equal(list(floatArray), (values / 7.0).astype(np.float32))
+    assert pointNoodler.toIntArray([]).length() == 0 and pointNoodler.toFloatPointArray(np.zeros((0, 3))).length() == 0
+
+def test_batch_is_one_mesh_of_all_chains(cubeScene):
+    chainPointLists = pointNoodler.getPointDictFromEdges(splitChains=True)["|pCube1"]
+    nodesBefore = len(cubeScene.nodes)
+    noodle, faceOffsets = pointNoodler.pointNoodlerBatch(chainPointLists, 0.1, "|pCube1", sides=6)
+    assert len(cubeScene.nodes) == nodesBefore + 2                 # one transform, one shape
+    assert cmds.getAttr(noodle + ".noodleFaceOffsets") == faceOffsets.tolist()
+    assert len(faceOffsets) == len(chainPointLists) + 1
+
+    # every noodle's faces are the single-chain tube, shifted to its own vertices
+    points, polyCounts, polyConnects = getMeshArrays(noodle)
+    faceStarts = np.concatenate([[0], np.cumsum(polyCounts)])
+    vertexOffset = 0
+    for chain, pointList in enumerate(chainPointLists):
+        tubePoints, tubeCounts, tubeConnects = core.buildTube(pointNoodler.pointsToArray(pointList), 0.1, 6)[:3]
+        first, last = faceOffsets[chain], faceOffsets[chain + 1]
+        assert np.array_equal(polyCounts[first:last], tubeCounts)
+        assert np.array_equal(polyConnects[faceStarts[first]:faceStarts[last]], tubeConnects + vertexOffset)
+        np.testing.assert_allclose(points[vertexOffset:vertexOffset + len(tubePoints)], tubePoints, rtol=0, atol=1e-6)
+        vertexOffset += len(tubePoints)
+    assert vertexOffset == len(points)
+
+def test_empty_batch_creates_nothing(cubeScene):
+    nodesBefore = len(cubeScene.nodes)
+    noodle, faceOffsets = pointNoodler.pointNoodlerBatch([], 0.1, "|pCube1")
+    assert noodle is None and faceOffsets.tolist() == [0]
+    assert len(cubeScene.nodes) == nodesBefore and pointNoodler.defaultRegistry.noodlesOf("pCube1") == []
+
+def test_point_dict_with_up_vectors_gives_vertex_normals(cubeScene):
+    normals = np.array(cubeScene.find("pCube1").shape().mesh.vertexNormals())
+    pointDict, upVectorDict = pointNoodler.getPointDictFromEdges(splitChains=True, withUpVectors=True)
+    noodleSet = pointNoodler.getNoodleSetFromEdges()
+    assert list(upVectorDict) == ["|pCube1"]
+    for chain, (pointList, upVectorList) in enumerate(zip(pointDict["|pCube1"], upVectorDict["|pCube1"])):
+        assert len(upVectorList) == len(pointList)
+        assert all(isinstance(upVector, om.MVector) for upVector in upVectorList)
+        np.testing.assert_allclose(pointNoodler.pointsToArray(upVectorList), normals[noodleSet.chainPointIndices(chain)], rtol=0, atol=1e-6)
+
+    flatPoints, flatUpVectors = pointNoodler.getPointDictFromEdges(withUpVectors=True)
+    assert len(flatUpVectors["|pCube1"]) == 1 and len(flatUpVectors["|pCube1"][0]) == len(flatPoints["|pCube1"][0])
+
+def test_mesh_arrays_fetch_every_edge_once(cubeScene, monkeypatch):
+    calls = []
+    getEdgeVertices = om.MFnMesh.getEdgeVertices
+    monkeypatch.setattr(om.MFnMesh, "getEdgeVertices", lambda self, edgeID, ptr: calls.append(edgeID) or getEdgeVertices(self, edgeID, ptr))
+    mesh = cubeScene.find("pCube1").shape().mesh
+    meshArrays = pointNoodler.MeshArrays(pointNoodler.getStoredMeshEdges("|pCube1", [])[0][1])
+    np.testing.assert_array_equal(meshArrays.points, mesh.points)
+    np.testing.assert_allclose(meshArrays.normals, mesh.vertexNormals(), rtol=0, atol=1e-6)
+
+    for edgeIDs in ([0, 5, 9], [5, 9, 12, 0]):
+        edgeIDArray, edgeVertices = meshArrays.getEdgeVertexArrays(pointNoodler.toIntArray(edgeIDs), len(edgeIDs))
+        assert edgeIDArray.tolist() == edgeIDs
+        assert edgeVertices.tolist() == [list(mesh.getEdges()[edgeID]) for edgeID in edgeIDs]
+    assert sorted(calls) == [0, 5, 9, 12]
@@ -0,0 +1,57 @@
+"""
+profiling.py: stage timers, counters, the cProfile capture and the report formats.
+"""
+import json
+
+import pytest
+
+import pointNoodler
+from pointNoodler import profiling
+
+
+def test_report_of_the_noodle_pipeline(cubeScene, tmpdir, capsys):
+    path = str(tmpdir.join("noodleReport.json"))
+    with profiling.capture(profile=True, debug=True, path=path) as session:
+        assert profiling.isActive()
+        pointNoodler.pointNoodlerSet(pointNoodler.getNoodleSetFromEdges(), 0.1, sides=6)
+        profiling.debug(lambda: "formatted only while debugging")
+    assert not profiling.isActive()
+    assert "formatted only while debugging" in capsys.readouterr().out
+
+    report = session.report
+    for name in ("selection", "edgeFetch", "chaining", "pointFetch", "tubes", "meshCreate"):
+        assert report["stages"][name]["calls"] >= 1 and report["stages"][name]["seconds"] >= 0.0
+    assert report["counters"]["edges"] == 30 and report["counters"]["chains"] == 12 and report["counters"]["noodles"] == 12
+    assert report["totalSeconds"] >= max(stats["seconds"] for stats in report["stages"].values())
+    assert "pointNoodlerSet" in report["profile"]           # cProfile listing, sorted by cumulative time
+    with open(path) as f:
+        assert json.load(f) == report
+
+    text = profiling.formatReport(report)
+    assert text.splitlines()[0].split() == ["stage", "seconds", "calls"]
+    assert "chaining" in text and "chains" in text and "pointNoodlerSet" in text
+
+def test_hooks_are_no_ops_while_off(capsys):
+    assert not profiling.isActive()
+    assert profiling.stage("tubes") is profiling.NULL_STAGE
+    profiling.count("edges", 5)
+    profiling.debug(lambda: pytest.fail("debug message formatted while profiling is off"))
+    with profiling.capture() as session:
+        profiling.debug("not printed without debug=True")
+        with profiling.stage("tubes"):
+            pass
+        profiling.count("edges", 5)
+        profiling.count("edges")
+    assert capsys.readouterr().out == ""
+    assert session.report["counters"] == {"edges": 6} and session.report["stages"]["tubes"]["calls"] == 1
+    assert session.report["profile"] is None and "pointNoodlerSet" not in profiling.formatReport(session.report)
+
+def test_start_and_stop_must_pair():
+    with pytest.raises(Exception, match="not running"):
+        profiling.stop()
+    profiling.start()
+    try:
+        with pytest.raises(Exception, match="already running"):
+            profiling.start()
+    finally:
+        profiling.stop()
@@ -0,0 +1,109 @@
+"""
+registry.py: noodles stay indexed through renames / reparenting, regenerate and delete work per source mesh.
+"""
+import numpy as np
+
+import maya.cmds as cmds
+import pointNoodler
+from pointNoodler import registry
+
+
+def makeNoodle(radius=0.05):
+    return pointNoodler.pointNoodlerSet(pointNoodler.getNoodleSetFromEdges(), radius, 6)["|pCube1"]
+
+
+def test_rename_and_reparent_source_keep_noodles(cubeScene):
+    makeNoodle()
+    cmds.rename("pCube1", "rock")
+    assert pointNoodler.defaultRegistry.noodlesOf("rock") == ["|rock|pNoodle1"]
+
+    cmds.polyCube()
+    cmds.parent("rock", "pCube2")
+    records = pointNoodler.defaultRegistry.recordsOf("|pCube2|rock")
+    assert [record.noodle for record in records] == ["|pCube2|rock|pNoodle1"]
+    assert records[0].source == "|pCube2|rock"
+    assert pointNoodler.defaultRegistry.sources() == ["|pCube2|rock"]
+    assert len(records[0].edgeIDs) == 30
+
+def test_rename_noodle(cubeScene):
+    noodle = makeNoodle()
+    cmds.rename(noodle, "myNoodle")
+    assert pointNoodler.defaultRegistry.record("myNoodle").noodle == "|pCube1|myNoodle"
+    assert pointNoodler.deleteNoodles() == ["|pCube1|myNoodle"]
+    assert not cmds.objExists("myNoodle") and len(pointNoodler.defaultRegistry) == 0
+
+def test_regenerate_after_rename(cubeScene):
+    noodle = makeNoodle()
+    edgeIDs = pointNoodler.defaultRegistry.record(noodle).edgeIDs
+    cmds.rename("pCube1", "rock")
+    noodles = pointNoodler.regenerateNoodles(["rock"], radius=0.2)
+    assert len(noodles) == 1 and not cmds.objExists("pNoodle1")
+    record = pointNoodler.defaultRegistry.record(noodles[0])
+    assert record.source == "|rock" and record.params["radius"] == 0.2 and record.params["sides"] == 6
+    assert np.array_equal(record.edgeIDs, edgeIDs)
+    assert pointNoodler.defaultRegistry.noodlesOf("rock") == [registry.getLongName(noodles[0])]
+
+def test_rebuild_from_tags_after_rename(cubeScene):
+    noodle = makeNoodle()
+    cmds.rename("pCube1", "rock")
+    cmds.rename(noodle.split("|")[-1], "myNoodle")
+    fresh = registry.NoodleRegistry()           # e.g. after reloading the package
+    assert fresh.noodlesOf("rock") == ["|rock|myNoodle"]
+    assert fresh.record("myNoodle").params == pointNoodler.defaultRegistry.record("myNoodle").params
+
+def test_deleted_noodles_drop_out(cubeScene):
+    noodle = makeNoodle()
+    cmds.polyCube()
+    cmds.select("pCube2.e[0:3]")
+    other = registry.getLongName(pointNoodler.pointNoodlerSet(pointNoodler.getNoodleSetFromEdges(), 0.05, 6)["|pCube2"])
+    cmds.delete(noodle)
+    assert pointNoodler.defaultRegistry.noodlesOf("pCube1") == []
+    assert pointNoodler.defaultRegistry.getRecords()[0].noodle == other
+    assert pointNoodler.deleteNoodles(["pCube2"]) == [other]
+    assert len(pointNoodler.defaultRegistry) == 0
+
+def test_point_noodler_registers_its_edges(cubeScene):
+    noodleSet = pointNoodler.getNoodleSetFromEdges()
+    noodle = pointNoodler.pointNoodler(noodleSet.chainPoints(0), 0.1, "|pCube1", sides=6, edgeIDs=noodleSet.chainEdgeIDs(0))
+    assert np.array_equal(pointNoodler.defaultRegistry.record(noodle).edgeIDs, noodleSet.chainEdgeIDs(0))
+    noodles = pointNoodler.regenerateNoodles(radius=0.2)
+    assert len(noodles) == 1 and not cmds.objExists(noodle)
+    assert np.array_equal(pointNoodler.defaultRegistry.record(noodles[0]).edgeIDs, noodleSet.chainEdgeIDs(0))
+
+def test_regenerate_skips_point_only_noodles(cubeScene, capsys):
+    noodleSet = pointNoodler.getNoodleSetFromEdges()
+    pointOnly = registry.getLongName(pointNoodler.pointNoodler(noodleSet.chainPoints(0), 0.1, "|pCube1", sides=6))
+    noodle = makeNoodle()
+    noodles = pointNoodler.regenerateNoodles(radius=0.2)
+    assert len(noodles) == 1 and cmds.objExists(pointOnly) and not cmds.objExists(noodle)
+    assert "has no source edges" in capsys.readouterr().out
+    assert sorted(pointNoodler.defaultRegistry.noodlesOf("pCube1")) == sorted([pointOnly, registry.getLongName(noodles[0])])
+
+def test_regenerate_is_repeatable(cubeScene):
+    noodle = makeNoodle()
+    edgeIDs = pointNoodler.defaultRegistry.record(noodle).edgeIDs
+    for radius in (0.1, 0.2, 0.3):
+        noodles = pointNoodler.regenerateNoodles(radius=radius)
+        assert np.array_equal(pointNoodler.defaultRegistry.record(noodles[0]).edgeIDs, edgeIDs)
+
+def test_update_rebuilds_only_changed_meshes(cubeScene):
+    first = pointNoodler.updateNoodles(0.1, 6)
+    assert list(first) == ["|pCube1"] and len(pointNoodler.defaultRegistry) == 1
+    assert pointNoodler.updateNoodles(0.1, 6) == {}                 # same selection and parameters: kept
+    assert cmds.objExists(first["|pCube1"])
+
+    second = pointNoodler.updateNoodles(0.2, 6)                     # new radius: replaced
+    assert not cmds.objExists(first["|pCube1"]) and len(pointNoodler.defaultRegistry) == 1
+    assert pointNoodler.defaultRegistry.record(second["|pCube1"]).params["radius"] == 0.2
+
+    cmds.select("pCube1.e[0:3]")                                     # new selection: replaced
+    third = pointNoodler.updateNoodles(0.2, 6)
+    assert sorted(pointNoodler.defaultRegistry.record(third["|pCube1"]).edgeIDs.tolist()) == [0, 1, 2, 3]
+
+def test_update_leaves_unselected_meshes_alone(cubeScene):
+    noodle = makeNoodle()
+    cmds.polyCube()
+    cmds.select("pCube2.e[0:3]")
+    noodles = pointNoodler.updateNoodles(0.1, 6)
+    assert list(noodles) == ["|pCube2"] and cmds.objExists(noodle)
+    assert pointNoodler.defaultRegistry.sources() == ["|pCube1", "|pCube2"]
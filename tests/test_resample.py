@@ -0,0 +1,81 @@
+"""
+resample.py: simplification stays within tolerance, straight runs collapse in a logarithmic number of rounds.
+"""
+import numpy as np
+
+from pointNoodler import resample
+from pointNoodler.noodleSet import NoodleSet
+
+
+# one set of the given (n, 3) chains, with consecutive point indices (edge IDs follow the points)
+def makeNoodleSet(chainPointsList):
+    segregatedList = []
+    start = 0
+    for chainPoints in chainPointsList:
+        indices = list(range(start, start + len(chainPoints)))
+        segregatedList.append([indices[:-1], indices])
+        start += len(chainPoints)
+    return NoodleSet.fromSegregatedList("mesh", segregatedList, np.concatenate(chainPointsList))
+
+# largest distance of an original chain point to the simplified segment it falls on
+def getMaxError(noodleSet, simplified):
+    maxError = 0.0
+    for chain in range(noodleSet.numChains()):
+        indices = noodleSet.chainPointIndices(chain).tolist()
+        keptIndices = simplified.chainPointIndices(chain).tolist()
+        assert keptIndices[0] == indices[0] and keptIndices[-1] == indices[-1]
+        positions = [indices.index(index) for index in keptIndices]
+        points = noodleSet.chainPoints(chain)
+        for start, end in zip(positions[:-1], positions[1:]):
+            distances = resample.getSegmentDistances(points[start:end + 1], np.tile(points[start], (end - start + 1, 1)), np.tile(points[end], (end - start + 1, 1)))
+            maxError = max(maxError, distances.max())
+    return maxError
+
+
+def test_straight_runs_collapse_in_log_rounds(monkeypatch):
+    rounds = []
+    getSegmentBounds = resample.getSegmentBounds
+    def countRounds(kept):
+        rounds.append(None)
+        return getSegmentBounds(kept)
+    monkeypatch.setattr(resample, "getSegmentBounds", countRounds)
+
+    numPoints = 4097
+    line = np.outer(np.arange(numPoints), [0.5, 0.25, -1.0])
+    simplified = resample.simplifyChains(makeNoodleSet([line, line[:3] + 10.0]), 1e-9)
+    assert simplified.chainPointIndices(0).tolist() == [0, numPoints - 1]
+    assert simplified.chainPointIndices(1).tolist() == [numPoints, numPoints + 2]
+    assert len(rounds) <= 2 * int(np.log2(numPoints)) + 2
+
+def test_simplify_respects_tolerance():
+    rng = np.random.RandomState(13)
+    t = np.linspace(0.0, 4.0 * np.pi, 400)
+    curve = np.stack([t, np.sin(t), np.zeros_like(t)], axis=-1) + rng.normal(scale=0.002, size=(len(t), 3))
+    walk = np.cumsum(rng.normal(size=(200, 3)), axis=0)
+    noodleSet = makeNoodleSet([curve, walk])
+    for tolerance in (0.001, 0.01, 0.1, 1.0):
+        simplified = resample.simplifyChains(noodleSet, tolerance)
+        assert simplified.numPoints() < noodleSet.numPoints()
+        assert getMaxError(noodleSet, simplified) <= tolerance
+        assert simplified.edgeIDs.tolist() == noodleSet.edgeIDs.tolist()
+
+def test_closed_loop_keeps_its_seam():
+    t = np.linspace(0.0, 2.0 * np.pi, 65)
+    loop = np.stack([np.cos(t), np.sin(t), np.zeros_like(t)], axis=-1)
+    loop[-1] = loop[0]
+    segregatedList = [[list(range(64)), list(range(64)) + [0]]]
+    noodleSet = NoodleSet.fromSegregatedList("mesh", segregatedList, loop)
+    simplified = resample.simplifyChains(noodleSet, 0.05)
+    indices = simplified.chainPointIndices(0).tolist()
+    assert indices[0] == indices[-1] == 0 and 4 < len(indices) < 65
+    assert simplified.isClosed(0)
+
+# segments are "about" segmentLength: the spline is sampled evenly in its parameter, not its arc length
+def test_refine_reaches_segment_length():
+    line = np.outer(np.arange(5), [2.0, 0.0, 0.0])
+    refined = resample.refineChains(makeNoodleSet([line]), segmentLength=0.5)
+    points = refined.chainPoints(0)
+    np.testing.assert_allclose(points[[0, -1]], line[[0, -1]])
+    assert len(points) == 17
+    assert (np.diff(points[:, 0]) > 0.0).all() and np.diff(points[:, 0]).max() < 0.6
+    assert not points[:, 1:].any()